@@ -5,17 +5,42 @@ import requests
 import json
 import traceback
 import os
+import sys
+import io
+import hashlib
+import bisect
+import threading
+import time
 import warnings
-from sqlalchemy import create_engine
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+from pandas._libs.parsers import STR_NA_VALUES # Missing-value markers recognized by pd.read_csv
+from sqlalchemy import create_engine, select, func, text, literal, literal_column, column as sql_column
 from sqlalchemy.exc import SQLAlchemyError
 from googletrans import Translator # For translation functionality
 
 # Import functions and classes from the separate summarizer module
 from summarizer1 import (
-    read_excel_full_clean,
-    read_excel_partial_clean,
     DataSummarizer
 )
+from summarizer import (
+    read_excel_sheets,
+    clean_chunks,
+    partial_clean_dataframe,
+    finish_cleaning,
+    profile_dataframe,
+    insights_from_column_stats,
+    profile_from_column_stats,
+    format_insights_natural_language,
+    IncrementalFrame,
+    OutOfCoreSummarizer,
+    csv_chunks,
+    iter_typed_chunks,
+    profile_chunks,
+    CLEANING_VERSION,
+    INSIGHTS_VERSION
+)
+from cache import DatasetCache, InsightCache, ParsePlanCache, dataframe_fingerprint, file_fingerprint
 
 # For SharePoint - you'll need to install this: pip install Office365-REST-Python-Client
 try:
@@ -26,6 +51,30 @@ except ImportError:
     warnings.warn("Office365-REST-Python-Client not found. SharePoint functionality will be simulated.")
     sharepoint_client_available = False
 
+# For memory-mapped Arrow/Feather/Parquet files - you'll need to install this: pip install pyarrow
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+    import pyarrow.csv as pa_csv
+    pyarrow_available = True
+except ImportError:
+    pyarrow_available = False
+
+# Fast Rust-based Excel reader - you'll need to install this: pip install python-calamine
+try:
+    import python_calamine  # noqa: F401
+    calamine_available = True
+except ImportError:
+    calamine_available = False
+
+# Legacy .xls reader - you'll need to install this: pip install xlrd
+try:
+    import xlrd  # noqa: F401
+    xlrd_available = True
+except ImportError:
+    xlrd_available = False
+
 # --- Translation Utility ---
 def translate_text(text: str, src_lang: str, dest_lang: str) -> str:
     """
@@ -66,24 +115,51 @@ LANGUAGES = {
 
 # --- Data Loading Functions (stay in backend as they are connection-specific) ---
 
-def load_sql_table(dialect, username, password, host, port, database, sql_query):
+# Engines hold a connection pool, so build one per database URL and reuse it across loads
+_sql_engines = {}
+_sql_engines_lock = threading.Lock()
+
+def _get_sql_engine(database_url: str):
+    with _sql_engines_lock:
+        engine = _sql_engines.get(database_url)
+        if engine is None:
+            engine = create_engine(database_url, pool_pre_ping=True)
+            _sql_engines[database_url] = engine
+        return engine
+
+def dispose_sql_engines():
+    """Closes all pooled SQL connections, e.g. when the application shuts down."""
+    with _sql_engines_lock:
+        for engine in _sql_engines.values():
+            engine.dispose()
+        _sql_engines.clear()
+
+def _build_database_url(dialect, username, password, host, port, database):
+    if dialect.lower() == 'sqlite':
+        return f"{dialect}:///{database}"
+    return f"{dialect}://{username}:{password}@{host}:{port}/{database}"
+
+def load_sql_table(dialect, username, password, host, port, database, sql_query, chunksize=100_000, fetch_size=10_000):
     """
     Connects to a SQL database and loads data using the provided SQL query.
-    Uses SQLAlchemy for database connection.
+    Uses SQLAlchemy for database connection, with one pooled engine per database URL.
+    When chunksize is set, rows are streamed through a server-side cursor (buffering
+    fetch_size rows at a time) and cleaned chunk by chunk instead of being fetched at once.
+    Either way the returned frame is cleaned the same way.
     """
-    # Build the database URL
-    if dialect.lower() == 'sqlite':
-        database_url = f"{dialect}:///{database}"
-    else:
-        database_url = f"{dialect}://{username}:{password}@{host}:{port}/{database}"
+    database_url = _build_database_url(dialect, username, password, host, port, database)
 
     print(f"Attempting to connect to SQL database: {dialect} on {host}:{port}/{database}")
     print(f"Executing query: {sql_query}")
 
     try:
-        engine = create_engine(database_url)
+        engine = _get_sql_engine(database_url)
         with engine.connect() as connection:
-            df = pd.read_sql(sql_query, connection)
+            if chunksize:
+                connection = connection.execution_options(stream_results=True, max_row_buffer=fetch_size)
+                df = clean_chunks(pd.read_sql(sql_query, connection, chunksize=chunksize))
+            else:
+                df = clean_chunks([pd.read_sql(sql_query, connection)])
 
         if df.empty:
             print("SQL query returned an empty DataFrame.")
@@ -97,45 +173,282 @@ def load_sql_table(dialect, username, password, host, port, database, sql_query)
     except Exception as e:
         raise ConnectionError(f"An unexpected error occurred during SQL data loading: {e}")
 
-def _simulate_sharepoint_data(list_name):
+def _sql_column_kind(series: pd.Series) -> str:
+    """Decides which aggregates can be pushed down for a column, based on preview rows."""
+    if pd.api.types.is_bool_dtype(series):
+        return 'text'
+    if pd.api.types.is_numeric_dtype(series):
+        return 'numeric'
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return 'datetime'
+    # ISO date strings (e.g. SQLite) sort correctly, so MIN/MAX still give the date range
+    values = series.dropna().astype(str)
+    if not values.empty and values.str.match(r'^\d{4}-\d{2}-\d{2}').mean() > 0.9:
+        return 'datetime'
+    return 'text'
+
+def load_sql_preview(database_url: str, sql_query: str, n_rows: int = 1000) -> pd.DataFrame:
+    """Fetches only the first n_rows of a query, e.g. for previews and column typing."""
+    query = sql_query.strip().rstrip(';')
+    preview_query = select(literal_column('*')).select_from(text(f"({query}) AS src")).limit(n_rows)
+    with _get_sql_engine(database_url).connect() as connection:
+        return pd.read_sql(preview_query, connection)
+
+def compute_sql_column_stats(database_url: str, sql_query: str, preview: pd.DataFrame = None) -> dict:
+    """
+    Computes per-column summary statistics inside the database instead of exporting rows.
+    Runs one query for counts, distinct counts, sums, means and ranges of every column,
+    one for centred second moments (standard deviations) and one GROUP BY per text
+    column for its most frequent values. The result feeds insights_from_column_stats
+    and profile_from_column_stats. Medians are not portable SQL and are left out.
+    """
+    if preview is None:
+        preview = load_sql_preview(database_url, sql_query)
+    query = sql_query.strip().rstrip(';')
+    src = text(query).columns(*[sql_column(col) for col in preview.columns]).subquery('src')
+    kinds = {col: _sql_column_kind(preview[col]) for col in preview.columns}
+
+    print(f"Pushing down summary statistics for {len(preview.columns)} columns.")
+    with _get_sql_engine(database_url).connect() as connection:
+        exprs = [func.count().label('rows')]
+        for i, col in enumerate(preview.columns):
+            c = src.c[col]
+            exprs += [func.count(c).label(f'count_{i}'), func.count(c.distinct()).label(f'distinct_{i}')]
+            if kinds[col] == 'numeric':
+                exprs += [func.sum(c).label(f'sum_{i}'), func.avg(c).label(f'mean_{i}')]
+            if kinds[col] in ('numeric', 'datetime'):
+                exprs += [func.min(c).label(f'min_{i}'), func.max(c).label(f'max_{i}')]
+        totals = connection.execute(select(*exprs)).mappings().one()
+
+        moments = {}
+        numeric_idx = [i for i, col in enumerate(preview.columns)
+                       if kinds[col] == 'numeric' and totals[f'count_{i}'] > 1]
+        if numeric_idx:
+            exprs = []
+            for i in numeric_idx:
+                centred = src.c[preview.columns[i]] - literal(float(totals[f'mean_{i}']))
+                exprs.append(func.sum(centred * centred).label(f'm2_{i}'))
+            moments = connection.execute(select(*exprs)).mappings().one()
+
+        columns = {}
+        for i, col in enumerate(preview.columns):
+            count = int(totals[f'count_{i}'])
+            stats = {
+                "kind": kinds[col],
+                "dtype": str(preview[col].dtype),
+                "count": count,
+                "distinct": int(totals[f'distinct_{i}'])
+            }
+            if kinds[col] == 'numeric' and count:
+                m2 = moments.get(f'm2_{i}')
+                stats.update({
+                    "sum": float(totals[f'sum_{i}']),
+                    "mean": float(totals[f'mean_{i}']),
+                    "min": float(totals[f'min_{i}']),
+                    "max": float(totals[f'max_{i}']),
+                    "std": float(np.sqrt(float(m2) / (count - 1))) if m2 is not None else np.nan,
+                    "median": None
+                })
+            elif kinds[col] == 'datetime' and count:
+                stats.update({"min": pd.to_datetime(totals[f'min_{i}']), "max": pd.to_datetime(totals[f'max_{i}'])})
+            elif kinds[col] == 'text':
+                c = src.c[col]
+                n = func.count().label('n')
+                top_query = select(c, n).where(c.is_not(None)).group_by(c).order_by(n.desc()).limit(50)
+                stats["top_values"] = {value: int(freq) for value, freq in connection.execute(top_query)}
+            columns[col] = stats
+
+    return {"rows": int(totals['rows']), "columns": columns}
+
+# SharePoint returns at most this many items per request ($top)
+SHAREPOINT_MAX_TOP = 5000
+
+# Modified stamps of the simulated list, with microseconds so edits right after a load are newer
+_SIMULATED_MODIFIED_FORMAT = '%Y-%m-%dT%H:%M:%S.%fZ'
+
+def _simulate_sharepoint_data(list_name, n_items=5):
     """
     Helper function to generate dummy SharePoint data if real connection fails or client not installed.
+    The first five items are always the same; larger lists repeat their pattern, shifted by a day per cycle.
     """
     print(f"Generating simulated SharePoint data for list '{list_name}'.")
+    created_by = ['John Doe', 'Jane Smith', 'John Doe', 'Peter Jones', 'Jane Smith']
+    status = ['Active', 'Pending', 'Active', 'Closed', 'Pending']
+    value = [150.75, 200.00, 75.20, 300.50, 120.00]
+    created_date = pd.to_datetime(['2024-01-15', '2024-02-20', '2024-03-10', '2024-04-01', '2024-05-05'])
+    positions = np.arange(n_items)
+    cycle = positions % 5
     dummy_data = {
-        'ID': [101, 102, 103, 104, 105],
-        'Title': [f'{list_name} Item A', f'{list_name} Item B', f'{list_name} Item C', f'{list_name} Item D', f'{list_name} Item E'],
-        'CreatedBy': ['John Doe', 'Jane Smith', 'John Doe', 'Peter Jones', 'Jane Smith'],
-        'Status': ['Active', 'Pending', 'Active', 'Closed', 'Pending'],
-        'Value': [150.75, 200.00, 75.20, 300.50, 120.00],
-        'CreatedDate': pd.to_datetime(['2024-01-15', '2024-02-20', '2024-03-10', '2024-04-01', '2024-05-05'])
+        'ID': 101 + positions,
+        'Title': [f'{list_name} Item {chr(65 + i) if i < 26 else i + 1}' for i in positions],
+        'CreatedBy': np.array(created_by)[cycle],
+        'Status': np.array(status)[cycle],
+        'Value': np.array(value)[cycle],
+        'CreatedDate': created_date[cycle] + pd.to_timedelta((positions // 5) % 3650, unit='D')
     }
     df = pd.DataFrame(dummy_data)
     return df
 
-def load_sharepoint_list(site_url, list_name, client_id, client_secret):
+class SimulatedSharePointList:
+    """
+    Offline stand-in for a SharePoint list that serves _simulate_sharepoint_data items
+    page by page, with an optional per-request latency, so paged and delta loading can be
+    exercised and benchmarked without a tenant.
+    """
+    def __init__(self, list_name, n_items=5, latency=0.0):
+        df = _simulate_sharepoint_data(list_name, n_items)
+        # Every item was last modified when the list was created
+        df['Modified'] = pd.Timestamp.now(tz='UTC').strftime(_SIMULATED_MODIFIED_FORMAT)
+        self._items = {int(item['ID']): item for item in df.to_dict('records')}
+        self._lock = threading.Lock()
+        self.latency = latency
+        self.requests = 0
+
+    def _request(self):
+        with self._lock:
+            self.requests += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def fetch_page(self, fields=None, top=SHAREPOINT_MAX_TOP, after_id=None, modified_after=None):
+        self._request()
+        with self._lock:
+            ids = sorted(self._items)
+            start = bisect.bisect_right(ids, after_id) if after_id is not None else 0
+            items = []
+            for item_id in ids[start:]:
+                # Fixed-width stamps, so they compare as text
+                if modified_after is None or self._items[item_id]['Modified'] > modified_after:
+                    items.append(self._items[item_id])
+                    if len(items) == top:
+                        break
+        if fields:
+            items = [{k: v for k, v in item.items() if k in fields} for item in items]
+        return [dict(item) for item in items]
+
+    def update_item(self, item_id, **values):
+        """Changes (or adds) an item and bumps its Modified stamp, like an edit in SharePoint."""
+        with self._lock:
+            item = self._items.setdefault(item_id, {'ID': item_id})
+            item.update(values)
+            item['Modified'] = pd.Timestamp.now(tz='UTC').strftime(_SIMULATED_MODIFIED_FORMAT)
+
+    def delete_item(self, item_id):
+        with self._lock:
+            self._items.pop(item_id, None)
+
+
+class _SharePointListSource:
+    """Pages through a real SharePoint list with Office365-REST-Python-Client."""
+    def __init__(self, site_url, list_name, client_id, client_secret):
+        self.site_url = site_url
+        self.list_name = list_name
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self._local = threading.local()
+
+    def _items(self):
+        # ClientContext is not thread-safe: each worker thread authenticates one and reuses it for all its pages
+        ctx = getattr(self._local, "ctx", None)
+        if ctx is None:
+            credentials = ClientCredential(self.client_id, self.client_secret)
+            ctx = self._local.ctx = ClientContext(self.site_url).with_credentials(credentials)
+        return ctx.web.lists.get_by_title(self.list_name).items
+
+    def fetch_page(self, fields=None, top=SHAREPOINT_MAX_TOP, after_id=None, modified_after=None):
+        """Up to top items in ID order, after the item after_id, optionally only those modified after a stamp."""
+        query = self._items().get()
+        if modified_after is not None:
+            query = query.filter(f"Modified gt datetime'{modified_after}'")
+        if fields:
+            query = query.select(list(fields))
+        if after_id is not None:
+            # The paging position SharePoint puts in its own next-page links
+            query.query_options.custom["$skiptoken"] = quote(f"Paged=TRUE&p_ID={after_id}")
+        return [item.properties for item in query.order_by("ID").top(top).execute_query()]
+
+
+# Items of lists loaded with delta=True, keyed by (site_url, list_name, fields)
+_sharepoint_item_cache = {}
+_simulated_sharepoint_lists = {}
+
+def _page_through(source, fields, top, modified_after=None):
+    """All items in ID order (optionally only those modified after a stamp), one $top page after another."""
+    items, after_id = [], None
+    while True:
+        page = source.fetch_page(fields, top, after_id, modified_after)
+        items.extend(page)
+        if len(page) < top:
+            return items
+        after_id = page[-1]["ID"]
+
+def _fetch_sharepoint_pages(source, page_size, fields, max_workers):
+    """
+    Lists the item IDs in pages of SHAREPOINT_MAX_TOP, then fetches the items concurrently in
+    pages of page_size, each starting after the last ID of the page before. The number of
+    requests follows the number of items, however sparse their IDs are.
+    """
+    ids = [item["ID"] for item in _page_through(source, ["ID"], SHAREPOINT_MAX_TOP)]
+    if not ids:
+        return []
+    page_starts = [None] + ids[page_size - 1:-1:page_size]
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        pages = pool.map(lambda after_id: source.fetch_page(fields, page_size, after_id), page_starts)
+        # Keyed by ID: pages overlap if items are deleted while they are fetched
+        items = {item["ID"]: item for page in pages for item in page}
+    return list(items.values())
+
+def _load_sharepoint_items(source, cache_key, page_size, fields, max_workers, delta):
+    if fields:
+        fields = list(dict.fromkeys(["ID", "Modified", *fields]))
+    cached = _sharepoint_item_cache.get(cache_key) if delta else None
+
+    if cached is None:
+        items = _fetch_sharepoint_pages(source, page_size, fields, max_workers)
+    else:
+        # Delta reload: full rows only for items modified after the newest stamp loaded so far,
+        # plus the current IDs (ID-only pages) to drop deleted items
+        watermark = max((item["Modified"] for item in cached.values()), default=None)
+        changed = {item["ID"]: item for item in _page_through(source, fields, page_size, modified_after=watermark)}
+        ids = [item["ID"] for item in _page_through(source, ["ID"], SHAREPOINT_MAX_TOP)]
+        items = [changed.get(item_id) or cached[item_id] for item_id in ids if item_id in changed or item_id in cached]
+        print(f"Delta sync: {len(changed)} new or changed items, {len(cached.keys() - set(ids))} removed.")
+
+    if delta:
+        _sharepoint_item_cache[cache_key] = {item["ID"]: item for item in items}
+    return items
+
+def load_sharepoint_list(site_url, list_name, client_id, client_secret, page_size=500, fields=None, max_workers=8, delta=False, source=None):
     """
     Connects to a SharePoint list and loads its data into a pandas DataFrame.
     Requires Office365-REST-Python-Client and proper Azure AD App registration.
+    Items are fetched in pages of page_size by up to max_workers threads, and only the
+    requested fields (plus ID and Modified) are selected. With delta=True the loaded items
+    are kept in memory and a reload only fetches the items modified since.
+    Pass a SimulatedSharePointList as source to load offline.
     """
     print(f"Attempting to connect to SharePoint list: '{list_name}' at '{site_url}'")
 
-    if not sharepoint_client_available:
+    if source is None and not sharepoint_client_available:
         warnings.warn("Office365-REST-Python-Client not installed. Simulating SharePoint data load.")
-        return _simulate_sharepoint_data(list_name)
+        if list_name not in _simulated_sharepoint_lists:
+            _simulated_sharepoint_lists[list_name] = SimulatedSharePointList(list_name)
+        source = _simulated_sharepoint_lists[list_name]
+    elif source is None:
+        source = _SharePointListSource(site_url, list_name, client_id, client_secret)
 
     try:
-        credentials = ClientCredential(client_id, client_secret)
-        ctx = ClientContext(site_url).with_credentials(credentials)
-        sp_list = ctx.web.lists.get_by_title(list_name)
-        list_items = sp_list.get_items().execute_query()
-        data = [item.properties for item in list_items]
+        cache_key = (site_url, list_name, tuple(fields) if fields else None)
+        data = _load_sharepoint_items(source, cache_key, page_size, fields, max_workers, delta)
 
         if not data:
             print(f"SharePoint list '{list_name}' returned no data.")
             raise ValueError("SharePoint list returned no data. Check list name or permissions.")
 
         df = pd.DataFrame(data)
+        if isinstance(source, SimulatedSharePointList) and not delta and 'Modified' not in (fields or []):
+            # The simulated Modified stamp only exists for delta bookkeeping, keep the original 6 columns
+            df = df.drop(columns='Modified')
         print(f"Successfully loaded {df.shape[0]} rows from SharePoint list '{list_name}'.")
         return df
 
@@ -144,12 +457,308 @@ def load_sharepoint_list(site_url, list_name, client_id, client_secret):
         raise ConnectionError(f"Failed to load SharePoint List. Check site URL, list name, Client ID, Client Secret, and Azure AD app permissions. Error: {e}")
 
 
+def _arrow_column_to_pandas(column):
+    """
+    Converts one Arrow column to a pandas array without copying where possible.
+    Null-free single-chunk numerics become read-only NumPy views of the Arrow buffer;
+    strings and other columns stay Arrow-backed. Temporal columns are converted to
+    NumPy datetime64/timedelta64 since the summarizer's date handling relies on them.
+    """
+    col_type = column.type
+    if pa.types.is_temporal(col_type) or pa.types.is_dictionary(col_type):
+        return column.to_pandas(date_as_object=False).array
+    if (pa.types.is_integer(col_type) or pa.types.is_floating(col_type)) \
+            and column.num_chunks == 1 and column.null_count == 0:
+        return column.chunk(0).to_numpy(zero_copy_only=True)
+    if pa.types.is_string(col_type) or pa.types.is_large_string(col_type):
+        return pd.arrays.ArrowStringArray(column)
+    return pd.arrays.ArrowExtensionArray(column)
+
+def load_arrow_file(file_path: str) -> pd.DataFrame:
+    """
+    Opens an Arrow IPC (.arrow/.feather) or Parquet file through a memory map.
+    Uncompressed Arrow/Feather columns are handed to pandas without copying, so they stay
+    in the OS page cache and can be shared by several analyzer processes.
+    Compressed Feather and Parquet pages have to be decoded, so those columns end up in
+    memory; the memory map only saves the extra read buffer.
+    The mapped numeric columns are read-only: assigning into them (df.loc[0, 'amount'] = 1.0)
+    raises "assignment destination is read-only". Adding or replacing whole columns works;
+    call df.copy() first to edit values in place.
+    """
+    if not pyarrow_available:
+        raise ImportError("pyarrow is required to load .arrow, .feather and .parquet files. Install it with: pip install pyarrow")
+
+    print(f"Memory-mapping data file: '{file_path}'")
+    if file_path.lower().endswith('.parquet'):
+        table = pq.read_table(file_path, memory_map=True)
+    else:
+        table = feather.read_table(file_path, memory_map=True)
+
+    columns = {
+        name: _arrow_column_to_pandas(column)
+        for name, column in zip(table.column_names, table.columns)
+    }
+    # copy=False keeps each column as its own block instead of consolidating into new arrays
+    df = pd.DataFrame(columns, copy=False)
+
+    if df.empty:
+        raise ValueError("The data file contains no rows.")
+
+    print(f"Successfully mapped {df.shape[0]} rows from '{file_path}'.")
+    return df
+
+
+# --- Reader Engines ---
+# Every engine reads a file into either one raw DataFrame or an iterator of raw chunks;
+# cleaning is the same whichever engine read the data.
+_reader_engines = {}
+
+def register_reader_engine(name: str, extensions, read_func, available: bool = True,
+                           priority: int = 0, min_bytes: int = 0):
+    """
+    Registers a file reader. read_func(path, chunksize=..., sheet_name=...) returns a raw
+    DataFrame or an iterator of DataFrame chunks. When no engine is requested, the available
+    engine with the highest priority whose min_bytes fits the file size is used.
+    """
+    _reader_engines[name] = {
+        "extensions": tuple(ext.lower() for ext in extensions),
+        "read": read_func,
+        "available": available,
+        "priority": priority,
+        "min_bytes": min_bytes
+    }
+
+def reader_engines() -> pd.DataFrame:
+    """Registered reader engines and whether they can be used here."""
+    rows = [
+        {"engine": name, "extensions": ", ".join(entry["extensions"]), "available": entry["available"],
+         "priority": entry["priority"], "min_bytes": entry["min_bytes"]}
+        for name, entry in _reader_engines.items()
+    ]
+    return pd.DataFrame(rows, columns=["engine", "extensions", "available", "priority", "min_bytes"])
+
+def select_reader_engine(file_path: str, engine: str = None) -> str:
+    """Picks the engine for a file: the requested one if given, otherwise by file type and size."""
+    extension = os.path.splitext(file_path)[1].lower()
+    if engine is not None:
+        entry = _reader_engines.get(engine)
+        if entry is None:
+            raise ValueError(f"Unknown reader engine '{engine}'. Registered engines: {', '.join(_reader_engines)}.")
+        if extension not in entry["extensions"]:
+            raise ValueError(f"Reader engine '{engine}' cannot read '{extension}' files.")
+        if not entry["available"]:
+            raise ImportError(f"Reader engine '{engine}' is not installed.")
+        return engine
+
+    size = os.path.getsize(file_path)
+    candidates = [
+        name for name, entry in _reader_engines.items()
+        if extension in entry["extensions"] and entry["available"] and size >= entry["min_bytes"]
+    ]
+    if not candidates:
+        raise ValueError(f"No reader engine available for '{extension}' files.")
+    return max(candidates, key=lambda name: _reader_engines[name]["priority"])
+
+def read_raw_file(file_path: str, engine: str = None, chunksize: int = 100_000, sheet_name=0):
+    """Reads a file with the selected engine; returns (engine name, raw DataFrame or chunk iterator)."""
+    engine = select_reader_engine(file_path, engine)
+    return engine, _reader_engines[engine]["read"](file_path, chunksize=chunksize, sheet_name=sheet_name)
+
+def _read_csv_pandas(path, chunksize=100_000, **_):
+    with pd.read_csv(path, chunksize=chunksize) as reader:
+        yield from reader
+
+def _read_csv_pyarrow(path, chunksize=100_000, **_):
+    # Streams record batches (parsed block by block on pyarrow's thread pool) and hands the
+    # cleaner chunksize-row frames, so memory stays bounded as with the pandas engine.
+    # Empty cells and pandas' other missing-value markers become nulls, in text columns too.
+    def open_reader(skip_rows=0, column_types=None):
+        return pa_csv.open_csv(
+            path,
+            read_options=pa_csv.ReadOptions(skip_rows_after_names=skip_rows),
+            convert_options=pa_csv.ConvertOptions(column_types=column_types, strings_can_be_null=True,
+                                                  null_values=sorted(STR_NA_VALUES))
+        )
+
+    def to_frame(batches):
+        return pa.Table.from_batches(batches).to_pandas(coerce_temporal_nanoseconds=True)
+
+    reader = open_reader()
+    column_types = dict(zip(reader.schema.names, reader.schema.types))
+    rows_read = 0
+    batches = []
+    while True:
+        try:
+            batch = reader.read_next_batch()
+        except StopIteration:
+            break
+        except pa.ArrowInvalid as e:
+            # Column types are inferred from the first block. When a later value does not fit
+            # (e.g. text in a numeric column) that column is read as text from here on and
+            # the cleaner coerces it to the type decided on the first chunk
+            failed = re.search(r"CSV column #(\d+)", str(e))
+            name = reader.schema.names[int(failed.group(1))] if failed else None
+            if name is None or column_types[name] == pa.string():
+                raise
+            column_types[name] = pa.string()
+            if batches:
+                yield to_frame(batches)
+                batches = []
+            reader = open_reader(rows_read, column_types)
+            continue
+        rows_read += batch.num_rows
+        batches.append(batch)
+        if sum(len(b) for b in batches) >= chunksize:
+            yield to_frame(batches)
+            batches = []
+    if batches:
+        yield to_frame(batches)
+
+def _excel_reader(engine):
+    def read(path, sheet_name=0, **_):
+        return pd.read_excel(path, sheet_name=sheet_name, engine=engine)
+    return read
+
+register_reader_engine("pandas-c", [".csv"], _read_csv_pandas)
+# pyarrow's thread pool only pays off once the file is big enough
+register_reader_engine("pyarrow-csv", [".csv"], _read_csv_pyarrow, available=pyarrow_available,
+                       priority=10, min_bytes=16 * 2**20)
+# pandas opens workbooks with openpyxl in read-only mode, streaming rows from the sheet XML
+register_reader_engine("openpyxl", [".xlsx"], _excel_reader("openpyxl"))
+register_reader_engine("xlrd", [".xls"], _excel_reader("xlrd"), available=xlrd_available)
+register_reader_engine("calamine", [".xlsx", ".xls"], _excel_reader("calamine"), available=calamine_available,
+                       priority=10)
+
+def benchmark_reader_engines(file_paths, engines=None, repeat: int = 1) -> pd.DataFrame:
+    """
+    Times every available engine (or the given ones) reading each file and reports rows/sec,
+    using the best of `repeat` runs. Only reading is timed; cleaning is the same for all engines.
+    """
+    results = []
+    for file_path in file_paths:
+        extension = os.path.splitext(file_path)[1].lower()
+        for name, entry in _reader_engines.items():
+            if (engines is not None and name not in engines) or extension not in entry["extensions"] \
+                    or not entry["available"]:
+                continue
+            row = {"file": file_path, "engine": name, "rows": np.nan, "seconds": np.nan, "rows_per_sec": np.nan, "error": None}
+            try:
+                best = None
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    raw = entry["read"](file_path)
+                    rows = len(raw) if isinstance(raw, pd.DataFrame) else sum(len(chunk) for chunk in raw)
+                    elapsed = time.perf_counter() - start
+                    best = elapsed if best is None else min(best, elapsed)
+                row.update(rows=rows, seconds=best, rows_per_sec=rows / best if best else np.nan)
+            except Exception as e:
+                row["error"] = str(e)
+            results.append(row)
+            print(f"Benchmarked '{name}' on '{file_path}'.")
+    return pd.DataFrame(results, columns=["file", "engine", "rows", "seconds", "rows_per_sec", "error"])
+
+
+# --- Chunk Sources (out-of-core summaries) ---
+def iter_arrow_batches(file_path: str):
+    """Yields a Parquet file one row group at a time, or an Arrow IPC/Feather file one record batch at a time."""
+    if not pyarrow_available:
+        raise ImportError("pyarrow is required to load .arrow, .feather and .parquet files. Install it with: pip install pyarrow")
+    if file_path.lower().endswith('.parquet'):
+        parquet_file = pq.ParquetFile(file_path, memory_map=True)
+        for i in range(parquet_file.num_row_groups):
+            yield parquet_file.read_row_group(i).to_pandas()
+    else:
+        with pa.memory_map(file_path) as source:
+            reader = pa.ipc.open_file(source)
+            for i in range(reader.num_record_batches):
+                yield reader.get_batch(i).to_pandas()
+
+def iter_sql_chunks(database_url: str, sql_query: str, chunksize: int = 100_000, fetch_size: int = 10_000):
+    """Yields query results chunk by chunk through a server-side cursor."""
+    with _get_sql_engine(database_url).connect() as connection:
+        connection = connection.execution_options(stream_results=True, max_row_buffer=fetch_size)
+        yield from pd.read_sql(sql_query, connection, chunksize=chunksize)
+
+def _chunk_source(data_source: str, **kwargs):
+    """A callable that re-opens the source as a fresh chunk iterator on every call."""
+    chunksize = kwargs.get('chunksize', 100_000)
+    if data_source == "file":
+        file_path = kwargs.get('file_path')
+        if not file_path:
+            raise ValueError("File path must be provided for file source type.")
+        lower_path = file_path.lower()
+        if lower_path.endswith('.csv'):
+            return lambda: csv_chunks(file_path, chunksize=chunksize)
+        if lower_path.endswith(('.arrow', '.feather', '.parquet')):
+            return lambda: iter_arrow_batches(file_path)
+        raise ValueError("Out-of-core loading supports .csv, .arrow, .feather and .parquet files.")
+    if data_source == "sql":
+        database_url = _build_database_url(
+            kwargs.get('dialect'),
+            kwargs.get('username'),
+            kwargs.get('password'),
+            kwargs.get('host'),
+            kwargs.get('port'),
+            kwargs.get('database')
+        )
+        sql_query = kwargs.get('sql_query')
+        return lambda: iter_sql_chunks(database_url, sql_query, chunksize, kwargs.get('fetch_size', 10_000))
+    raise ValueError(f"Out-of-core loading is not supported for data source: {data_source}")
+
+
+# --- Incremental Loading ---
+def _file_prefix_hash(file_path: str, offset: int, block_size: int = 1 << 16) -> str:
+    """Hash of the block just before offset, to tell an appended file from a rewritten one."""
+    with open(file_path, 'rb') as f:
+        f.seek(max(0, offset - block_size))
+        return hashlib.blake2b(f.read(min(offset, block_size)), digest_size=16).hexdigest()
+
+def _csv_resume_offset(file_path: str, size: int):
+    # Only resume after a complete line; a half-written last row forces a full reload next time
+    if size == 0:
+        return None
+    with open(file_path, 'rb') as f:
+        f.seek(size - 1)
+        return size if f.read(1) == b'\n' else None
+
+def _python_scalar(value):
+    if isinstance(value, pd.Timestamp):
+        return value.to_pydatetime()
+    return value.item() if isinstance(value, np.generic) else value
+
+def _track_watermark(chunks, column: str, state: dict):
+    # Remembers the largest raw watermark value streamed, before any cleaning fills it in
+    for chunk in chunks:
+        if column in chunk.columns and chunk[column].notna().any():
+            chunk_max = chunk[column].max()
+            state["watermark"] = chunk_max if state.get("watermark") is None else max(state["watermark"], chunk_max)
+        yield chunk
+
+
+def _module_version(cls) -> str:
+    """Version of the module defining cls: its __version__, else a fingerprint of its source file."""
+    module = sys.modules.get(cls.__module__)
+    version = getattr(module, "__version__", None)
+    if version is None and getattr(module, "__file__", None):
+        version = file_fingerprint(module.__file__)
+    return str(version)
+
+
 # --- Main DataAnalyzer Class ---
 class DataAnalyzer:
-    def __init__(self):
+    def __init__(self, cache_dir: str = None):
         self.df = None
         self.data_summarizer = None
         self.original_file_path = None # To store path for partial cleaning if needed
+        self.sql_pushdown = None # (database_url, sql_query) when SQL summaries are computed in the database
+        self.dataset_cache = DatasetCache(cache_dir) # On-disk cache of cleaned file datasets
+        self.plan_cache = ParsePlanCache(cache_dir) # Column types decided for known file layouts
+        self.insight_cache = InsightCache(cache_dir) # Summaries of previously summarized datasets
+        self._summary_fingerprint = None # Content fingerprint of the loaded DF, computed on first summary
+        self.incremental = None # Source position and IncrementalFrame of an incremental load
+        self.out_of_core = None # Chunk source of data summarized without loading it
+        self.stages = {} # Cleaning stages of the loaded Excel file: 'raw' parse and 'partial' clean
+        self._stage_source = None # (file path, reader engine) the stages are built from
 
     def _make_json_safe(self, val):
         """Helper to make values safe for JSON serialization."""
@@ -164,21 +773,104 @@ class DataAnalyzer:
         """
         Generic method to load data based on the source.
         Dispatches to the appropriate loading function and initializes the DataSummarizer.
+        With incremental=True, CSV files and SQL queries are loaded append-aware: reloading
+        the same source only reads and cleans rows added since the previous load. SQL queries
+        need a watermark_column that increases with every appended row. This covers loading,
+        cleaning, the profile and the summary cache key; the summary itself is still computed
+        by DataSummarizer over the whole maintained frame whenever rows were added, as it has
+        no incremental mode.
+        With out_of_core=True, only the first chunk is loaded as a preview and summaries
+        stream the whole source, for inputs larger than memory.
+        Frames of .arrow/.feather/.parquet files are memory-mapped and their numeric columns
+        are read-only (see load_arrow_file); copy them before editing values in place.
         """
+        previous_incremental = self.incremental
+        previous_df, previous_summarizer = self.df, self.data_summarizer
         try:
             self.df = None # Reset df on new load
+            self._summary_fingerprint = None
             self.original_file_path = None # Reset path
+            self.sql_pushdown = None
+            self.incremental = None
+            self.out_of_core = None
+            self.stages = {}
+            self._stage_source = None
+
+            if kwargs.get('out_of_core'):
+                chunk_source = _chunk_source(data_source, **kwargs)
+                self.original_file_path = kwargs.get('file_path')
+                self.df = next(iter_typed_chunks(chunk_source()), pd.DataFrame())
+                if self.df.empty:
+                    raise ValueError("No data rows found in the source.")
+                self.out_of_core = chunk_source
+                self.data_summarizer = None
+                return self.df
+
+            if kwargs.get('incremental') and data_source in ("file", "sql"):
+                if data_source == "file":
+                    if not kwargs.get('file_path'):
+                        raise ValueError("File path must be provided for file source type.")
+                    self.original_file_path = kwargs.get('file_path')
+                    self.df = self._load_csv_incremental(
+                        kwargs.get('file_path'), kwargs.get('chunksize', 100_000), previous_incremental
+                    )
+                else:
+                    database_url = _build_database_url(
+                        kwargs.get('dialect'),
+                        kwargs.get('username'),
+                        kwargs.get('password'),
+                        kwargs.get('host'),
+                        kwargs.get('port'),
+                        kwargs.get('database')
+                    )
+                    self.df = self._load_sql_incremental(
+                        database_url,
+                        kwargs.get('sql_query'),
+                        kwargs.get('watermark_column'),
+                        kwargs.get('chunksize', 100_000),
+                        kwargs.get('fetch_size', 10_000),
+                        previous_incremental
+                    )
+                if self.df.empty:
+                    raise ValueError("No data rows found in the source.")
+                # The maintained frame is what a full reload would give, so it is summarized the same way
+                if self.df is previous_df and previous_summarizer is not None:
+                    self.data_summarizer = previous_summarizer  # Nothing was appended
+                else:
+                    self.data_summarizer = DataSummarizer(self.df)
+                # Extended by the appended rows only, instead of hashing the whole frame again
+                self._summary_fingerprint = self.incremental["frame"].fingerprint
+                return self.df
 
             if data_source == "file":
                 file_path = kwargs.get('file_path')
                 if not file_path:
                     raise ValueError("File path must be provided for file source type.")
                 self.original_file_path = file_path # Store original path
-
-                if file_path.lower().endswith(('.xls', '.xlsx', '.csv')): # Handle CSV for full clean too
-                    self.df = read_excel_full_clean(file_path) # Use full clean for initial load
-                else:
-                    raise ValueError("Unsupported file type. Only .csv, .xls, .xlsx are supported.")
+                self.df = self._load_file(
+                    file_path,
+                    kwargs.get('chunksize', 100_000),
+                    kwargs.get('use_cache', True),
+                    sheets=kwargs.get('sheets'),
+                    max_workers=kwargs.get('max_workers'),
+                    engine=kwargs.get('engine')
+                )
+            elif data_source == "sql" and kwargs.get('pushdown'):
+                # Keep the rows in the database: preview a sample and push summaries down as SQL aggregates
+                database_url = _build_database_url(
+                    kwargs.get('dialect'),
+                    kwargs.get('username'),
+                    kwargs.get('password'),
+                    kwargs.get('host'),
+                    kwargs.get('port'),
+                    kwargs.get('database')
+                )
+                self.df = load_sql_preview(database_url, kwargs.get('sql_query'))
+                if self.df.empty:
+                    raise ValueError("No data returned for the given SQL query. Check query or database content.")
+                self.sql_pushdown = (database_url, kwargs.get('sql_query'))
+                self.data_summarizer = None
+                return self.df
             elif data_source == "sql":
                 self.df = load_sql_table(
                     kwargs.get('dialect'),
@@ -187,14 +879,20 @@ class DataAnalyzer:
                     kwargs.get('host'),
                     kwargs.get('port'),
                     kwargs.get('database'),
-                    kwargs.get('sql_query')
+                    kwargs.get('sql_query'),
+                    chunksize=kwargs.get('chunksize', 100_000),
+                    fetch_size=kwargs.get('fetch_size', 10_000)
                 )
             elif data_source == "sharepoint":
                 self.df = load_sharepoint_list(
                     kwargs.get('site_url'),
                     kwargs.get('list_name'),
                     kwargs.get('client_id'),
-                    kwargs.get('client_secret')
+                    kwargs.get('client_secret'),
+                    page_size=kwargs.get('page_size', 500),
+                    fields=kwargs.get('fields'),
+                    max_workers=kwargs.get('max_workers', 8),
+                    delta=kwargs.get('delta', False)
                 )
             else:
                 raise ValueError(f"Unsupported data source: {data_source}")
@@ -210,28 +908,250 @@ class DataAnalyzer:
         except Exception as e:
             self.df = None
             self.data_summarizer = None
+            self.sql_pushdown = None
+            self.incremental = None
+            self.out_of_core = None
             raise e
 
-    def get_data_summary(self) -> tuple[str, list]:
+    def _load_csv_incremental(self, file_path: str, chunksize: int, previous: dict) -> pd.DataFrame:
+        """
+        Loads an append-only CSV file. If it was loaded incrementally before and has only
+        grown since, just the bytes after the previous end are parsed and appended;
+        otherwise (first load, rewritten file or changed columns) the whole file is loaded.
+        """
+        if not file_path.lower().endswith('.csv'):
+            raise ValueError("Incremental loading is supported for .csv files only.")
+        size = os.path.getsize(file_path)
+        state = previous if previous and previous["source"] == ("file", file_path) else None
+
+        if state is not None:
+            offset = state["offset"]
+            if offset is None or size < offset or _file_prefix_hash(file_path, offset) != state["prefix_hash"]:
+                print(f"'{file_path}' was rewritten rather than appended to; reloading it in full.")
+                state = None
+            elif size > offset:
+                with open(file_path, 'rb') as f:
+                    f.seek(offset)
+                    tail = f.read(size - offset)
+                try:
+                    with pd.read_csv(io.BytesIO(tail), header=None, names=state["header"], chunksize=chunksize) as reader:
+                        state["frame"].append(reader)
+                except ValueError as e:
+                    print(f"Appended rows do not match the loaded data ({e}); reloading '{file_path}' in full.")
+                    state = None
+            else:
+                print(f"No new rows in '{file_path}'.")
+
+        if state is None:
+            # The default pandas CSV engine keeps parsing identical between the full load and appended tails
+            with pd.read_csv(file_path, chunksize=chunksize) as reader:
+                frame = IncrementalFrame(reader)
+            state = {"source": ("file", file_path), "frame": frame, "header": list(pd.read_csv(file_path, nrows=0).columns)}
+            if os.path.getsize(file_path) != size:
+                size = 0  # Grew while being read: resume position unknown
+
+        state["offset"] = _csv_resume_offset(file_path, size)
+        state["prefix_hash"] = _file_prefix_hash(file_path, size) if state["offset"] else None
+        self.incremental = state
+        return state["frame"].df
+
+    def _load_sql_incremental(self, database_url: str, sql_query: str, watermark_column: str,
+                              chunksize: int, fetch_size: int, previous: dict) -> pd.DataFrame:
+        """
+        Loads an append-only SQL query. A reload of the same query fetches only rows whose
+        watermark_column is above the largest value seen so far. The watermark is required:
+        without an ORDER BY the database may return rows in any order, so "the rows past the
+        previous row count" does not identify the new ones.
+        """
+        if not watermark_column:
+            raise ValueError("Incremental SQL loading needs a watermark_column that increases with every appended row.")
+        query = sql_query.strip().rstrip(';')
+        source = ("sql", database_url, query, watermark_column)
+        state = previous if previous and previous["source"] == source else None
+        if state is not None and state["watermark"] is None:
+            state = None  # No watermark values seen yet: nothing to compare new rows against
+
+        try:
+            with _get_sql_engine(database_url).connect() as connection:
+                connection = connection.execution_options(stream_results=True, max_row_buffer=fetch_size)
+                if state is not None:
+                    tail_query = text(f"SELECT * FROM ({query}) AS src WHERE {watermark_column} > :watermark")
+                    tail_query = tail_query.bindparams(watermark=_python_scalar(state["watermark"]))
+                    chunks = _track_watermark(pd.read_sql(tail_query, connection, chunksize=chunksize), watermark_column, state)
+                    try:
+                        if state["frame"].append(chunks) == 0:
+                            print("No new rows returned by the SQL query.")
+                    except ValueError as e:
+                        print(f"Appended rows do not match the loaded data ({e}); reloading the query in full.")
+                        state = None
+
+                if state is None:
+                    state = {"source": source, "watermark": None}
+                    chunks = _track_watermark(pd.read_sql(query, connection, chunksize=chunksize), watermark_column, state)
+                    state["frame"] = IncrementalFrame(chunks)
+        except SQLAlchemyError as e:
+            raise ConnectionError(f"Failed to load SQL data. Check connection details and SQL query syntax. Error: {e}")
+
+        self.incremental = state
+        return state["frame"].df
+
+    def _load_file(self, file_path: str, chunksize: int, use_cache: bool, sheets=None, max_workers: int = None,
+                   engine: str = None) -> pd.DataFrame:
+        """
+        Loads and cleans a file, reusing the cleaned copy from the dataset cache
+        when neither the file nor the cleaning options have changed.
+        For Excel files, sheets="all" or a list of sheet names loads those sheets in
+        parallel and stacks them with a 'sheet' column.
+        The reader engine is picked from the registry unless one is requested.
+        """
+        lower_path = file_path.lower()
+        if lower_path.endswith(('.arrow', '.feather', '.parquet')):
+            # Already typed columnar snapshots: map them directly rather than cleaning and caching a copy
+            return load_arrow_file(file_path)
+        if not lower_path.endswith(('.csv', '.xls', '.xlsx')):
+            raise ValueError("Unsupported file type. Only .csv, .xls, .xlsx, .arrow, .feather, .parquet are supported.")
+
+        engine = select_reader_engine(file_path, engine)
+        options = {"cleaning_version": CLEANING_VERSION, "engine": engine}
+        if lower_path.endswith('.csv'):
+            options["chunksize"] = chunksize
+        elif sheets is not None:
+            options["sheets"] = sheets
+
+        if sheets is None and not lower_path.endswith('.csv'):
+            self._stage_source = (file_path, engine)
+
+        if use_cache:
+            df = self.dataset_cache.get(file_path, options)
+            if df is not None:
+                return df
+
+        print(f"Reading '{file_path}' with the '{engine}' engine.")
+        if sheets is not None:
+            df = read_excel_sheets(file_path, None if sheets == "all" else sheets, max_workers=max_workers,
+                                   concat=True, engine=engine)
+        else:
+            # Reuse the column types decided the last time a file with this layout was cleaned
+            if lower_path.endswith('.csv'):
+                layout = list(pd.read_csv(file_path, nrows=0).columns)
+            else:
+                layout = list(self.get_stage('partial').columns)
+            plan_options = {"cleaning_version": CLEANING_VERSION, "format": 'csv' if lower_path.endswith('.csv') else 'excel'}
+            plan = self.plan_cache.get(layout, plan_options) if use_cache else None
+            if plan is not None:
+                print(f"Using the cached parse plan for the layout of '{file_path}'.")
+
+            schema = {}
+            if lower_path.endswith('.csv'):
+                # CSV engines stream chunks so the raw file is never materialized
+                _, raw = read_raw_file(file_path, engine, chunksize=chunksize)
+                df = clean_chunks([raw] if isinstance(raw, pd.DataFrame) else raw, schema=schema, plan=plan)
+            else:
+                df = finish_cleaning(self.get_stage('partial'), schema=schema, plan=plan)
+            if use_cache and schema != plan:
+                self.plan_cache.put(layout, plan_options, schema, file_path)
+
+        if use_cache:
+            self.dataset_cache.put(file_path, options, df)
+        return df
+
+    def get_stage(self, stage: str) -> pd.DataFrame:
+        """
+        Returns a cleaning stage of the loaded Excel file: 'raw' (the parsed sheet) or
+        'partial' (empty rows/columns dropped, names normalized). Each stage is built once
+        from the previous one and kept, so the file is parsed at most once per load.
+        The returned frames are shared; copy them before modifying.
+        """
+        if stage not in ('raw', 'partial'):
+            raise ValueError(f"Unknown cleaning stage: {stage}")
+        if self._stage_source is None:
+            raise ValueError("Cleaning stages are only kept for single-sheet Excel files.")
+        if stage not in self.stages:
+            if stage == 'raw':
+                file_path, engine = self._stage_source
+                _, raw = read_raw_file(file_path, engine)
+                self.stages['raw'] = raw if isinstance(raw, pd.DataFrame) else pd.concat(raw, ignore_index=True)
+            else:
+                self.stages['partial'] = partial_clean_dataframe(self.get_stage('raw'))
+        return self.stages[stage]
+
+    def get_data_profile(self) -> pd.DataFrame:
+        """Per-column profile of the loaded data (computed in the database for SQL pushdown sources)."""
+        if self.sql_pushdown:
+            return profile_from_column_stats(compute_sql_column_stats(*self.sql_pushdown, preview=self.df))
+        if self.incremental:
+            return profile_from_column_stats(self.incremental["frame"].column_stats())
+        if self.out_of_core:
+            return profile_chunks(self.out_of_core())
+        if self.df is not None:
+            return profile_dataframe(self.df)
+        return pd.DataFrame()
+
+    def get_cache_info(self) -> pd.DataFrame:
+        """Lists the cleaned datasets currently held in the on-disk cache."""
+        return self.dataset_cache.info()
+
+    def clear_cache(self):
+        """Removes all cleaned datasets, parse plans and cached summaries from the on-disk cache."""
+        self.dataset_cache.clear()
+        self.plan_cache.clear()
+        self.insight_cache.clear()
+
+    def get_data_summary(self, use_cache: bool = True) -> tuple[str, list]:
         """
         Delegates the summarization and plotting task to the DataSummarizer instance.
+        SQL sources loaded with pushdown=True are summarized from database aggregates instead (no plots).
+        Out-of-core sources are streamed through OutOfCoreSummarizer (no plots).
+        use_cache=False recomputes the summary instead of reading it from the insight cache.
         """
+        if self.sql_pushdown:
+            column_stats = compute_sql_column_stats(*self.sql_pushdown, preview=self.df)
+            return format_insights_natural_language(insights_from_column_stats(column_stats)), []
+        if self.out_of_core:
+            return OutOfCoreSummarizer(self.out_of_core).get_summary()
         if self.data_summarizer and self.df is not None and not self.df.empty:
-            return self.data_summarizer.get_summary()
+            return self._cached_summary(use_cache)
         return "No data loaded or summarizer not initialized, or DataFrame is empty.", []
 
+    def _cached_summary(self, use_cache: bool) -> tuple[str, list]:
+        """
+        The DataSummarizer summary, read back from the insight cache when the same data was
+        summarized before. Cached plots are returned in place, from the cache directory.
+        """
+        # The summarizer's module version is part of the key, so summaries made by an earlier
+        # summarizer1 are recomputed
+        summarizer_cls = type(self.data_summarizer)
+        params = {"summarizer": f"{summarizer_cls.__module__}.{summarizer_cls.__qualname__}",
+                  "summarizer_version": _module_version(summarizer_cls), "version": INSIGHTS_VERSION}
+        if use_cache and self._summary_fingerprint is None:
+            try:
+                self._summary_fingerprint = dataframe_fingerprint(self.df)
+            except TypeError as e: # Unhashable cell values, e.g. lists
+                print(f"Warning: Summaries of this dataset cannot be cached: {e}")
+        fingerprint = self._summary_fingerprint if use_cache else None
+        if fingerprint:
+            cached = self.insight_cache.get(fingerprint, params)
+            if cached is not None:
+                print("Loaded summary from cache.")
+                return cached["summary_text"], cached["plots"]
+
+        summary_text, plot_paths = self.data_summarizer.get_summary()
+        if fingerprint and not summary_text.startswith("Error generating summary"):
+            self.insight_cache.put(fingerprint, params, summary_text, plot_paths,
+                                   source=self.original_file_path or f"{len(self.df)} rows x {self.df.shape[1]} columns")
+        return summary_text, plot_paths
+
     def analyse_dataframe(self, df: pd.DataFrame, user_prompt: str, model="deepseek/deepseek-r1:free"):
         """
         Queries the DataFrame using an LLM to generate and execute Pandas code.
         After execution, if the result is a DataFrame/Series, it's passed back to the LLM
         for natural language summarization.
         """
-        # Conditionally re-load/re-clean data using partial clean for LLM
-        df_for_llm = df.copy() # Default to using the already loaded df
-        if self.original_file_path and (self.original_file_path.lower().endswith(('.xls', '.xlsx'))):
+        # Use the partially cleaned stage for Excel files; it is parsed once per load and then reused
+        df_for_llm = df # Default to using the already loaded df
+        if self._stage_source is not None:
             try:
-                # Apply partial clean specifically for the LLM query
-                df_for_llm = read_excel_partial_clean(self.original_file_path)
+                df_for_llm = self.get_stage('partial')
                 print("Applied partial clean for LLM query.")
             except Exception as e:
                 print(f"Warning: Could not apply partial clean for LLM: {e}. Using fully cleaned df.")
@@ -300,7 +1220,7 @@ class DataAnalyzer:
                 code = f"result = {code}"
 
             local_vars = {
-                "df": df_for_llm.copy(), # Use the potentially partially cleaned df
+                "df": df_for_llm.copy(), # The only copy: generated code must not modify the loaded or cached frames
                 "pd": pd,
                 "np": np
             }
@@ -0,0 +1,339 @@
+import numpy as np
+import pandas as pd
+
+# Mergeable, bounded-memory summaries of a column. Every sketch is updated one batch
+# (chunk) at a time and merges with a sketch of the same kind built on other rows, so
+# profiles can be computed chunk by chunk, or per partition/worker and combined.
+
+def column_kind(series: pd.Series) -> str:
+    """'numeric', 'datetime' or 'text' - the statistics kinds used by the stats-based summaries."""
+    if pd.api.types.is_bool_dtype(series):
+        return 'text'
+    if pd.api.types.is_numeric_dtype(series):
+        return 'numeric'
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return 'datetime'
+    return 'text'
+
+def as_text(series: pd.Series) -> pd.Series:
+    """
+    The values of a typed column as text, for columns that turn out to hold text after all:
+    whole numbers without a decimal part, as they are written in a CSV file, and missing
+    values as None.
+    """
+    present = series.notna()
+    if series.dtype == object or isinstance(series.dtype, (pd.StringDtype, pd.CategoricalDtype)):
+        return series.astype(object).where(present, None)
+    text = series.astype(str)
+    if pd.api.types.is_float_dtype(series):
+        whole = present & (series % 1 == 0) & (series.abs() < 2**53)
+        text[whole] = series[whole].astype(np.int64).astype(str)
+    return text.astype(object).where(present, None)
+
+
+class MomentSketch:
+    """
+    Count, mean, centred second moment, min and max. Each batch is reduced with NumPy
+    and folded in with the Welford/Chan parallel update, which is also used for merging.
+    """
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, values: np.ndarray):
+        if len(values) == 0:
+            return
+        batch = MomentSketch()
+        batch.count = len(values)
+        batch.total = float(values.sum())
+        batch.mean = batch.total / batch.count
+        batch.m2 = float(((values - batch.mean) ** 2).sum())
+        batch.min, batch.max = float(values.min()), float(values.max())
+        self.merge(batch)
+
+    def merge(self, other: "MomentSketch") -> "MomentSketch":
+        if other.count == 0:
+            return self
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.total += other.total
+        self.mean = self.total / count
+        self.count = count
+        self.min, self.max = min(self.min, other.min), max(self.max, other.max)
+        return self
+
+    @property
+    def std(self) -> float:
+        return float(np.sqrt(self.m2 / (self.count - 1))) if self.count > 1 else np.nan
+
+
+class HyperLogLog:
+    """
+    Distinct count estimate in 2**precision one-byte registers (relative error about
+    1.04 / sqrt(2**precision), 0.8% at the default). Values are hashed with pandas' 64-bit
+    hash_pandas_object; merging takes the register-wise maximum.
+    """
+    def __init__(self, precision: int = 14):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def update(self, values: pd.Series):
+        if len(values) == 0:
+            return
+        hashes = pd.util.hash_pandas_object(values, index=False).to_numpy()
+        buckets = (hashes >> np.uint64(64 - self.precision)).astype(np.int64)
+        rest = hashes << np.uint64(self.precision)
+
+        # Leading zeros of the remaining bits, by halving the search window
+        zeros = np.zeros(len(rest), dtype=np.uint8)
+        for shift in (32, 16, 8, 4, 2, 1):
+            small = rest < np.uint64(1 << (64 - shift))
+            zeros[small] += shift
+            rest[small] <<= np.uint64(shift)
+        rank = np.minimum(zeros, 64 - self.precision) + 1
+
+        best = pd.Series(rank).groupby(buckets).max()
+        buckets = best.index.to_numpy()
+        self.registers[buckets] = np.maximum(self.registers[buckets], best.to_numpy(dtype=np.uint8))
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches with different precisions.")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def estimate(self) -> int:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.exp2(-self.registers.astype(np.float64)))
+        empty = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and empty:
+            return int(round(m * np.log(m / empty)))  # Linear counting for small cardinalities
+        return int(round(raw))
+
+
+class KLLSketch:
+    """
+    KLL quantile sketch (Karnin, Lang, Liberty): a stack of compactors where level h holds
+    items of weight 2**h and lower levels get geometrically smaller capacities. A full
+    level is sorted and every other item (random offset) moves up a level. Quantiles are
+    exact until the first compaction; afterwards the rank error is about 1.7 / k.
+    """
+    def __init__(self, k: int = 200, seed: int = 0):
+        self.k = k
+        self.count = 0
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self):
+        while sum(len(items) for items in self.levels) > sum(self._capacity(h) for h in range(len(self.levels))):
+            for h in range(len(self.levels)):
+                if len(self.levels[h]) < self._capacity(h):
+                    continue
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(self.levels[h])
+                # An odd item out stays behind so total weight is preserved exactly
+                keep = items[-1:] if len(items) % 2 else items[:0]
+                paired = items[:len(items) - len(keep)]
+                self.levels[h + 1] = np.concatenate([self.levels[h + 1], paired[self._rng.integers(2)::2]])
+                self.levels[h] = keep
+                break
+
+    def update(self, values: np.ndarray):
+        if len(values) == 0:
+            return
+        self.count += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], np.asarray(values, dtype=np.float64)])
+        self._compress()
+
+    def merge(self, other: "KLLSketch") -> "KLLSketch":
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for h, items in enumerate(other.levels):
+            self.levels[h] = np.concatenate([self.levels[h], items])
+        self.count += other.count
+        self._compress()
+        return self
+
+    def quantile(self, q: float) -> float:
+        if self.count == 0:
+            return np.nan
+        if all(len(items) == 0 for items in self.levels[1:]):
+            return float(np.quantile(self.levels[0], q))  # Nothing compacted yet: exact, interpolated like pandas
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items_h), 2.0 ** h) for h, items_h in enumerate(self.levels)])
+        order = np.argsort(items, kind='stable')
+        cumulative = np.cumsum(weights[order])
+        position = np.searchsorted(cumulative, q * cumulative[-1], side='left')
+        return float(items[order][min(position, len(items) - 1)])
+
+
+class FrequentItems:
+    """
+    Most frequent values via the mergeable Misra-Gries summary (the counter-based twin of
+    space-saving): counts of at most `capacity` values, each an underestimate by at most
+    n / (capacity + 1). Batches arrive as exact value counts, so a chunk costs one value_counts.
+    While no value has been dropped the counts, and the number of distinct values, are exact.
+    """
+    def __init__(self, capacity: int = 64):
+        self.capacity = capacity
+        self.counts = pd.Series(dtype='int64')
+        self.exact = True
+
+    def update(self, values: pd.Series):
+        self._add_counts(values.value_counts(sort=False))
+
+    def _add_counts(self, counts: pd.Series):
+        counts = counts[counts > 0]
+        if isinstance(counts.index, pd.CategoricalIndex):
+            counts.index = counts.index.astype(object)
+        combined = self.counts.add(counts, fill_value=0) if len(self.counts) else counts
+        if len(combined) > self.capacity:
+            threshold = combined.nlargest(self.capacity + 1).iloc[-1]
+            combined = combined[combined > threshold] - threshold
+            self.exact = False
+        self.counts = combined.astype('int64')
+
+    def merge(self, other: "FrequentItems") -> "FrequentItems":
+        self._add_counts(other.counts)
+        self.exact = self.exact and other.exact
+        return self
+
+    def top(self, n: int) -> dict:
+        # Most frequent first, ties broken by value so results do not depend on merge order
+        order = np.lexsort((self.counts.index.astype(str), -self.counts.to_numpy()))[:n]
+        return {value: int(freq) for value, freq in self.counts.iloc[order].items()}
+
+
+class ColumnSketch:
+    """All sketches for one column; which ones are fed depends on the column kind."""
+    def __init__(self, kind: str, dtype: str, hll_precision: int = 14, quantile_k: int = 200,
+                 top_k: int = 64, seed: int = 0):
+        self.kind = kind
+        self.dtype = dtype
+        self.count = 0
+        self.min = None
+        self.max = None
+        self.moments = MomentSketch()
+        self.distinct = HyperLogLog(hll_precision)
+        self.quantiles = KLLSketch(quantile_k, seed)
+        self.frequent = FrequentItems(top_k)
+
+    def update(self, series: pd.Series):
+        values = series.dropna()
+        if values.empty:
+            return
+        self.count += len(values)
+        self.distinct.update(values)
+        self.frequent.update(values)
+        if self.kind == 'numeric':
+            numbers = values.to_numpy(dtype=np.float64)
+            self.moments.update(numbers)
+            self.quantiles.update(numbers)
+        elif self.kind == 'datetime':
+            low, high = values.min(), values.max()
+            self.min = low if self.min is None else min(self.min, low)
+            self.max = high if self.max is None else max(self.max, high)
+
+    def merge(self, other: "ColumnSketch") -> "ColumnSketch":
+        self.count += other.count
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+        self.moments.merge(other.moments)
+        self.distinct.merge(other.distinct)
+        self.quantiles.merge(other.quantiles)
+        self.frequent.merge(other.frequent)
+        return self
+
+    def widen_to_text(self):
+        """
+        Turns this into the sketch of a text column, for a column that iter_typed_chunks
+        widened to text after earlier chunks were counted as numbers or dates. The counted
+        values are kept as text; the distinct count estimate may count a value seen both
+        as a number and as text twice.
+        """
+        counts = self.frequent.counts
+        if len(counts):
+            keys = as_text(pd.Series(counts.index))
+            self.frequent.counts = pd.Series(counts.to_numpy(), index=keys.to_numpy()).groupby(level=0, sort=False).sum()
+        self.kind, self.dtype = 'text', 'object'
+        self.min = self.max = None
+        self.moments = MomentSketch()
+        self.quantiles = KLLSketch(self.quantiles.k)
+
+    def to_stats(self, top_n: int = 50) -> dict:
+        """Statistics in the per-column layout used by insights_from_column_stats."""
+        distinct = len(self.frequent.counts) if self.frequent.exact else self.distinct.estimate()
+        stats = {"kind": self.kind, "dtype": self.dtype, "count": self.count, "distinct": distinct,
+                 "top_values": self.frequent.top(top_n)}
+        if self.kind == 'numeric' and self.count:
+            stats.update({
+                "sum": self.moments.total,
+                "mean": self.moments.mean,
+                "min": self.moments.min,
+                "max": self.moments.max,
+                "std": self.moments.std,
+                "median": self.quantiles.quantile(0.5)
+            })
+        elif self.kind == 'datetime' and self.count:
+            stats.update({"min": pd.Timestamp(self.min), "max": pd.Timestamp(self.max)})
+        return stats
+
+
+class ProfileSketch:
+    """
+    One-pass profile of a table fed chunk by chunk: row count plus a ColumnSketch per
+    column, created when the column first has values (so its kind is known). Memory is
+    bounded by the sketch sizes, not the number of rows. Profiles of different partitions
+    merge with merge().
+    """
+    def __init__(self, hll_precision: int = 14, quantile_k: int = 200, top_k: int = 64, seed: int = 0):
+        self.options = {"hll_precision": hll_precision, "quantile_k": quantile_k, "top_k": top_k, "seed": seed}
+        self.rows = 0
+        self.columns = {}  # column -> ColumnSketch, or None until the column has values
+
+    def update(self, chunk: pd.DataFrame) -> "ProfileSketch":
+        self.rows += len(chunk)
+        for col in chunk.columns:
+            sketch = self.columns.get(col)
+            if sketch is None:
+                series = chunk[col]
+                if series.isna().all():
+                    self.columns[col] = None
+                    continue
+                sketch = self.columns[col] = ColumnSketch(column_kind(series), str(series.dtype), **self.options)
+            elif sketch.kind != 'text' and column_kind(chunk[col]) == 'text' and chunk[col].notna().any():
+                sketch.widen_to_text()
+            sketch.update(chunk[col])
+        return self
+
+    def merge(self, other: "ProfileSketch") -> "ProfileSketch":
+        """Adds the rows summarized by another profile sketch (in place)."""
+        self.rows += other.rows
+        for col, sketch in other.columns.items():
+            if self.columns.get(col) is None:
+                self.columns[col] = sketch
+            elif sketch is not None:
+                self.columns[col].merge(sketch)
+        return self
+
+    def column_stats(self) -> dict:
+        """{"rows", "columns": {col: stats}}, as consumed by insights/profile_from_column_stats."""
+        columns = {}
+        for col, sketch in self.columns.items():
+            if sketch is None:
+                columns[col] = {"kind": 'text', "dtype": 'object', "count": 0, "distinct": 0, "top_values": {}}
+            else:
+                columns[col] = sketch.to_stats()
+        return {"rows": self.rows, "columns": columns}
@@ -2,14 +2,74 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
+import copy
+import hashlib
 import os
+import queue
 import re
+import shutil
 from sklearn.feature_selection import mutual_info_classif
 from sklearn.preprocessing import LabelEncoder
-from sklearn.linear_model import LinearRegression
-from scipy.stats import entropy, ttest_ind, f_oneway
+from scipy.stats import entropy, norm, ttest_ind_from_stats, f as f_distribution
 from typing import List, Optional
+import threading
 import traceback # Keep traceback here for logging within the class
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from sketches import ProfileSketch, MomentSketch, as_text, column_kind
+from cache import InsightCache, dataframe_fingerprint
+
+try:
+    from pandas.tseries.api import guess_datetime_format
+except ImportError: # pandas < 2.2
+    from pandas._libs.tslibs.parsing import guess_datetime_format
+
+# Arrow-backed string columns need pyarrow - you can install it with: pip install pyarrow
+try:
+    import pyarrow  # noqa: F401
+    pyarrow_available = True
+except ImportError:
+    pyarrow_available = False
+
+# Bump whenever cleaning output changes so cached cleaned datasets are invalidated
+CLEANING_VERSION = 5
+
+# Bump whenever insights, summary text or plots change so cached summaries are invalidated
+INSIGHTS_VERSION = 3
+
+# Type inference decides datetime/numeric conversion on a random sample of each column.
+# A column is only ruled out when the sample is below the 60% parse threshold with this confidence.
+INFERENCE_SAMPLE_SIZE = 1000
+INFERENCE_CONFIDENCE = 0.95
+
+# Text columns with at most this share of distinct values are stored as 'category'
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+
+# Column-parallel cleaning. None uses one thread per CPU, 1 cleans columns one after another.
+# Frames with fewer rows than PARALLEL_MIN_ROWS are always cleaned sequentially. Columns are
+# cleaned in threads (NumPy/pandas release the GIL in most of the work). Parsing Python strings
+# holds the GIL, so with CLEANING_PROCESSES text columns of at least PROCESS_MIN_ROWS values go
+# to a process pool instead; this is opt-in, as pickling the columns to the workers and back
+# has not been shown to pay off.
+CLEANING_WORKERS = None
+CLEANING_PROCESSES = False
+PARALLEL_MIN_ROWS = 10_000
+PROCESS_MIN_ROWS = 100_000
+
+# Threads for the insight detectors in generate_insights/get_summary (None: executor default)
+INSIGHT_WORKERS = None
+
+# Scatter and box plots of larger frames are drawn from this many sampled rows: seaborn makes
+# several long-form copies of the data it plots, and more points do not change the picture
+PLOT_SAMPLE_ROWS = 20_000
+
+# detect_trends sums the moments of its target columns over blocks of rows (at most
+# MOMENT_BLOCKS of them, of at least MOMENT_MIN_BLOCK_ROWS rows), so its rows x targets
+# matrix only ever covers one block
+MOMENT_BLOCKS = 16
+MOMENT_MIN_BLOCK_ROWS = 16_384
+
+# Guards the statistics caches, which are shared by detectors running on different threads
+_stats_lock = threading.Lock()
 
 def is_id_like(col_name: str) -> bool:
     # Split by non-alphanumeric characters like _, (, ), etc.
@@ -17,73 +77,839 @@ def is_id_like(col_name: str) -> bool:
     id_like_tokens = {'id', 'uuid', 'number', 'code', 'serial', 'sku', 'name'}
     return any(token in id_like_tokens for token in tokens)
 
-def read_excel_clean(path: str, sheet_name: str = 0) -> pd.DataFrame:
-    # Step 1: Read Excel
-    df = pd.read_excel(path, sheet_name=sheet_name)
-    n_rows=len(df)
+def is_text_column(series: pd.Series) -> bool:
+    # Object columns, pandas/Arrow-backed strings and categoricals all hold text
+    return series.dtype == object or isinstance(series.dtype, (pd.StringDtype, pd.CategoricalDtype))
+
+def text_columns(df: pd.DataFrame) -> list:
+    return [col for col in df.columns if is_text_column(df[col])]
+
+def numeric_columns(df: pd.DataFrame) -> list:
+    # The columns select_dtypes(include='number') picks, without copying them into a new frame
+    return [
+        col for col, dtype in df.dtypes.items()
+        if issubclass(dtype.type, np.number)
+        or (getattr(dtype, '_is_numeric', False) and not pd.api.types.is_bool_dtype(dtype))
+    ]
+
+class ColumnStatsCache:
+    """
+    Per-column statistics of one DataFrame (nunique, var, std, value_counts), each computed
+    once on first use and shared by the insight, plotting and profiling functions.
+    counters records cache hits and misses to show how much recomputation is saved.
+    """
+    def __init__(self, df: pd.DataFrame, counters: Optional[dict] = None):
+        self.df = df
+        self.counters = counters if counters is not None else {"hits": 0, "misses": 0}
+        self._values = {}  # (column, statistic) -> value
+
+    def _get(self, col, name: str, compute):
+        key = (col, name)
+        with _stats_lock:
+            if key in self._values:
+                self.counters["hits"] += 1
+                return self._values[key]
+        # Computed outside the lock so detectors on other threads are not held up
+        value = compute(self.df[col])
+        with _stats_lock:
+            self.counters["misses"] += 1
+            return self._values.setdefault(key, value)
+
+    def nunique(self, col) -> int:
+        return self._get(col, 'nunique', lambda series: series.nunique())
+
+    def var(self, col) -> float:
+        return self._get(col, 'var', lambda series: series.var())
+
+    def std(self, col):
+        if pd.api.types.is_timedelta64_dtype(self.df[col]):
+            return self._get(col, 'std', lambda series: series.std())
+        return np.sqrt(self.var(col))  # Series.std is the square root of Series.var
+
+    def value_counts(self, col, normalize: bool = False) -> pd.Series:
+        counts = self._get(col, 'value_counts', lambda series: series.value_counts())
+        return (counts / counts.sum()).rename('proportion') if normalize else counts
+
+    def variances(self, columns: list) -> pd.Series:
+        return pd.Series([self.var(col) for col in columns], index=columns, dtype=float)
+
+    def stds(self, columns: list) -> pd.Series:
+        return pd.Series([self.std(col) for col in columns], index=columns)
+
+    def with_columns(self, df: pd.DataFrame, changed=()) -> "ColumnStatsCache":
+        """
+        A cache for df, a frame holding the same data as this one except for the changed
+        columns (e.g. a shallow copy with converted columns). Statistics of the unchanged
+        columns and the counters are shared.
+        """
+        derived = ColumnStatsCache(df, self.counters)
+        derived._values = {key: value for key, value in self._values.items() if key[0] not in set(changed)}
+        return derived
+
+    def hit_rate(self) -> float:
+        total = self.counters["hits"] + self.counters["misses"]
+        return self.counters["hits"] / total if total else 0.0
+
+def _stats_for(df: pd.DataFrame, stats_cache: Optional[ColumnStatsCache]) -> ColumnStatsCache:
+    # A cache only describes the frame it was built for
+    if stats_cache is None or stats_cache.df is not df:
+        return ColumnStatsCache(df, stats_cache.counters if stats_cache is not None else None)
+    return stats_cache
+
+def _without_empty_rows(df: pd.DataFrame) -> pd.DataFrame:
+    # dropna(how='all') copies the whole frame even when there is nothing to drop
+    empty = np.ones(len(df), dtype=bool)
+    for col in df.columns:
+        empty &= df[col].isna().to_numpy()
+        if not empty.any():
+            return df
+    return df[~empty]
+
+def _column_view(df: pd.DataFrame, columns: list) -> pd.DataFrame:
+    # A frame of some of df's columns that shares their data instead of copying it
+    return pd.DataFrame({col: df[col] for col in columns}, index=df.index, copy=False)
+
+def _is_raw_text(series: pd.Series) -> bool:
+    # Text that has not been through datetime/numeric inference yet
+    return series.dtype == object or isinstance(series.dtype, pd.StringDtype)
+
+def _clean_column_names(columns) -> list:
+    return [
+        str(col).strip().lower().replace(' ', '_').replace('\n', '_')
+        for col in columns
+    ]
+
+def _detect_datetime_format(sample: pd.Series, max_values: int = 50) -> Optional[str]:
+    """
+    Guesses the strptime format from up to max_values strings spread across the sample.
+    When the guesses disagree (e.g. day/month order), keeps the format that parses most of the sample.
+    """
+    values = sample.dropna()
+    if values.empty:
+        return None
+    step = max(1, len(values) // max_values)
+    candidates = {
+        guess_datetime_format(val.strip())
+        for val in values.iloc[::step]
+        if isinstance(val, str)
+    }
+    candidates.discard(None)
+    if len(candidates) <= 1:
+        return candidates.pop() if candidates else None
+    return max(sorted(candidates), key=lambda fmt: _to_datetime(values, fmt).notna().sum())
+
+def _to_datetime(series: pd.Series, fmt: Optional[str] = None) -> pd.Series:
+    return pd.to_datetime(series, format=fmt, errors='coerce', utc=False)
+
+def _sample_rules_out(hits: int, sample_size: int, confidence: float, threshold: float = 0.6) -> bool:
+    # One-sided test: is the parse ratio of the whole column confidently at or below the threshold?
+    std_err = np.sqrt(threshold * (1 - threshold) / sample_size)
+    return (threshold - hits / sample_size) / std_err > norm.ppf(confidence)
+
+def _infer_column_type(
+    series: pd.Series,
+    sample_size: int = None,
+    confidence: float = None
+) -> tuple[str, Optional[str], pd.Series]:
+    """
+    Tries to convert an object column to datetime, then to numeric.
+    Each conversion is first tried on a random sample; the full column is only converted
+    (once, with the detected datetime format) when the sample does not rule it out.
+    Returns the detected kind ('datetime', 'numeric' or 'object'), the datetime format
+    (or None) and the converted series.
+    """
+    sample_size = sample_size or INFERENCE_SAMPLE_SIZE
+    confidence = confidence or INFERENCE_CONFIDENCE
+    n_rows = len(series)
+    if n_rows == 0:
+        return 'object', None, series
+
+    if n_rows <= sample_size:
+        sample = series
+    else:
+        positions = np.random.default_rng(0).choice(n_rows, size=sample_size, replace=False)
+        sample = series.iloc[np.sort(positions)]
+
+    def convert(func):
+        converted = func(sample)
+        if sample is not series:
+            if _sample_rules_out(int(converted.notna().sum()), len(sample), confidence):
+                return None
+            converted = func(series)
+        if converted.notna().sum() > 0.6 * n_rows:
+            return converted
+        return None
+
+    try:
+        fmt = _detect_datetime_format(sample)
+        parsed = convert(lambda values: _to_datetime(values, fmt))
+        if parsed is not None:
+            return 'datetime', fmt, parsed
+    except Exception:
+        pass
+    try:
+        numeric_series = convert(lambda values: pd.to_numeric(values, errors='coerce'))
+        if numeric_series is not None:
+            return 'numeric', None, numeric_series
+    except Exception:
+        pass
+    return 'object', None, series
+
+def _coerce_to_kind(series: pd.Series, kind: str, fmt: Optional[str] = None) -> pd.Series:
+    """Converts a column to a kind that was already decided on an earlier chunk."""
+    if kind == 'datetime' and not pd.api.types.is_datetime64_any_dtype(series):
+        return _to_datetime(series, fmt)
+    if kind == 'numeric' and not pd.api.types.is_numeric_dtype(series):
+        return pd.to_numeric(series, errors='coerce')
+    if kind == 'object' and series.dtype != object:
+        return as_text(series)
+    return series
+
+def _loses_values(raw: pd.Series, converted: pd.Series) -> bool:
+    # Values that were present before a conversion and are missing after it did not fit the type
+    return bool((raw.notna().to_numpy() & converted.isna().to_numpy()).any())
+
+def _infer_with_plan(series: pd.Series, planned: Optional[tuple] = None) -> tuple[str, Optional[str], pd.Series]:
+    """
+    _infer_column_type for a raw text column, but tries a saved (kind, datetime format)
+    decision first. A saved datetime/numeric decision is used, skipping sampling and format
+    detection, as long as it still converts more than 60% of the values; otherwise, and for
+    columns saved as text (which may hold dates or numbers in this file), the column is inferred.
+    """
+    if planned is not None:
+        kind, fmt = planned
+        if kind in ('datetime', 'numeric'):
+            converted = _coerce_to_kind(series, kind, fmt)
+            if converted.notna().sum() > 0.6 * len(series):
+                return kind, fmt, converted
+    return _infer_column_type(series)
+
+def _fill_missing_values(series: pd.Series) -> pd.Series:
+    if series.isna().sum() == 0:
+        return series
+
+    if pd.api.types.is_numeric_dtype(series):
+        # Interpolate first, fallback to median
+        series = series.interpolate(method='linear', limit_direction='both')
+        series = series.fillna(series.median())
+
+    elif pd.api.types.is_datetime64_any_dtype(series):
+        series = series.ffill().bfill()
+
+    elif is_text_column(series):
+        mode = series.mode()
+        mode_val = mode.iloc[0] if not mode.empty else "Unknown"
+        series = series.fillna(mode_val)
+
+    return series
+
+def _compact_column(series: pd.Series) -> pd.Series:
+    dtype = series.dtype
+    if not isinstance(dtype, np.dtype) and not _is_raw_text(series):
+        return series  # Categorical, Arrow-backed numerics etc. are already compact
+
+    # Numbers keep their width: the cleaned frame is what users and generated code compute
+    # on, and arithmetic on int8/int16 columns silently wraps around (e.g. qty * price)
+    if dtype.kind == 'f':
+        # Whole-number floats (integer columns that had gaps) become integers again
+        if series.notna().all() and (series % 1 == 0).all() and series.abs().max() < 2**53:
+            return series.astype(np.int64)
+        return series
+
+    if _is_raw_text(series):
+        n_unique = series.nunique(dropna=True)
+        if n_unique < len(series) and n_unique <= CATEGORY_MAX_UNIQUE_RATIO * len(series):
+            return series.astype('category')
+        if pyarrow_available and series.dtype == object \
+                and pd.api.types.infer_dtype(series, skipna=True) == 'string':
+            return series.astype(pd.StringDtype("pyarrow"))
+
+    return series
+
+def compact_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Shrinks a cleaned DataFrame: low-cardinality text becomes 'category' and the remaining
+    string columns become Arrow-backed strings (when pyarrow is installed). Numbers are
+    not narrowed, so arithmetic on the cleaned frame cannot overflow; floats holding only
+    whole numbers become int64.
+    """
+    before = df.memory_usage(deep=True).sum()
+    for col in df.columns:
+        try:
+            df[col] = _compact_column(df[col])
+        except (TypeError, ValueError):
+            continue
+    after = df.memory_usage(deep=True).sum()
+    print(f"Compacted dtypes: {before / 2**20:.1f} MB -> {after / 2**20:.1f} MB")
+    return df
+
+def partial_clean_dataframe(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    The light cleaning stage: drops completely empty rows/columns and normalizes column
+    names, but keeps the parsed values and types. Returns a new frame; df is not modified.
+    """
     # Step 2: Drop completely empty rows/columns
-    df.dropna(how='all', inplace=True)
-    df.dropna(axis=1, how='all', inplace=True)
+    df = df.dropna(how='all')
+    df = df.dropna(axis=1, how='all')
     skip_cols = set()
     # for col in df.columns:
     #     if is_id_column(col):
     #         skip_cols.add(col)
     df = df[[col for col in df.columns if col not in skip_cols]]
     # Step 3: Clean column names
-    df.columns = [
-        str(col).strip().lower().replace(' ', '_').replace('\n', '_')
-        for col in df.columns
-    ]
+    df.columns = _clean_column_names(df.columns)
+    return df
 
-    # Step 4: Try to infer datetime columns
-    for col in df.columns:
-        if df[col].dtype == object:
+def finish_cleaning(df: pd.DataFrame, workers: Optional[int] = None, schema: Optional[dict] = None,
+                    plan: Optional[dict] = None) -> pd.DataFrame:
+    """
+    The full cleaning stage on top of partial_clean_dataframe: type inference, missing
+    value filling and dtype compaction, column-parallel (see clean_columns). Builds a new
+    frame, so the partially cleaned frame passed in stays unchanged and can be reused.
+    """
+    return clean_columns(df, workers, schema, plan)
+
+def _clean_column(series: pd.Series, planned: Optional[tuple] = None) -> tuple[pd.Series, int, Optional[tuple]]:
+    """
+    Steps 4-7 for one column. Also returns its size before compaction, for the memory
+    report, and the (kind, datetime format) decided for raw text columns.
+    """
+    # Step 4 & 5: Infer datetime columns, then convert object-like numerics to float
+    decision = None
+    if _is_raw_text(series):
+        kind, fmt, series = _infer_with_plan(series, planned)
+        decision = (kind, fmt)
+
+    # Step 6: Fill missing values smartly
+    series = _fill_missing_values(series)
+
+    # Step 7: Store the column in the smallest dtype that holds it
+    before = int(series.memory_usage(deep=True, index=False))
+    try:
+        series = _compact_column(series)
+    except (TypeError, ValueError):
+        pass
+    return series, before, decision
+
+def clean_columns(df: pd.DataFrame, workers: Optional[int] = None, schema: Optional[dict] = None,
+                  plan: Optional[dict] = None, processes: Optional[bool] = None) -> pd.DataFrame:
+    """
+    Runs type inference, filling and compaction on every column independently and
+    reassembles the frame. With more than one worker (workers, else CLEANING_WORKERS,
+    else the CPU count) columns are cleaned concurrently in a thread pool; with processes
+    (else CLEANING_PROCESSES) large text columns go to a process pool instead.
+    Returns a new frame; df is not modified.
+    Pass a dict as schema to receive the type decisions made for the text columns, and a
+    saved schema as plan to reuse its decisions (see iter_typed_chunks).
+    """
+    workers = workers or CLEANING_WORKERS or os.cpu_count() or 1
+    processes = CLEANING_PROCESSES if processes is None else processes
+    columns = [df.iloc[:, i] for i in range(df.shape[1])]
+    planned = [(plan or {}).get(col) for col in df.columns]
+
+    if workers <= 1 or len(columns) <= 1 or len(df) < PARALLEL_MIN_ROWS:
+        results = [_clean_column(series, plan) for series, plan in zip(columns, planned)]
+    else:
+        in_process = [i for i, series in enumerate(columns)
+                      if processes and _is_raw_text(series) and len(series) >= PROCESS_MIN_ROWS]
+        in_thread = [i for i in range(len(columns)) if i not in set(in_process)]
+        results = [None] * len(columns)
+        with ThreadPoolExecutor(max_workers=min(workers, len(columns))) as threads:
+            process_pool = ProcessPoolExecutor(max_workers=min(workers, len(in_process))) if in_process else None
             try:
-                parsed = pd.to_datetime(df[col], errors='coerce', utc=False)
-                if parsed.notna().sum() > 0.6 * len(parsed):
-                    df[col] = parsed
-            except Exception:
-                continue
+                futures = {i: process_pool.submit(_clean_column, columns[i], planned[i]) for i in in_process}
+                futures.update({i: threads.submit(_clean_column, columns[i], planned[i]) for i in in_thread})
+                for i, future in futures.items():
+                    results[i] = future.result()
+            finally:
+                if process_pool is not None:
+                    process_pool.shutdown()
+
+    if schema is not None:
+        schema.update({col: decision for col, (_, _, decision) in zip(df.columns, results) if decision is not None})
+    cleaned = pd.DataFrame({i: series for i, (series, _, _) in enumerate(results)}, index=df.index, copy=False)
+    cleaned.columns = df.columns
+    before = sum(size for _, size, _ in results) + df.index.memory_usage(deep=True)
+    after = cleaned.memory_usage(deep=True).sum()
+    print(f"Compacted dtypes: {before / 2**20:.1f} MB -> {after / 2**20:.1f} MB")
+    return cleaned
+
+def clean_dataframe(df: pd.DataFrame, workers: Optional[int] = None) -> pd.DataFrame:
+    return finish_cleaning(partial_clean_dataframe(df), workers)
+
+def read_excel_clean(path: str, sheet_name: str = 0, engine: Optional[str] = None,
+                     workers: Optional[int] = None) -> pd.DataFrame:
+    # Step 1: Read Excel (engine=None lets pandas pick, e.g. 'openpyxl' or 'calamine')
+    df = pd.read_excel(path, sheet_name=sheet_name, engine=engine)
+    return clean_dataframe(df, workers)
+
+def read_excel_sheets(path: str, sheet_names: Optional[List[str]] = None, max_workers: Optional[int] = None,
+                      concat: bool = False, engine: Optional[str] = None):
+    """
+    Reads and cleans several sheets of a workbook (all of them by default), one sheet per
+    worker process so parsing and cleaning run on all cores.
+    Returns a dict of sheet name -> cleaned DataFrame, or with concat=True a single frame
+    with a 'sheet' column telling which sheet each row came from.
+    """
+    if sheet_names is None:
+        with pd.ExcelFile(path, engine=engine) as workbook:
+            sheet_names = workbook.sheet_names
+    sheet_names = list(sheet_names)
+    workers = min(max_workers or os.cpu_count() or 1, len(sheet_names))
+
+    if workers <= 1:
+        frames = [read_excel_clean(path, name, engine) for name in sheet_names]
+    else:
+        # Sheets already run in parallel, so each one cleans its columns sequentially
+        n_sheets = len(sheet_names)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            frames = list(pool.map(read_excel_clean, [path] * n_sheets, sheet_names, [engine] * n_sheets, [1] * n_sheets))
+    sheets = dict(zip(sheet_names, frames))
+    print(f"Read {len(sheets)} sheets from '{path}' using {workers} worker(s).")
+
+    if not concat:
+        return sheets
+    df = pd.concat([frame.assign(sheet=name) for name, frame in sheets.items()], ignore_index=True)
+    # Categories differ between sheets, so re-compact the combined frame
+    return compact_dtypes(df)
+
+def iter_typed_chunks(chunks, schema: Optional[dict] = None, plan: Optional[dict] = None):
+    """
+    Yields raw chunks with clean column names, fully empty rows dropped and every column
+    converted to the type decided on the first chunk that had values for it. Columns that
+    never had values are left out of the schema. No missing values are filled.
+    A later chunk with values that do not convert to the decided type (e.g. codes like
+    'REF-1' in a column that was numeric so far) widens the column to text from that chunk
+    on, instead of turning them into missing values; the schema then says 'object', so
+    consumers convert the chunks they already received with _coerce_to_kind.
+    plan is a schema saved from an earlier load of the same layout (a parse plan): its
+    decisions are tried on the first chunk instead of sampling and detecting formats.
+    """
+    if schema is None:
+        schema = {}  # column -> (kind, datetime format); kind is 'datetime' | 'numeric' | 'object' | 'native'
+    layout = None
+
+    for chunk in chunks:
+        chunk = chunk.dropna(how='all')
+        chunk.columns = _clean_column_names(chunk.columns)
+        if layout is None:
+            layout = list(chunk.columns)
+        chunk = chunk.reindex(columns=layout)
+
+        converted = {}
+        for col in layout:
+            raw = chunk[col]
+            series = raw
+            if col in schema:
+                series = _coerce_to_kind(raw, *schema[col])
+                if _loses_values(raw, series):
+                    print(f"Column '{col}' has values that are not {schema[col][0]}; keeping it as text.")
+                    schema[col] = ('object', None)
+                    series = _coerce_to_kind(raw, 'object')
+            elif raw.notna().any():
+                # First chunk with values for this column decides its type
+                if _is_raw_text(raw):
+                    kind, fmt, series = _infer_with_plan(raw, (plan or {}).get(col))
+                    schema[col] = (kind, fmt)
+                elif pd.api.types.is_numeric_dtype(raw):
+                    schema[col] = ('numeric', None)
+                elif pd.api.types.is_datetime64_any_dtype(raw):
+                    # Readers that type dates themselves may still hand over later chunks as text
+                    schema[col] = ('datetime', None)
+                else:
+                    schema[col] = ('native', None)
+            # Detach from the chunk's blocks so the raw chunk can be freed
+            converted[col] = series.copy() if series is raw else series
+        del chunk
+        yield pd.DataFrame(converted, copy=False)
+
+def clean_chunks(chunks, schema: Optional[dict] = None, missing: Optional[dict] = None,
+                 plan: Optional[dict] = None) -> pd.DataFrame:
+    """
+    Cleans an iterable of raw DataFrame chunks into a single DataFrame.
+    Column types are decided on the first chunk that has values for a column and every
+    later chunk is coerced to that type (or widens the column to text when its values do
+    not fit, see iter_typed_chunks), so the pieces always concatenate to one schema.
+    Each raw chunk is released as soon as it is converted; missing values are filled
+    afterwards one column at a time, since median/mode/interpolation need the whole column.
+    Pass dicts as schema/missing to receive the decided column types and the positions
+    of the values that were filled in, and a saved schema as plan to reuse its decisions.
+    """
+    if schema is None:
+        schema = {}
+    pieces = {}  # column -> list of converted Series
+
+    for chunk in iter_typed_chunks(chunks, schema, plan):
+        if not pieces:
+            pieces = {col: [] for col in chunk.columns}
+        for col in pieces:
+            pieces[col].append(chunk[col])
+        del chunk
+
+    columns = {}
+    for col in list(pieces):
+        col_pieces = pieces.pop(col)
+        if col not in schema:
+            continue  # Completely empty column
+        kind, fmt = schema[col]
+        columns[col] = pd.concat(
+            [_coerce_to_kind(piece, kind, fmt) for piece in col_pieces],
+            ignore_index=True
+        )
+        del col_pieces
 
-    # Step 5: Convert object-like numerics to float
-    for col in df.select_dtypes(include='object').columns:
-        try:
-            numeric_series = pd.to_numeric(df[col], errors='coerce')
-            if numeric_series.notna().sum() > 0.6 * len(numeric_series):
-                df[col] = numeric_series
-        except Exception:
-            continue
+    # copy=False keeps one block per column instead of consolidating into a second copy
+    df = pd.DataFrame(columns, copy=False)
+    del columns
 
-    # Step 6: Fill missing values smartly
     for col in df.columns:
-        if df[col].isna().sum() == 0:
-            continue
-
-        if pd.api.types.is_numeric_dtype(df[col]):
-            # Interpolate first, fallback to median
-            df[col] = df[col].interpolate(method='linear', limit_direction='both')
-            df[col] = df[col].fillna(df[col].median())
-        
-        elif pd.api.types.is_datetime64_any_dtype(df[col]):
-            df[col] = df[col].fillna(method='ffill').fillna(method='bfill')
+        if missing is not None:
+            missing[col] = np.flatnonzero(df[col].isna().to_numpy())
+        df[col] = _fill_missing_values(df[col])
+
+    return compact_dtypes(df)
+
+def csv_chunks(path: str, chunksize: int = 100_000, **read_kwargs):
+    """Yields raw chunks of a CSV file; the file is closed when the iteration ends."""
+    with pd.read_csv(path, chunksize=chunksize, **read_kwargs) as reader:
+        yield from reader
+
+def read_csv_clean(path: str, chunksize: int = 100_000, **read_kwargs) -> pd.DataFrame:
+    """
+    Reads and cleans a CSV file in fixed-size chunks, so peak memory stays around
+    one raw chunk plus the cleaned output instead of the raw and cleaned file together.
+    """
+    with pd.read_csv(path, chunksize=chunksize, **read_kwargs) as reader:
+        return clean_chunks(reader)
+
+class _ColumnBuffer:
+    """
+    The values of one column in a NumPy array with spare capacity. Appends fill the spare
+    slots (the array grows by a quarter when full), so adding k rows costs O(k) amortized,
+    and values() is a view, not a copy. put() changes earlier rows on a copy of the array,
+    so views already handed out keep their values.
+    """
+    def __init__(self, values: np.ndarray):
+        self.size = len(values)
+        self.array = np.empty(self.size + self.size // 4 + 1024, dtype=values.dtype)
+        self.array[:self.size] = values
+
+    def values(self) -> np.ndarray:
+        return self.array[:self.size]
+
+    def extend(self, values: np.ndarray):
+        end = self.size + len(values)
+        if end > len(self.array):
+            grown = np.empty(end + end // 4 + 1024, dtype=self.array.dtype)
+            grown[:self.size] = self.values()
+            self.array = grown
+        self.array[self.size:end] = values
+        self.size = end
+
+    def put(self, positions: np.ndarray, values):
+        self.array = self.array.copy()
+        self.array[positions] = values
+
+class IncrementalFrame:
+    """
+    A cleaned DataFrame that can be extended with appended raw rows, giving the same
+    result as cleaning the whole source again. Keeps the column types decided on the
+    initial load, the positions of values that were filled in and ColumnAggregates of the
+    observed values per column. Columns live in buffers with spare capacity (Arrow chunks
+    for Arrow-backed strings), so a refresh converts, fills, compacts and aggregates only
+    the new rows and writes them after the existing ones. Value counts are kept per batch
+    and added up only when column_stats() asks for them, except for text columns, whose
+    counts live in a dict because the mode and the number of distinct values decide how
+    new rows are filled and stored. Earlier rows are only rewritten when their filled values
+    depend on the new rows (a trailing run of interpolated numbers, or a changed mode in a
+    text column with missing values), and a column is rebuilt in full when its compacted
+    dtype changes in a way the buffers cannot follow (e.g. category to string).
+    fingerprint identifies the cleaned frame for the insight cache and is also extended by
+    the new rows only.
+    """
+    def __init__(self, chunks):
+        self.layout = None  # cleaned column names of the raw source, including empty columns
+        self.schema = {}
+        self.missing = {}
+        self._digest = hashlib.blake2b(f"incremental:{CLEANING_VERSION}".encode(), digest_size=16)
+        df = clean_chunks(self._track(chunks), schema=self.schema, missing=self.missing)
+        self.columns = {col: self._store(col, df[col]) for col in df.columns}
+        del df
+        self.df = self._frame()
+
+    def _track(self, chunks):
+        for chunk in chunks:
+            if self.layout is None:
+                self.layout = _clean_column_names(chunk.columns)
+                self._digest.update(repr(self.layout).encode())
+            self._digest = self._hash_rows(self._digest, chunk)
+            yield chunk
+
+    @staticmethod
+    def _hash_rows(digest, chunk: pd.DataFrame):
+        # The cleaned frame is decided by the raw rows in load order, so hashing those identifies it
+        if digest is None:
+            return None
+        try:
+            digest.update(pd.util.hash_pandas_object(chunk, index=False).to_numpy().tobytes())
+        except TypeError:  # Unhashable cell values, e.g. lists
+            return None
+        return digest
+
+    @property
+    def fingerprint(self) -> Optional[str]:
+        """Content key of the cleaned frame, or None if its raw rows could not be hashed."""
+        return self._digest.hexdigest() if self._digest is not None else None
+
+    def _store(self, col, series: pd.Series) -> dict:
+        """Buffer and bookkeeping for a cleaned column (a full pass, used on load and rebuilds)."""
+        observed = np.ones(len(series), dtype=bool)
+        observed[self.missing[col]] = False
+        positions = np.flatnonzero(observed)
+        aggregates = ColumnAggregates.from_series(series[observed])
+        counts = aggregates.value_counts
+        aggregates.value_counts = pd.Series(dtype='int64')
+        state = {"observed": aggregates, "last_valid": int(positions[-1]) if len(positions) else -1}
+        dtype = series.dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            state.update(store='category', dtype=dtype, codes=_ColumnBuffer(series.cat.codes.to_numpy()))
+        elif isinstance(dtype, pd.StringDtype) and dtype.storage == 'pyarrow':
+            state.update(store='string', chunks=list(series.array.__arrow_array__().chunks))
+        elif isinstance(dtype, np.dtype) and dtype.kind in 'iufMO':
+            state.update(store='array', buffer=_ColumnBuffer(series.to_numpy()))
+        else:
+            state.update(store='series', series=series)
+
+        state["all_str"] = (state["store"] in ('category', 'string') or dtype == object) and \
+            pd.api.types.infer_dtype(counts.index, skipna=True) in ('string', 'empty')
+        if state["all_str"]:
+            state["counts"] = dict(zip(counts.index, counts.to_numpy().tolist()))
+            state["top"] = int(counts.max()) if len(counts) else 0
+            state["mode"] = min(counts.index[counts == state["top"]]) if len(counts) else None
+        else:
+            state["count_parts"] = [counts]
+        if isinstance(dtype, np.dtype) and dtype.kind in 'iuf':
+            state["integral"] = dtype.kind in 'iu' or bool((series.dropna() % 1 == 0).all()) and series.notna().all()
+        return state
+
+    def _series(self, col) -> pd.Series:
+        state = self.columns[col]
+        if state["store"] == 'category':
+            values = pd.Categorical.from_codes(state["codes"].values(), dtype=state["dtype"], validate=False)
+        elif state["store"] == 'string':
+            values = pd.arrays.ArrowStringArray(pyarrow.chunked_array(state["chunks"], type=pyarrow.large_string()))
+        elif state["store"] == 'array':
+            values = state["buffer"].values()
+        else:
+            return state["series"]
+        return pd.Series(values, name=col, copy=False)
 
-        elif isinstance(df[col].dtype, pd.CategoricalDtype) or df[col].dtype == object:
-            mode_val = df[col].mode().iloc[0] if not df[col].mode().empty else "Unknown"
-            df[col] = df[col].fillna(mode_val)
+    def _frame(self) -> pd.DataFrame:
+        # copy=False: the columns stay views of the buffers
+        return pd.DataFrame({col: self._series(col) for col in self.columns}, copy=False)
 
-    return df
+    def append(self, chunks) -> int:
+        """
+        Cleans appended raw chunks with the stored column types and adds them.
+        Raises ValueError, leaving the frame unchanged, when the rows do not fit the
+        stored layout or have values the stored column types cannot hold (a full reload
+        widens those columns to text). Returns the number of rows added.
+        """
+        pieces = {col: [] for col in self.columns}
+        digest = self._digest.copy() if self._digest is not None else None
+        for chunk in chunks:
+            chunk = chunk.dropna(how='all')
+            chunk.columns = _clean_column_names(chunk.columns)
+            if list(chunk.columns) != self.layout:
+                raise ValueError("The appended rows have a different column layout.")
+            digest = self._hash_rows(digest, chunk)
+            for col in self.layout:
+                if col not in pieces:
+                    if chunk[col].notna().any():
+                        raise ValueError(f"Column '{col}' was empty on the initial load but has appended values.")
+                    continue
+                piece = _coerce_to_kind(chunk[col], *self.schema[col])
+                if _loses_values(chunk[col], piece):
+                    raise ValueError(f"Column '{col}' has appended values that are not {self.schema[col][0]}.")
+                pieces[col].append(piece)
+
+        n_old = len(self.df)
+        n_new = sum(len(piece) for piece in next(iter(pieces.values()), []))
+        if n_new == 0:
+            return 0
+
+        for col in self.columns:
+            new = pd.concat(pieces.pop(col), ignore_index=True)
+            if not self._extend(col, new, n_old):
+                self._rebuild(col, new, n_old)
+
+        self.df = self._frame()
+        self._digest = digest
+        print(f"Appended {n_new} rows ({len(self.df)} in total).")
+        return n_new
+
+    def _rebuild(self, col, new: pd.Series, n_old: int):
+        """Appends to a column by cleaning it in full, for the cases _extend does not handle."""
+        old = self._series(col)
+        if isinstance(old.dtype, pd.CategoricalDtype) and new.isin(old.cat.categories).all():
+            new = new.astype(old.dtype)  # Keeps the concatenation categorical
+        tail_missing = np.flatnonzero(new.isna().to_numpy()) + n_old
+        old_missing = self.missing[col]
+        combined = pd.concat([old, new], ignore_index=True)
+
+        refill = len(tail_missing) > 0 or (len(old_missing) > 0 and (
+            is_text_column(old)
+            or (pd.api.types.is_numeric_dtype(old) and old_missing[-1] == n_old - 1)
+        ))
+        if refill:
+            self.missing[col] = np.concatenate([old_missing, tail_missing])
+            mask = np.zeros(len(combined), dtype=bool)
+            mask[self.missing[col]] = True
+            combined = _fill_missing_values(combined.mask(mask))
+        self.columns[col] = self._store(col, _compact_column(combined))
+
+    def _extend(self, col, new: pd.Series, n_old: int) -> bool:
+        """
+        Fills, compacts and appends the new values of a column in O(len(new)), giving the
+        column a full clean_chunks would produce. Returns False if the column needs _rebuild.
+        """
+        state = self.columns[col]
+        if state["observed"].count == 0 or state["store"] == 'series':
+            return False  # Filling an all-missing column depends on every row
+        is_missing = new.isna().to_numpy()
+        observed_new = new[~is_missing]
+        aggregates = ColumnAggregates.from_series(observed_new)
+        observed = state["observed"].merge(aggregates, value_counts=False)
+        n_total = n_old + len(new)
+
+        if state["store"] == 'array' and state["buffer"].array.dtype.kind in 'iuf':
+            if new.dtype.kind not in 'iuf' or max(abs(observed.min_value), abs(observed.max_value)) >= 2**53:
+                return False
+            # Interpolation only reaches back to the last observed value
+            start = state["last_valid"] + 1
+            buffer = state["buffer"]
+            segment = np.concatenate([buffer.values()[start - 1:start].astype(np.float64),
+                                      np.full(n_old - start, np.nan), new.to_numpy(dtype=np.float64)])
+            if np.isnan(segment).any():
+                segment = pd.Series(segment).interpolate(method='linear', limit_direction='both').to_numpy()
+            region = segment[1:]
+            integral = state["integral"] and bool((region % 1 == 0).all())
+            dtype = np.dtype(np.int64) if integral else np.dtype(np.float64)
+            if dtype != buffer.array.dtype:
+                buffer = _ColumnBuffer(buffer.values().astype(dtype))
+            if start < n_old:
+                buffer.put(np.arange(start, n_old), region[:n_old - start].astype(dtype))
+            buffer.extend(region[n_old - start:].astype(dtype))
+            state.update(buffer=buffer, integral=integral)
+
+        elif state["store"] == 'array' and state["buffer"].array.dtype.kind == 'M':
+            if new.dtype != state["buffer"].array.dtype:
+                return False
+            values = new.to_numpy()
+            if is_missing.any():
+                # Forward fill from the last value already in the column
+                values = pd.Series(np.concatenate([state["buffer"].values()[-1:], values])).ffill().to_numpy()[1:]
+            state["buffer"].extend(values)
+
+        elif state["all_str"] and pd.api.types.infer_dtype(observed_new, skipna=True) in ('string', 'empty'):
+            # Update the counts, and the mode (most frequent, then smallest value), by the new values only
+            counts, top, mode = state["counts"], state["top"], state["mode"]
+            updated = {}
+            for value, freq in zip(aggregates.value_counts.index, aggregates.value_counts.to_numpy().tolist()):
+                freq += counts.get(value, 0)
+                updated[value] = freq
+                if freq > top or freq == top and value < mode:
+                    top, mode = freq, value
+            unseen = [value for value in updated if value not in counts]
+            values = new.astype(object).where(~is_missing, mode).to_numpy()
+            old_missing = self.missing[col]
+            refill_old = mode != state["mode"] and len(old_missing) > 0
+
+            distinct = len(counts) + len(unseen)
+            if distinct < n_total and distinct <= CATEGORY_MAX_UNIQUE_RATIO * n_total:
+                store = 'category'
+            elif pyarrow_available:
+                store = 'string'
+            else:
+                store = 'object'
+            if store != state["store"] and not (store == 'object' and state["store"] == 'array'):
+                return False
+
+            if store == 'category':
+                old_categories = state["dtype"].categories
+                dtype = state["dtype"] if distinct == len(old_categories) else pd.CategoricalDtype(sorted([*counts, *unseen]))
+                codes = state["codes"]
+                if not dtype.categories[:len(old_categories)].equals(old_categories):
+                    # New categories sort between existing ones: renumber the existing codes
+                    mapping = dtype.categories.get_indexer(old_categories)
+                    codes = _ColumnBuffer(mapping[codes.values()])
+                codes_dtype = pd.Categorical([], dtype=dtype).codes.dtype
+                if codes.array.dtype != codes_dtype:
+                    codes = _ColumnBuffer(codes.values().astype(codes_dtype))
+                if refill_old:
+                    codes.put(old_missing, dtype.categories.get_loc(mode))
+                codes.extend(dtype.categories.get_indexer(values).astype(codes_dtype))
+                state.update(dtype=dtype, codes=codes)
+            elif store == 'string':
+                if refill_old:
+                    return False
+                state["chunks"].append(pyarrow.array(values, type=pyarrow.large_string()))
+            else:
+                if refill_old:
+                    state["buffer"].put(old_missing, mode)
+                state["buffer"].extend(values)
+            counts.update(updated)
+            state.update(top=top, mode=mode)
 
-def profile_dataframe(df: pd.DataFrame) -> pd.DataFrame:
+        else:
+            return False
+
+        if len(observed_new):
+            state["last_valid"] = n_old + int(np.flatnonzero(~is_missing)[-1])
+        if not state["all_str"]:
+            state["count_parts"].append(aggregates.value_counts)
+        state["observed"] = observed
+        self.missing[col] = np.concatenate([self.missing[col], np.flatnonzero(is_missing) + n_old])
+        return True
+
+    def column_stats(self) -> dict:
+        """Per-column statistics in the layout used by insights_from_column_stats."""
+        columns = {}
+        for col in self.df.columns:
+            series = self.df[col]
+            aggregates = self._observed(col)
+            if len(self.missing[col]):
+                # Filled-in values count like observed ones, as in a profile of the cleaned frame
+                aggregates = aggregates.merge(ColumnAggregates.from_series(series.iloc[self.missing[col]]))
+            columns[col] = aggregates.to_stats(str(series.dtype))
+        return {"rows": len(self.df), "columns": columns}
+
+    def _observed(self, col) -> "ColumnAggregates":
+        """The observed aggregates of a column with their value counts added up."""
+        state = self.columns[col]
+        if state["all_str"]:
+            counts = pd.Series(state["counts"], dtype='int64')
+        else:
+            parts = [part for part in state["count_parts"] if len(part)]
+            counts = pd.concat(parts).groupby(level=0, sort=False).sum() if len(parts) > 1 else \
+                (parts[0] if parts else pd.Series(dtype='int64'))
+            state["count_parts"] = [counts]
+        observed = copy.copy(state["observed"])
+        observed.value_counts = counts
+        return observed
+
+def profile_dataframe(df: pd.DataFrame, stats_cache: Optional[ColumnStatsCache] = None) -> pd.DataFrame:
     profile = []
+    stats_cache = _stats_for(df, stats_cache)
 
     for col in df.columns:
         data = df[col]
         dtype = str(data.dtype)
         missing_pct = data.isna().mean() * 100
-        unique_vals = data.nunique(dropna=True)
+        unique_vals = stats_cache.nunique(col)
 
         top_values = (
-            data.value_counts(dropna=True)
+            stats_cache.value_counts(col)
             .head(5)
             .to_dict()
         )
@@ -102,7 +928,7 @@ def profile_dataframe(df: pd.DataFrame) -> pd.DataFrame:
                 "max": data.max(),
                 "mean": data.mean(),
                 "median": data.median(),
-                "std": data.std()
+                "std": stats_cache.std(col)
             })
 
         elif pd.api.types.is_datetime64_any_dtype(data):
@@ -116,6 +942,135 @@ def profile_dataframe(df: pd.DataFrame) -> pd.DataFrame:
 
     return pd.DataFrame(profile)
 
+def profile_from_column_stats(column_stats: dict) -> pd.DataFrame:
+    """Same layout as profile_dataframe, built from precomputed per-column statistics."""
+    n_rows = column_stats["rows"]
+    profile = []
+    for col, stats in column_stats["columns"].items():
+        col_profile = {
+            "column": col,
+            "dtype": stats.get("dtype", stats["kind"]),
+            "missing_%": round((n_rows - stats["count"]) / n_rows * 100, 2) if n_rows else 0.0,
+            "unique_values": stats["distinct"],
+            "top_values": dict(list((stats.get("top_values") or {}).items())[:5])
+        }
+        if stats["kind"] == "numeric":
+            col_profile.update({k: stats.get(k) for k in ("min", "max", "mean", "median", "std")})
+        elif stats["kind"] == "datetime" and stats["count"]:
+            min_date, max_date = pd.Timestamp(stats["min"]), pd.Timestamp(stats["max"])
+            col_profile.update({
+                "min_date": min_date,
+                "max_date": max_date,
+                "range_days": (max_date - min_date).days
+            })
+        profile.append(col_profile)
+    return pd.DataFrame(profile)
+
+class ColumnAggregates:
+    """
+    Exact statistics of one column that can be merged across row batches: count, sum,
+    mean and centred second moment (combined with Chan et al.'s parallel update),
+    min/max and full value counts, from which distinct counts, medians and top values follow.
+    """
+    def __init__(self, kind: str, count: int = 0, total: float = 0.0, mean: float = 0.0, m2: float = 0.0,
+                 min_value=None, max_value=None, value_counts: pd.Series = None):
+        self.kind = kind  # 'numeric' | 'datetime' | 'text', as in compute_sql_column_stats
+        self.count = count
+        self.total = total
+        self.mean = mean
+        self.m2 = m2
+        self.min_value = min_value
+        self.max_value = max_value
+        self.value_counts = value_counts if value_counts is not None else pd.Series(dtype='int64')
+
+    @classmethod
+    def from_series(cls, series: pd.Series) -> "ColumnAggregates":
+        values = series.dropna()
+        kind = column_kind(series)
+        value_counts = values.value_counts(sort=False)
+        if isinstance(value_counts.index, pd.CategoricalIndex):
+            value_counts = value_counts[value_counts > 0]
+            value_counts.index = value_counts.index.astype(object)
+        aggregates = cls(kind, count=len(values), value_counts=value_counts.astype('int64'))
+        if len(values) and kind in ('numeric', 'datetime'):
+            aggregates.min_value, aggregates.max_value = values.min(), values.max()
+        if len(values) and kind == 'numeric':
+            aggregates.total = float(values.sum())
+            aggregates.mean = aggregates.total / len(values)
+            aggregates.m2 = float(((values - aggregates.mean) ** 2).sum())
+        return aggregates
+
+    def merge(self, other: "ColumnAggregates", value_counts: bool = True) -> "ColumnAggregates":
+        """
+        Combines the aggregates of two batches. value_counts=False leaves the (empty) value
+        counts of self as they are, so merging costs O(1) instead of O(distinct values).
+        """
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            return other
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        return ColumnAggregates(
+            self.kind,
+            count=count,
+            total=self.total + other.total,
+            mean=(self.total + other.total) / count,
+            m2=self.m2 + other.m2 + delta * delta * self.count * other.count / count,
+            min_value=min(self.min_value, other.min_value) if self.min_value is not None else None,
+            max_value=max(self.max_value, other.max_value) if self.max_value is not None else None,
+            value_counts=self.value_counts.add(other.value_counts, fill_value=0).astype('int64') if value_counts
+            else self.value_counts
+        )
+
+    def median(self):
+        # Middle value(s) of the sorted column, read off the cumulative value counts
+        value_counts = self.value_counts.sort_index()
+        cumulative = value_counts.to_numpy().cumsum()
+        lower = value_counts.index[np.searchsorted(cumulative, (self.count - 1) // 2, side='right')]
+        upper = value_counts.index[np.searchsorted(cumulative, self.count // 2, side='right')]
+        return (lower + upper) / 2
+
+    def to_stats(self, dtype: str = None) -> dict:
+        """Statistics in the per-column layout of compute_sql_column_stats."""
+        stats = {"kind": self.kind, "dtype": dtype or self.kind, "count": self.count, "distinct": len(self.value_counts)}
+        if self.kind == 'numeric' and self.count:
+            stats.update({
+                "sum": self.total,
+                "mean": self.mean,
+                "min": float(self.min_value),
+                "max": float(self.max_value),
+                "std": float(np.sqrt(self.m2 / (self.count - 1))) if self.count > 1 else np.nan,
+                "median": float(self.median())
+            })
+        elif self.kind == 'datetime' and self.count:
+            stats.update({"min": pd.Timestamp(self.min_value), "max": pd.Timestamp(self.max_value)})
+        elif self.kind == 'text':
+            # Most frequent first, ties broken by value so merged and fresh aggregates agree
+            order = np.lexsort((self.value_counts.index.astype(str), -self.value_counts.to_numpy()))[:50]
+            top = self.value_counts.iloc[order]
+            stats["top_values"] = {value: int(freq) for value, freq in top.items()}
+        return stats
+
+def profile_chunks(chunks, **sketch_options) -> pd.DataFrame:
+    """
+    Same layout as profile_dataframe, computed in one pass over raw chunks with mergeable
+    sketches (see sketches.ProfileSketch), so memory stays bounded for data larger than RAM.
+    Chunks are typed like clean_chunks does but missing values are not filled; distinct
+    counts and medians are approximate once a column outgrows its sketches.
+    """
+    sketch = ProfileSketch(**sketch_options)
+    for chunk in iter_typed_chunks(chunks):
+        sketch.update(chunk)
+    return profile_from_column_stats(sketch.column_stats())
+
+def column_stats_from_dataframe(df: pd.DataFrame) -> dict:
+    """Exact per-column statistics of an in-memory DataFrame, for insights_from_column_stats."""
+    return {
+        "rows": len(df),
+        "columns": {col: ColumnAggregates.from_series(df[col]).to_stats(str(df[col].dtype)) for col in df.columns}
+    }
+
 def choose_best_period(df: pd.DataFrame, datetime_col: str, min_bins=6, max_bins=60) -> str:
     options = ["D", "W", "M", "Q", "Y"]
     n_unique = {}
@@ -143,14 +1098,18 @@ def is_duration_like(col: pd.Series) -> bool:
 def is_percentage_like(col: pd.Series) -> bool:
     return col.dropna().between(0.001, 1.5).mean() > 0.8 or '%' in col.name.lower()
 
+def _python_number(value):
+    # int8/int16 scalars (e.g. from Arrow files) overflow in percent and hour arithmetic; Python numbers do not
+    return value.item() if isinstance(value, np.generic) else value
+
 def format_time_from_hours(hours):
-    seconds = int(hours * 3600)
+    seconds = int(float(hours) * 3600)  # float(): int8/int16 values would overflow
     return f"{seconds // 3600}:{(seconds % 3600) // 60:02}:{seconds % 60:02}"
 
 def format_seconds_to_hhmmss(seconds):
     if pd.isnull(seconds):
         return "N/A"
-    seconds = int(round(seconds * 3600))  # hours → seconds
+    seconds = int(round(float(seconds) * 3600))  # hours → seconds
     return f"{seconds//3600}:{(seconds%3600)//60:02}:{seconds%60:02}"
 
 def is_valid_datetime_column(series: pd.Series) -> bool:
@@ -158,109 +1117,279 @@ def is_valid_datetime_column(series: pd.Series) -> bool:
         return False
     if pd.api.types.is_timedelta64_dtype(series):
         return False
-    if series.dt.date.nunique() < 5:
+    # Calendar days as datetime64 rather than arrays of date/time objects
+    days = series.dt.normalize()
+    if days.nunique() < 5:
         return False
-    if (series.dt.time != pd.to_datetime('00:00:00').time()).all():
+    if not (series == days).any():
         return False
     return True
 
-def convert_hhmmss_to_timedelta(series: pd.Series) -> pd.Series:
-    def parse_duration(val):
-        if pd.isnull(val):
-            return np.nan
-        if isinstance(val, (pd.Timedelta, np.timedelta64)):
-            return val
-        if isinstance(val, str):
-            match = re.match(r'^(\d{1,2}):(\d{2})(?::(\d{2}))?$', val.strip())
-            if match:
-                h, m, s = match.groups()
-                h = int(h)
-                m = int(m)
-                s = int(s or 0)
-                return pd.Timedelta(hours=h, minutes=m, seconds=s)
-        return np.nan
-
-    converted = series.apply(parse_duration)
-    if converted.notna().sum() > 0.6 * len(series):
+DURATION_PATTERN = r'^\s*(\d{1,2}):(\d{2})(?::(\d{2})(?:\.(\d{1,9}))?)?\s*$'
+
+def _parse_durations(values: pd.Series) -> pd.Series:
+    """
+    Vectorized H:MM / H:MM:SS[.fff] parser: one regex extraction into integer arrays and
+    a single to_timedelta. Timedeltas are kept; other values that are not matching strings
+    (numbers, dates, ...) become NaT.
+    """
+    values = values.astype(object)
+    # Only strings go through the regex (.str refuses columns of e.g. integer categories)
+    is_text = values.map(lambda value: isinstance(value, str)).to_numpy(dtype=bool)
+    parts = values.where(is_text, '').astype(str).str.extract(DURATION_PATTERN)
+    matched = parts[0].notna().to_numpy()
+    hours, minutes, seconds = (parts[i].fillna('0').to_numpy(dtype=np.int64) for i in range(3))
+    fraction = parts[3].fillna('').str.pad(9, side='right', fillchar='0').to_numpy(dtype=np.int64)
+    nanoseconds = ((hours * 60 + minutes) * 60 + seconds) * 10**9 + fraction
+    parsed = pd.to_timedelta(np.where(matched, nanoseconds, np.iinfo(np.int64).min), unit='ns').to_numpy()
+
+    is_timedelta = values.map(lambda value: isinstance(value, (pd.Timedelta, np.timedelta64))).to_numpy(dtype=bool)
+    if is_timedelta.any():
+        parsed[is_timedelta] = pd.to_timedelta(values[is_timedelta]).to_numpy()
+    return pd.Series(parsed, index=values.index, name=values.name)
+
+def convert_hhmmss_to_timedelta(series: pd.Series, sample_size: int = None, confidence: float = None) -> pd.Series:
+    """
+    Converts a text column of durations to timedelta when more than 60% of its values parse.
+    Columns whose random sample confidently rules that out are returned untouched without
+    parsing the rest.
+    """
+    sample_size = sample_size or INFERENCE_SAMPLE_SIZE
+    confidence = confidence or INFERENCE_CONFIDENCE
+    n_rows = len(series)
+    if n_rows == 0:
+        return series
+
+    if n_rows > sample_size:
+        positions = np.random.default_rng(0).choice(n_rows, size=sample_size, replace=False)
+        sample = series.iloc[np.sort(positions)]
+        if _sample_rules_out(int(_parse_durations(sample).notna().sum()), sample_size, confidence):
+            return series
+
+    # Durations repeat a lot, so only the distinct values (or categories) are parsed
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes, uniques = series.cat.codes.to_numpy(), series.cat.categories
+    else:
+        codes, uniques = pd.factorize(series)
+    if len(uniques) == 0:
+        return series  # nothing but missing values
+    parsed = _parse_durations(pd.Series(uniques)).to_numpy()
+    converted = pd.Series(np.where(codes >= 0, parsed[codes], np.timedelta64('NaT')),
+                          index=series.index, name=series.name)
+    if converted.notna().sum() > 0.6 * n_rows:
         return converted
     return series  # fallback if most couldn't be parsed
 
-def get_top_performers(df: pd.DataFrame, top_numeric_cols: list) -> dict:
+def get_top_performers(df: pd.DataFrame, top_numeric_cols: list, stats_cache: Optional[ColumnStatsCache] = None) -> dict:
     top_performers = {}
+    stats_cache = _stats_for(df, stats_cache)
+    if not top_numeric_cols:
+        return top_performers
+    # All metrics are aggregated together, one grouping per key column (categorical keys group on their codes)
+    metrics = _column_view(df, top_numeric_cols)
 
     # Step 1: Try to find a name/id column
-    name_id_cols = [col for col in df.columns if df[col].dtype == object and is_id_like(col)]
+    name_id_cols = [col for col in text_columns(df) if is_id_like(col)]
     group_col = name_id_cols[0] if name_id_cols else None
 
     if group_col:
-        for num_col in top_numeric_cols:
-            grp = df.groupby(group_col)[num_col].sum()
-            top = grp.idxmax()
+        totals = metrics.groupby(df[group_col], observed=True).sum()
+        for num_col, top in totals.idxmax().items():
             top_performers[f"top_{group_col}_by_{num_col}"] = {
                 "name": top,
-                "total": float(grp[top])
+                "total": float(totals.at[top, num_col])
             }
     else:
         # Step 2: Use best-separating categorical column instead (up to 3)
         cat_cols = [
-            col for col in df.select_dtypes(include='object').columns
-            if 2 < df[col].nunique() < min(len(df) // 4, 30)
+            col for col in text_columns(df)
+            if 2 < stats_cache.nunique(col) < min(len(df) // 4, 30)
         ]
-        separation_scores = {}
+        separation_scores, group_totals = {}, {}
         for cat in cat_cols:
-            score = 0
-            for num in top_numeric_cols:
-                try:
-                    means = df.groupby(cat)[num].mean()
-                    score += means.std()
-                except:
-                    continue
+            # One grouping per column: the group means are its sums over its counts, and only the
+            # small per-group sums are kept for the winners, not the GroupBy and its row codes
+            aggregated = metrics.groupby(df[cat], observed=True).agg(['sum', 'count'])
+            totals = aggregated.xs('sum', axis=1, level=1)
+            means = totals / aggregated.xs('count', axis=1, level=1)
+            # Summed in metric order, so a metric without a spread (NaN) disqualifies the column
+            score = sum(means.std().tolist(), 0)
             if score > 0:
-                separation_scores[cat] = score
+                separation_scores[cat], group_totals[cat] = score, totals
 
         best_cat_cols = sorted(separation_scores, key=separation_scores.get, reverse=True)[:3]
 
         for cat in best_cat_cols:
-            for num in top_numeric_cols:
-                try:
-                    grp = df.groupby(cat)[num].sum()
-                    top = grp.idxmax()
-                    top_performers[f"top_{cat}_by_{num}"] = {
-                        "name": top,
-                        "total": float(grp[top])
-                    }
-                except:
-                    continue
+            totals = group_totals[cat]
+            for num, top in totals.idxmax().items():
+                top_performers[f"top_{cat}_by_{num}"] = {
+                    "name": top,
+                    "total": float(totals.at[top, num])
+                }
 
     return top_performers
 
+def _trend_slopes(x: np.ndarray, df: pd.DataFrame, columns: list) -> tuple[dict, dict]:
+    """
+    Least-squares slope of each column against x: each column is fitted on its own rows with
+    values, which is what a per-column LinearRegression fit computes. The columns are stacked
+    into one matrix per block of rows (see _target_moments), and the masked sums behind every
+    fit are added up for all columns at once.
+    Returns the slopes and the number of points each fit used.
+    """
+    k = len(columns)
+    n, sum_x, sum_y, sum_xx, sum_xy = np.zeros((5, k))
+    x_missing = np.isnan(x)
+    # Shift x and every column by one observed value, so the sums of squares do not cancel and
+    # constant columns get a slope of exactly zero ("stable") rather than rounding noise
+    x0 = x[np.argmin(x_missing)]
+    shift = np.zeros(k)
+    for j, col in enumerate(columns):
+        observed = df[col].notna().to_numpy()
+        if observed.any():
+            shift[j] = df[col].iloc[observed.argmax()]
+    block_rows = max(MOMENT_MIN_BLOCK_ROWS, -(-len(df) // MOMENT_BLOCKS))
+    for start in range(0, len(df), block_rows):
+        moments = _target_moments(df.iloc[start:start + block_rows], columns, shift)
+        x_observed = ~x_missing[start:start + block_rows]
+        xb = np.where(x_observed, x[start:start + block_rows] - x0, 0.0)
+        mask = moments[:, :k] * x_observed[:, None]  # Rows where both x and the column have values
+        y = moments[:, k:2 * k]  # Zero where the column is missing
+        n += mask.sum(axis=0)
+        sum_x += xb @ mask
+        sum_xx += (xb * xb) @ mask
+        sum_y += x_observed @ y
+        sum_xy += xb @ y
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sxx = sum_xx - sum_x ** 2 / n
+        slopes = np.where((n > 0) & (sxx > 0), (sum_xy - sum_x * sum_y / n) / sxx, 0.0)
+    return dict(zip(columns, slopes.tolist())), dict(zip(columns, n.astype(int).tolist()))
+
+def _target_moments(df: pd.DataFrame, targets: list, shift: np.ndarray) -> np.ndarray:
+    """
+    The targets stacked as [value indicators | values | squares] (rows x 3 targets), missing
+    values as zeros. Values are shifted by shift (their column means), so sums of squares
+    over any group of rows do not cancel. Summing rows of this matrix gives count, sum and
+    sum of squares for every target at once.
+    """
+    # Filled in place, so the matrix is the only rows x targets float array
+    k = len(targets)
+    moments = np.empty((len(df), 3 * k))
+    y = moments[:, k:2 * k]
+    for j, target in enumerate(targets):
+        y[:, j] = df[target].to_numpy(dtype=np.float64, na_value=np.nan)
+    missing = np.isnan(y)
+    moments[:, :k] = ~missing
+    y -= shift
+    np.copyto(y, 0.0, where=missing)
+    np.multiply(y, y, out=moments[:, 2 * k:])
+    return moments
+
+def _moment_sums(df: pd.DataFrame, targets: list, conditions: list, cats: list) -> tuple[dict, dict, np.ndarray]:
+    """
+    The sums of target moments (see _target_moments) behind the t-tests and ANOVAs of
+    detect_trends, in one pass over blocks of rows: per condition column over the rows above
+    and at or below its 80th percentile (rows: high, low), and per category column by category.
+    Returns those two dicts and the shift of the moments.
+    """
+    shift = np.array([df[target].mean() for target in targets], dtype=np.float64)
+    shift = np.where(np.isnan(shift), 0.0, shift)
+    thresholds = {cond: df[cond].quantile(0.8) for cond in conditions}
+    sides = {cond: np.zeros((2, 3 * len(targets))) for cond in conditions}
+    groups = {}
+    block_rows = max(MOMENT_MIN_BLOCK_ROWS, -(-len(df) // MOMENT_BLOCKS))
+    for start in range(0, len(df), block_rows):
+        block = df.iloc[start:start + block_rows]
+        moments = _target_moments(block, targets, shift)
+        for cond, threshold in thresholds.items():
+            values = block[cond]
+            block_sides = np.vstack([
+                (values > threshold).to_numpy(dtype=bool, na_value=False),
+                (values <= threshold).to_numpy(dtype=bool, na_value=False)
+            ]).astype(np.float64)
+            sides[cond] += block_sides @ moments
+        for cat in cats:
+            part = pd.DataFrame(moments, index=block.index).groupby(block[cat], observed=True).sum()
+            groups[cat] = _add_grouped(groups.get(cat), part)
+    return sides, groups, shift
+
+def _percentile_split_ttests(sides: dict, targets: list, shift: np.ndarray):
+    """
+    Welch t-tests of every target between the rows above and at or below each condition
+    column's 80th percentile, vectorized over the targets from the summed moments of both
+    sides (see _moment_sums).
+    Yields (condition, target, high mean, low mean, p-value) for the pairs with at least
+    5 values on each side, in condition then target order.
+    """
+    for cond, side_sums in sides.items():
+        counts, sums, sumsq = np.split(side_sums, 3, axis=1)  # rows: high, low
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            means = sums / counts
+            std = np.sqrt(np.maximum(sumsq - counts * means ** 2, 0.0) / (counts - 1))
+            _, pvals = ttest_ind_from_stats(means[0], std[0], counts[0], means[1], std[1], counts[1], equal_var=False)
+
+        for j, target in enumerate(targets):
+            if target == cond or counts[0, j] < 5 or counts[1, j] < 5:
+                continue
+            yield cond, target, means[0, j] + shift[j], means[1, j] + shift[j], float(pvals[j])
+
+def _grouped_anova(grouped: Optional[pd.DataFrame], targets: list, shift: np.ndarray):
+    """
+    One-way ANOVA of every target across categories, from the target moments summed per
+    category (see _moment_sums): per category count, sum and sum of squares give the
+    between/within sums of squares, as f_oneway computes them from the group arrays.
+    Yields (target, p-value, category means) for the targets with at least two categories
+    and 3 values in every category, in target order.
+    """
+    if grouped is None:
+        return
+    k = len(targets)
+    counts, sums, sumsq = (grouped.iloc[:, i * k:(i + 1) * k].to_numpy() for i in range(3))
+
+    for j, target in enumerate(targets):
+        n_groups, n = len(grouped), counts[:, j].sum()
+        if n_groups < 2 or (counts[:, j] < 3).any():
+            continue
+        group_means = sums[:, j] / counts[:, j]
+        grand_mean = sums[:, j].sum() / n
+        between = float((counts[:, j] * (group_means - grand_mean) ** 2).sum())
+        within = float(np.maximum(sumsq[:, j] - counts[:, j] * group_means ** 2, 0.0).sum())
+        if within > 0:
+            pval = f_distribution.sf((between / (n_groups - 1)) / (within / (n - n_groups)), n_groups - 1, n - n_groups)
+        else:
+            # Constant within every group, like f_oneway: certain if the groups differ, else undefined
+            pval = 0.0 if between > 0 else np.nan
+        yield target, float(pval), pd.Series(group_means + shift[j], index=grouped.index)
+
 def detect_trends(
     df: pd.DataFrame,
     date_col: str = None,
-    top_numeric_cols: list = []
+    top_numeric_cols: list = [],
+    stats_cache: Optional[ColumnStatsCache] = None
 ) -> dict:
     trend_insights = {}
-    df = df.copy()
+    stats_cache = _stats_for(df, stats_cache)
 
     # 1. Temporal trend & seasonality (if date exists)
     if date_col and date_col in df.columns and pd.api.types.is_datetime64_any_dtype(df[date_col]):
-        df = df.sort_values(by=date_col)
-        df['_date_num'] = (df[date_col] - df[date_col].min()).dt.days
-
-        for col in top_numeric_cols:
-            y = df[col].dropna()
-            x = df['_date_num'].loc[y.index].values.reshape(-1, 1)
-            if len(x) < 5:
-                continue
-
-            model = LinearRegression().fit(x, y)
-            slope = model.coef_[0]
+        # Derived series rather than helper columns on a copy of df: the fit does not need
+        # sorted rows, and the helpers must not be picked up as conditions below
+        date_num = (df[date_col] - df[date_col].min()).dt.days
+        slopes, counts = _trend_slopes(date_num.to_numpy(dtype=np.float64), df, top_numeric_cols)
+        trend_cols = [col for col in top_numeric_cols if counts[col] >= 5]
+
+        # Seasonality (by quarter): mean of every trend column in one groupby
+        quarter = df[date_col].dt.to_period("Q")
+        quarterly_means = _column_view(df, trend_cols).groupby(quarter).mean()
+
+        for col in trend_cols:
+            slope = slopes[col]
             direction = "increasing" if slope > 0 else "decreasing" if slope < 0 else "stable"
             trend_insights[col] = {"overall_trend": direction}
 
-            # Seasonality (by quarter)
-            df["quarter"] = df[date_col].dt.to_period("Q")
-            seasonal = df.groupby("quarter")[col].mean()
+            seasonal = quarterly_means[col]
             if len(seasonal) >= 1:
                 top_q = seasonal.idxmax().strftime("Q%q %Y")
                 bottom_q = seasonal.idxmin().strftime("Q%q %Y")
@@ -274,51 +1403,36 @@ def detect_trends(
 
     # 2A. Numeric → Numeric (quantile-based t-test)
     condition_candidates = [
-        col for col in df.select_dtypes(include='number').columns
-        if df[col].nunique() > 5 and not df[col].isin([0, 1]).all()
+        col for col in numeric_columns(df)
+        if stats_cache.nunique(col) > 5 and not df[col].isin([0, 1]).all()
     ]
 
-    for cond in condition_candidates:
-        high = df[df[cond] > df[cond].quantile(0.8)]
-        low = df[df[cond] <= df[cond].quantile(0.8)]
+    # 2B candidates: Categorical → Numeric (ANOVA)
+    cat_cols = [
+        col for col in text_columns(df)
+        if not is_id_like(col) and 2 < stats_cache.nunique(col) < 25
+    ]
 
-        for target in top_numeric_cols:
-            if target == cond or target not in df.columns:
-                continue
-            mean_high = high[target].mean()
-            mean_low = low[target].mean()
+    # Count, sum and sum of squares of every target, shared by the t-tests and the ANOVAs
+    targets = [target for target in top_numeric_cols if target in df.columns]
+    sides, groups, shift = _moment_sums(df, targets, condition_candidates, cat_cols) if targets else ({}, {}, None)
 
-            if pd.notnull(mean_high) and pd.notnull(mean_low) and len(high[target].dropna()) >= 5 and len(low[target].dropna()) >= 5:
-                stat, pval = ttest_ind(high[target].dropna(), low[target].dropna(), equal_var=False)
-                pct_change = (mean_high - mean_low) / abs(mean_low + 1e-6) * 100
+    for cond, target, mean_high, mean_low, pval in _percentile_split_ttests(sides, targets, shift):
+        pct_change = (mean_high - mean_low) / abs(mean_low + 1e-6) * 100
 
-                if pval < 0.05 and abs(pct_change) > 20:
-                    conditional_effects.append({
-                        "condition": f"{cond} > 80th percentile",
-                        "target": target,
-                        "effect": f"{pct_change:.1f}% {'increase' if pct_change > 0 else 'decrease'}",
-                        "p_value": f"{pval:.4f}"
-                    })
+        if pval < 0.05 and abs(pct_change) > 20:
+            conditional_effects.append({
+                "condition": f"{cond} > 80th percentile",
+                "target": target,
+                "effect": f"{pct_change:.1f}% {'increase' if pct_change > 0 else 'decrease'}",
+                "p_value": f"{pval:.4f}"
+            })
 
     # 2B. Categorical → Numeric (ANOVA)
-    cat_cols = [
-        col for col in df.select_dtypes(include='object').columns
-        if not is_id_like(col) and 2 < df[col].nunique() < 25
-    ]
-
     for cat in cat_cols:
-        for target in top_numeric_cols:
-            if target not in df.columns:
-                continue
-
-            groups = [group.dropna().values for _, group in df.groupby(cat)[target]]
-            if len(groups) < 2 or any(len(g) < 3 for g in groups):
-                continue
-
-            stat, pval = f_oneway(*groups)
+        for target, pval, means in _grouped_anova(groups.get(cat), targets, shift):
             if pval < 0.05:
                 # Optionally: get category with max mean
-                means = df.groupby(cat)[target].mean()
                 best = means.idxmax()
                 worst = means.idxmin()
                 diff_pct = (means.max() - means.min()) / abs(means.min() + 1e-6) * 100
@@ -350,101 +1464,252 @@ def detect_trends(
 
     return trend_insights
 
-def generate_insights(
+# --- Insight task graph ---
+class TaskGraph:
+    """
+    Named tasks with dependencies. run() starts each task as soon as the tasks it depends
+    on have finished, so independent tasks run concurrently. Workers are threads: they
+    share the loaded DataFrames instead of pickling them to other processes, and NumPy and
+    pandas release the GIL in many of their heavy loops. Tasks marked main_thread (e.g.
+    anything drawing with pyplot, which is not thread-safe) run in the calling thread.
+    """
+    def __init__(self):
+        self.tasks = {}  # name -> (func, deps, main_thread)
+
+    def add(self, name: str, func, deps=(), main_thread: bool = False) -> "TaskGraph":
+        """func is called with the results of its dependencies as keyword arguments."""
+        self.tasks[name] = (func, tuple(deps), main_thread)
+        return self
+
+    def _check(self):
+        done, remaining = set(), dict(self.tasks)
+        while remaining:
+            ready = [name for name, (_, deps, _) in remaining.items() if set(deps) <= done]
+            if not ready:
+                raise ValueError(f"Tasks with missing or circular dependencies: {sorted(remaining)}")
+            for name in ready:
+                done.add(name)
+                del remaining[name]
+
+    def run(self, max_workers: Optional[int] = None) -> dict:
+        """Runs every task once and returns {name: result}. The first failure is re-raised."""
+        self._check()
+        results = {}
+        started = set()
+        lock = threading.Lock()
+        main_queue = queue.Queue()  # main_thread tasks that are ready, failures, or None when all are done
+
+        def call(name):
+            func, deps, _ = self.tasks[name]
+            return func(**{dep: results[dep] for dep in deps})
+
+        def dispatch():
+            # Starts every task whose dependencies are done, from the thread that finished the last one
+            with lock:
+                ready = [name for name, (_, deps, _) in self.tasks.items()
+                         if name not in started and all(dep in results for dep in deps)]
+                started.update(ready)
+                all_done = len(results) == len(self.tasks)
+            for name in ready:
+                if self.tasks[name][2]:
+                    main_queue.put(name)
+                else:
+                    executor.submit(work, name)
+            if all_done:
+                main_queue.put(None)
+
+        def finish(name, result):
+            with lock:
+                results[name] = result
+            dispatch()
+
+        def work(name):
+            try:
+                finish(name, call(name))
+            except BaseException as e:
+                main_queue.put(e)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            dispatch()
+            while True:
+                item = main_queue.get()
+                if item is None:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                finish(item, call(item))
+        return results
+
+
+def _prepare_insights(
     df: pd.DataFrame,
-    name_col: Optional[str] = None,
     top_numeric_cols: List[str] = None,
-    top_categorical_cols: List[str] = None
+    top_categorical_cols: List[str] = None,
+    stats_cache: Optional[ColumnStatsCache] = None
 ) -> dict:
-    insights = {}
-    df = df.copy()
-    df = df.dropna(how="all")
-    num_df = df.select_dtypes(include='number')
-    cat_df = df.select_dtypes(include='object')
+    """
+    Shared input of the insight detectors: the frame without empty rows and with duration
+    columns converted, its statistics cache, date column and top numeric columns, plus the
+    overview, top column and summary statistic insights.
+    """
+    stats_cache = _stats_for(df, stats_cache)
+    df = _without_empty_rows(df)
+    stats_cache = _stats_for(df, stats_cache)
+    num_cols = numeric_columns(df)
+    cat_cols = text_columns(df)
     date_col = None
     for col in df.columns:
         if is_valid_datetime_column(df[col]):
             date_col = col
             break
-    for col in df.columns:
-        if df[col].dtype == object:
-            df[col] = convert_hhmmss_to_timedelta(df[col])
+    durations = {}
+    for col in cat_cols:
+        converted = convert_hhmmss_to_timedelta(df[col])
+        if converted is not df[col]:
+            durations[col] = converted
+    if durations:
+        # Shallow copy: converted duration columns replace columns locally, the rest is shared
+        df = df.copy(deep=False)
+        for col, converted in durations.items():
+            df[col] = converted
+        stats_cache = stats_cache.with_columns(df, durations)
+
+    insights, top_numeric_cols = _base_insights(
+        len(df), list(df.columns),
+        missing_columns=[col for col in df.columns if df[col].isna().any()],
+        date_range=(df[date_col].min(), df[date_col].max()) if date_col else None,
+        numeric_spreads=stats_cache.variances(num_cols) if not top_numeric_cols else None,
+        category_counts={col: stats_cache.value_counts(col, normalize=True) for col in cat_cols} if not top_categorical_cols else None,
+        column_summary=lambda col: {
+            "total": float(df[col].sum()),
+            "mean": float(df[col].mean()),
+            "median": float(df[col].median())
+        },
+        top_numeric_cols=top_numeric_cols,
+        top_categorical_cols=top_categorical_cols
+    )
 
-    insights["overview"] = {
-        "rows": len(df),
-        "columns": df.shape[1],
-        "missing_columns": [col for col in df.columns if df[col].isna().any()]
-    }
+    # Derived Ratios
+    # if len(top_numeric_cols) >= 2:
+    #     a, b = top_numeric_cols[0], top_numeric_cols[1]
+    #     total_a, total_b = df[a].sum(), df[b].sum()
+    #     if total_a and total_b:
+    #         insights["ratios"] = {
+    #             f"{b}_as_pct_of_{a}": round(100 * total_b / total_a, 2)
+    #         }
 
-    if date_col:
+    return {"df": df, "stats_cache": stats_cache, "date_col": date_col,
+            "top_numeric_cols": top_numeric_cols, "insights": insights}
+
+def _base_insights(n_rows: int, columns: list, missing_columns: list, date_range: Optional[tuple],
+                   numeric_spreads: Optional[pd.Series], category_counts: Optional[dict], column_summary,
+                   top_numeric_cols: List[str] = None, top_categorical_cols: List[str] = None) -> tuple:
+    """
+    The overview, top column and summary statistic insights, built the same way for loaded
+    frames (_prepare_insights), per-column statistics (insights_from_column_stats) and
+    streamed data (OutOfCoreSummarizer). Unless given, the top numeric columns are the five
+    with the largest numeric_spreads (std or variance per column), and the top categorical
+    columns the most evenly spread of category_counts ({column: value counts}) with 3 to 49
+    values; ID-like columns are left out. column_summary(col) gives a top numeric column's
+    total, mean and median. Returns the insights and the top numeric columns.
+    """
+    insights = {"overview": {"rows": n_rows, "columns": len(columns), "missing_columns": missing_columns}}
+    if date_range:
         insights["overview"]["date_range"] = {
-            "start": str(df[date_col].min().date()),
-            "end": str(df[date_col].max().date())
+            "start": str(pd.Timestamp(date_range[0]).date()),
+            "end": str(pd.Timestamp(date_range[1]).date())
         }
 
     # Infer top columns
-    excluded_cols = [col for col in df.columns if is_id_like(col)]
+    excluded_cols = [col for col in columns if is_id_like(col)]
     print("excluded cols:\n",excluded_cols)
     if not top_numeric_cols:
-        #print("\n\n",num_df)
-        top_numeric_cols = [col for col in num_df.var().sort_values(ascending=False).index if col not in excluded_cols][:5]
-
+        top_numeric_cols = [col for col in numeric_spreads.sort_values(ascending=False).index if col not in excluded_cols][:5]
 
     if not top_categorical_cols:
         scores = {}
-        for col in cat_df.columns:
-            vc = df[col].value_counts(normalize=True)
-            # print(col, len(vc))
-            if 2 < len(vc) < 50:
-                scores[col] = entropy(vc)
+        for col, counts in category_counts.items():
+            counts = counts[counts > 0] # Unobserved categories
+            if 2 < len(counts) < 50:
+                scores[col] = entropy(counts)
         sorted_cats = sorted(scores.items(), key=lambda x: x[1], reverse=True)
         top_categorical_cols = [col for col, _ in sorted_cats[:5] if col not in excluded_cols]
 
     insights["top_columns"] = top_numeric_cols + top_categorical_cols
 
     # Summary Stats
-    insights["summary_stats"] = {
-        col: {
-            "total": float(df[col].sum()),
-            "mean": float(df[col].mean()),
-            "median": float(df[col].median())
-        } for col in top_numeric_cols
-    }
-
-    # Derived Ratios
-    # if len(top_numeric_cols) >= 2:
-    #     a, b = top_numeric_cols[0], top_numeric_cols[1]
-    #     total_a, total_b = df[a].sum(), df[b].sum()
-    #     if total_a and total_b:
-    #         insights["ratios"] = {
-    #             f"{b}_as_pct_of_{a}": round(100 * total_b / total_a, 2)
-    #         }
+    insights["summary_stats"] = {col: column_summary(col) for col in top_numeric_cols}
+    return insights, top_numeric_cols
 
-    top_performers = get_top_performers(df, top_numeric_cols)
+def _combine_insights(prepare: dict, top_performers: dict, trends: list, extended: dict) -> dict:
+    insights = dict(prepare["insights"])
     if top_performers:
         insights["top_performers"] = top_performers
 
     # General Trends (📈 Trends)
-    insights["trends"] = detect_trends(df, date_col, top_numeric_cols)
-    extended = generate_extended_insights(df, name_col, top_numeric_cols)
+    insights["trends"] = trends
     insights.update(extended)
     return insights
 
+def add_insight_tasks(
+    graph: TaskGraph,
+    df: pd.DataFrame,
+    name_col: Optional[str] = None,
+    top_numeric_cols: List[str] = None,
+    top_categorical_cols: List[str] = None,
+    stats_cache: Optional[ColumnStatsCache] = None
+) -> TaskGraph:
+    """
+    Adds the insight detectors to graph: "prepare", then "top_performers", "trends" and
+    "extended", which only depend on it and run concurrently, and "insights", the combined
+    dict returned by generate_insights.
+    """
+    graph.add("prepare", lambda: _prepare_insights(df, top_numeric_cols, top_categorical_cols, stats_cache))
+    graph.add("top_performers", lambda prepare: get_top_performers(
+        prepare["df"], prepare["top_numeric_cols"], prepare["stats_cache"]), deps=["prepare"])
+    graph.add("trends", lambda prepare: detect_trends(
+        prepare["df"], prepare["date_col"], prepare["top_numeric_cols"], prepare["stats_cache"]), deps=["prepare"])
+    graph.add("extended", lambda prepare: generate_extended_insights(
+        prepare["df"], name_col, prepare["top_numeric_cols"], prepare["stats_cache"]), deps=["prepare"])
+    graph.add("insights", _combine_insights, deps=["prepare", "top_performers", "trends", "extended"])
+    return graph
+
+def generate_insights(
+    df: pd.DataFrame,
+    name_col: Optional[str] = None,
+    top_numeric_cols: List[str] = None,
+    top_categorical_cols: List[str] = None,
+    stats_cache: Optional[ColumnStatsCache] = None,
+    max_workers: Optional[int] = INSIGHT_WORKERS
+) -> dict:
+    graph = add_insight_tasks(TaskGraph(), df, name_col, top_numeric_cols, top_categorical_cols, stats_cache)
+    return graph.run(max_workers)["insights"]
+
+def _describe_metric(stats: dict, percentage_like: bool, duration_like: bool) -> tuple:
+    """Average and value-range text for one metric, shared by the in-memory and stats-based summaries."""
+    if percentage_like:
+        stats = {k: round(100 * v, 2) for k, v in stats.items()}
+        return f"{stats['mean']}%", f"Most values between {stats['min']}% and {stats['max']}%"
+    elif duration_like:
+        return format_time_from_hours(stats['mean']), f"Most values between {format_time_from_hours(stats['min'])} and {format_time_from_hours(stats['max'])}"
+    else:
+        return round(stats['mean'], 2), f"Most values between {stats['min']:.2f} and {stats['max']:.2f}"
+
 def generate_extended_insights(
     df: pd.DataFrame,
     name_col: Optional[str] = None,
-    top_numeric_cols: List[str] = None
+    top_numeric_cols: List[str] = None,
+    stats_cache: Optional[ColumnStatsCache] = None
 ) -> dict:
     insights = {}
-    df = df.copy()
-    df = df.dropna(how="all")
+    df = _without_empty_rows(df)
+    stats_cache = _stats_for(df, stats_cache)
 
     if not name_col:
-        name_col = next((col for col in df.columns if df[col].dtype == object and df[col].nunique() == len(df)), None)
+        name_col = next((col for col in text_columns(df) if stats_cache.nunique(col) == len(df)), None)
 
-    num_df = df.select_dtypes(include='number')
     if not top_numeric_cols:
-        top_numeric_cols = num_df.var().sort_values(ascending=False).head(10).index.tolist()
+        top_numeric_cols = stats_cache.variances(numeric_columns(df)).sort_values(ascending=False).head(10).index.tolist()
 
     high_level = {}
     metric_insights = {}
@@ -455,6 +1720,9 @@ def generate_extended_insights(
         series = df[col].dropna()
         if series.empty:
             continue
+        if pd.api.types.is_integer_dtype(series):
+            # int8/int16 values (e.g. from Arrow files) would overflow in the percent and hour arithmetic below
+            series = series.astype('int64')
 
         stats = {
             "mean": series.mean(),
@@ -464,16 +1732,9 @@ def generate_extended_insights(
             "std": series.std()
         }
 
-        if is_percentage_like(series):
-            stats = {k: round(100 * v, 2) for k, v in stats.items()}
-            high_level[f"Average {col}"] = f"{stats['mean']}%"
-            distribution_summary[col] = f"Most values between {stats['min']}% and {stats['max']}%"
-        elif is_duration_like(series):
-            high_level[f"Average {col}"] = format_time_from_hours(stats['mean'])
-            distribution_summary[col] = f"Most values between {format_time_from_hours(stats['min'])} and {format_time_from_hours(stats['max'])}"
-        else:
-            high_level[f"Average {col}"] = round(stats['mean'], 2)
-            distribution_summary[col] = f"Most values between {stats['min']:.2f} and {stats['max']:.2f}"
+        high_level[f"Average {col}"], distribution_summary[col] = _describe_metric(
+            stats, is_percentage_like(series), is_duration_like(series)
+        )
 
         if name_col:
             best = df.loc[series.idxmax()][name_col]
@@ -501,34 +1762,94 @@ def generate_extended_insights(
 
     return insights
 
-def generate_important_plots(df: pd.DataFrame, output_dir: str = "important_plots", target_cols: list = None, max_plots: int = 3):
+def insights_from_column_stats(column_stats: dict) -> dict:
+    """
+    Builds the insights dict consumed by format_insights_natural_language from
+    precomputed per-column statistics instead of a DataFrame, e.g. aggregates pushed
+    down to a SQL database. Expected layout:
+        {"rows": int, "columns": {col: {"kind": "numeric" | "datetime" | "text",
+         "count", "distinct", "sum", "mean", "std", "min", "max", "top_values", ...}}}
+    Percentage/duration detection is approximated from each column's min, max and std.
+    Top performers, trends, conditional effects and observations need the rows themselves,
+    so they are listed under "unavailable_sections" instead.
+    """
+    n_rows = column_stats["rows"]
+    columns = column_stats["columns"]
+    date_col = next((col for col, stats in columns.items() if stats["kind"] == "datetime" and stats["distinct"] >= 5), None)
+    numeric = {col: stats for col, stats in columns.items() if stats["kind"] == "numeric" and stats["count"]}
+
+    insights, top_numeric_cols = _base_insights(
+        n_rows, list(columns),
+        missing_columns=[col for col, stats in columns.items() if stats["count"] < n_rows],
+        date_range=(columns[date_col]["min"], columns[date_col]["max"]) if date_col else None,
+        numeric_spreads=pd.Series({col: stats["std"] for col, stats in numeric.items()}, dtype='float64'),
+        # Only columns whose every value is among their top values
+        category_counts={
+            col: pd.Series(stats["top_values"], dtype='float64') for col, stats in columns.items()
+            if stats["kind"] == "text" and stats.get("top_values") and len(stats["top_values"]) == stats["distinct"]
+        },
+        column_summary=lambda col: {
+            "total": float(numeric[col]["sum"]),
+            "mean": float(numeric[col]["mean"]),
+            "median": float(numeric[col]["median"]) if numeric[col].get("median") is not None else None
+        }
+    )
+
+    high_level = {}
+    distribution_summary = {}
+    for col in top_numeric_cols:
+        stats = {k: numeric[col][k] for k in ("mean", "min", "max", "std")}
+        percentage_like = (0 <= stats["min"] and stats["max"] <= 1.5) or '%' in col.lower()
+        duration_like = 0.1 <= stats["min"] and stats["max"] <= 24 and stats["std"] < 5
+        high_level[f"Average {col}"], distribution_summary[col] = _describe_metric(stats, percentage_like, duration_like)
+
+    insights["high_level_summary"] = high_level
+    insights["observations"] = []
+    insights["distribution_highlights"] = distribution_summary
+    insights["unavailable_sections"] = ["Top Performers", "Trends", "Conditional Effects", "Observations", "Plots"]
+    return insights
+
+def _plot_sample(df: pd.DataFrame, columns: list) -> pd.DataFrame:
+    """
+    The columns a plot is drawn from: a view of them, or a random sample of PLOT_SAMPLE_ROWS
+    rows (in their original order) for larger frames.
+    """
+    view = _column_view(df, columns)
+    if len(view) <= PLOT_SAMPLE_ROWS:
+        return view
+    positions = np.sort(np.random.default_rng(0).choice(len(view), PLOT_SAMPLE_ROWS, replace=False))
+    return view.iloc[positions]
+
+def generate_important_plots(df: pd.DataFrame, output_dir: str = "important_plots", target_cols: list = None, max_plots: int = 3,
+                             stats_cache: Optional[ColumnStatsCache] = None):
     os.makedirs(output_dir, exist_ok=True)
     sns.set(style="whitegrid")
-    df = df.copy()
     plots_made = 0
+    stats_cache = _stats_for(df, stats_cache)
 
     # -- Helper: Detect ID-like columns
     def is_probably_identifier(col: pd.Series) -> bool:
         name = col.name.lower()
         if any(kw in name for kw in ['id', 'uuid', 'name', 'code', 'number', 'email']):
             return True
-        if pd.api.types.is_string_dtype(col) and col.nunique() > 0.9 * len(col):
+        if pd.api.types.is_string_dtype(col) and stats_cache.nunique(col.name) > 0.9 * len(col):
             return True
         return False
 
     id_like_cols = [col for col in df.columns if is_probably_identifier(df[col])]
-    df.drop(columns=id_like_cols, inplace=True, errors='ignore')
+    df = _column_view(df, [col for col in df.columns if col not in id_like_cols])
+    stats_cache = stats_cache.with_columns(df)
 
     # -- Auto-pick target columns if not provided
     if not target_cols:
         # Pick numeric targets: high std dev, excluding timedelta
-        num_candidates = df.select_dtypes(include=['number']).std().sort_values(ascending=False)
+        num_candidates = stats_cache.stds(numeric_columns(df)).sort_values(ascending=False)
         top_numeric = num_candidates[num_candidates > 0].head(2).index.tolist()
 
         # Pick categorical targets: low to mid cardinality
         cat_candidates = [
-            col for col in df.select_dtypes(include='object')
-            if 2 < df[col].nunique() < 15
+            col for col in text_columns(df)
+            if 2 < stats_cache.nunique(col) < 15
         ]
         cat_candidates = cat_candidates[:1]  # Limit to 1 categorical
 
@@ -537,8 +1858,8 @@ def generate_important_plots(df: pd.DataFrame, output_dir: str = "important_plot
         target_cols = [col for col in target_cols if col in df.columns]
 
     # -- Identify potential predictors
-    num_cols = df.select_dtypes(include=['number']).columns.difference(target_cols).tolist()
-    cat_cols = df.select_dtypes(include='object').columns.difference(target_cols).tolist()
+    num_cols = pd.Index(numeric_columns(df)).difference(target_cols).tolist()
+    cat_cols = pd.Index(text_columns(df)).difference(target_cols).tolist()
 
     # -- Scatter or Box plots
     for target in target_cols:
@@ -547,10 +1868,10 @@ def generate_important_plots(df: pd.DataFrame, output_dir: str = "important_plot
 
         y = df[target]
         if pd.api.types.is_numeric_dtype(y):
-            corrs = df[num_cols].corrwith(y).abs().sort_values(ascending=False)
+            corrs = pd.Series([y.corr(df[col]) for col in num_cols], index=num_cols, dtype=float).abs().sort_values(ascending=False)
             for predictor in corrs.head(2).index:
                 plt.figure(figsize=(6, 4))
-                sns.scatterplot(x=df[predictor], y=y)
+                sns.scatterplot(data=_plot_sample(df, [predictor, target]), x=predictor, y=target)
                 plt.title(f"{target} vs {predictor}")
                 plt.tight_layout()
                 plt.savefig(f"{output_dir}/scatter_{target}_vs_{predictor}.png")
@@ -562,11 +1883,16 @@ def generate_important_plots(df: pd.DataFrame, output_dir: str = "important_plot
             le = LabelEncoder()
             y_encoded = le.fit_transform(y.astype(str))
             if num_cols:
-                mi_scores = mutual_info_classif(df[num_cols].fillna(0), y_encoded)
+                # Mutual information is estimated per feature, so score one predictor column at a
+                # time instead of materializing all of them as one float matrix
+                mi_scores = np.array([
+                    mutual_info_classif(df[col].fillna(0).to_numpy(dtype=np.float64).reshape(-1, 1), y_encoded, copy=False)[0]
+                    for col in num_cols
+                ])
                 top_predictors = [num_cols[i] for i in np.argsort(mi_scores)[::-1][:2]]
                 for predictor in top_predictors:
                     plt.figure(figsize=(6, 4))
-                    sns.boxplot(x=y, y=df[predictor])
+                    sns.boxplot(data=_plot_sample(df, [target, predictor]), x=target, y=predictor)
                     plt.title(f"{predictor} by {target}")
                     plt.xticks(rotation=45)
                     plt.tight_layout()
@@ -585,11 +1911,12 @@ def generate_important_plots(df: pd.DataFrame, output_dir: str = "important_plot
                 break
 
         if date_col:
-            df_sorted = df.sort_values(by=date_col)
+            # Row order by date, instead of a sorted copy of the frame
+            order = np.argsort(df[date_col].to_numpy(), kind='stable')
             for target in target_cols:
                 if pd.api.types.is_numeric_dtype(df[target]):
                     plt.figure(figsize=(8, 4))
-                    plt.plot(df_sorted[date_col], df_sorted[target])
+                    plt.plot(df[date_col].iloc[order], df[target].iloc[order])
                     plt.title(f"{target} over time")
                     plt.xlabel("Date")
                     plt.ylabel(target)
@@ -602,7 +1929,7 @@ def generate_important_plots(df: pd.DataFrame, output_dir: str = "important_plot
 
     # -- Distribution plots (fallback)
     if plots_made == 0:
-        for col in df.select_dtypes(include='number').columns[:3]:
+        for col in numeric_columns(df)[:3]:
             plt.figure(figsize=(6, 4))
             sns.histplot(df[col].dropna(), kde=True)
             plt.title(f"Distribution of {col}")
@@ -614,8 +1941,8 @@ def generate_important_plots(df: pd.DataFrame, output_dir: str = "important_plot
                 break
 
     # -- Correlation heatmap (last resort)
-    if plots_made == 0 and len(df.select_dtypes(include='number').columns) >= 3:
-        corr = df.select_dtypes(include='number').corr()
+    if plots_made == 0 and len(numeric_columns(df)) >= 3:
+        corr = df[numeric_columns(df)].corr()
         plt.figure(figsize=(6, 5))
         sns.heatmap(corr, annot=True, cmap='coolwarm', fmt='.2f')
         plt.title("Numeric Correlation Heatmap")
@@ -691,65 +2018,64 @@ def format_insights_natural_language(insights: dict) -> str:
             lines.append(f"- {k.replace('_', ' ').title()}: {v}")
         lines.append("")
 
+    # Sections that could not be computed, e.g. for summaries built from database aggregates
+    unavailable = insights.get("unavailable_sections", [])
+    if unavailable:
+        lines.append("**Not Available**")
+        lines.append(f"- {', '.join(unavailable)}: these need the individual rows, so they are not part of this summary.")
+        lines.append("")
+
     return "\n".join(lines)
 
 
 
 # --- Summarizer Class ---
 class Summarizer:
-    def __init__(self, df: pd.DataFrame):
-        self.df = df.copy() # Work on a copy to avoid modifying the original DF
+    def __init__(self, df: pd.DataFrame, copy: bool = False, insight_cache: Optional[InsightCache] = None):
+        # Cleaning builds new columns instead of modifying them, so a shallow copy keeps the
+        # original DF unchanged while columns that need no cleaning (and memory-mapped
+        # buffers) stay shared. Pass copy=True if the caller will modify df in place later.
+        self.df = df.copy(deep=copy)
         # Initial cleaning might be done here or assumed to be done before passing DF
         self.df = self._perform_essential_cleaning(self.df)
+        # Column statistics shared by the insight and plotting functions
+        self.stats = ColumnStatsCache(self.df)
+        # On-disk cache of summaries, keyed by the content fingerprint of the cleaned DF
+        self.insight_cache = insight_cache
+        self._fingerprint = None
 
     def _perform_essential_cleaning(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Applies essential cleaning steps to the DataFrame,
         similar to parts of read_excel_clean, but suitable for an already loaded DF.
         """
-        df.columns = [
-            str(col).strip().lower().replace(' ', '_').replace('\n', '_')
-            for col in df.columns
-        ]
-        
-        # Convert object-like numerics and datetimes
-        for col in df.columns:
-            if df[col].dtype == object:
-                # Try datetime conversion
-                try:
-                    parsed = pd.to_datetime(df[col], errors='coerce', utc=False)
-                    if parsed.notna().sum() > 0.6 * len(parsed):
-                        df[col] = parsed
-                        continue # Move to next column if successful
-                except Exception:
-                    pass
-                # Try numeric conversion
-                try:
-                    numeric_series = pd.to_numeric(df[col], errors='coerce')
-                    if numeric_series.notna().sum() > 0.6 * len(numeric_series):
-                        df[col] = numeric_series
-                except Exception:
-                    pass
-
-        # Fill missing values smartly
-        for col in df.columns:
-            if df[col].isna().sum() == 0:
-                continue
+        df.columns = _clean_column_names(df.columns)
 
-            if pd.api.types.is_numeric_dtype(df[col]):
-                df[col] = df[col].interpolate(method='linear', limit_direction='both')
-                df[col] = df[col].fillna(df[col].median())
-            elif pd.api.types.is_datetime64_any_dtype(df[col]):
-                df[col] = df[col].fillna(method='ffill').fillna(method='bfill')
-            elif isinstance(df[col].dtype, pd.CategoricalDtype) or df[col].dtype == object:
-                mode_val = df[col].mode().iloc[0] if not df[col].mode().empty else "Unknown"
-                df[col] = df[col].fillna(mode_val)
-        return df
+        # Convert object-like numerics and datetimes, fill missing values smartly and compact
+        # dtypes (categorical codes make the group-bys in the insight functions much cheaper),
+        # cleaning columns in parallel
+        return clean_columns(df)
 
 
-    def get_summary(self, output_plot_dir: str = "summary_plots") -> tuple[str, list]:
+    def _dataset_fingerprint(self):
+        """Dataset fingerprint for the insight cache, or None when summaries are not cached."""
+        if self.insight_cache is None:
+            return None
+        if self._fingerprint is None:
+            try:
+                self._fingerprint = dataframe_fingerprint(self.df)
+            except TypeError as e: # Unhashable cell values, e.g. lists
+                print(f"Warning: Summaries of this dataset cannot be cached: {e}")
+                self.insight_cache = None
+                return None
+        return self._fingerprint
+
+    def get_summary(self, output_plot_dir: str = "summary_plots", max_plots: int = 3,
+                    top_numeric_cols: List[str] = None, top_categorical_cols: List[str] = None,
+                    use_cache: bool = True) -> tuple[str, list]:
         """
         Generates summary insights and plots.
+        With an insight cache, a summary of the same data and parameters is read back from it.
         Returns: Tuple of (summary_text: str, list_of_plot_paths: list[str])
         """
         try:
@@ -761,17 +2087,371 @@ class Summarizer:
                 if f.endswith(".png"):
                     os.remove(os.path.join(output_plot_dir, f))
 
-            # Generate insights
-            insights = generate_insights(self.df)
-            summary_text = format_insights_natural_language(insights)
-
-            # Generate plots
-            generate_important_plots(self.df, output_dir=output_plot_dir)
+            params = {"summarizer": "Summarizer", "version": INSIGHTS_VERSION, "max_plots": max_plots,
+                      "top_numeric_cols": top_numeric_cols, "top_categorical_cols": top_categorical_cols}
+            fingerprint = self._dataset_fingerprint() if use_cache else None
+            cached = self.insight_cache.get(fingerprint, params) if fingerprint else None
+            if cached is not None:
+                print("Loaded summary from cache.")
+                summary_text = cached["summary_text"]
+                for path in cached["plots"]:
+                    shutil.copyfile(path, os.path.join(output_plot_dir, os.path.basename(path)))
+            else:
+                # Generate insights and plots. The detectors run concurrently on worker threads,
+                # the plots are drawn in this thread meanwhile (pyplot is not thread-safe)
+                graph = add_insight_tasks(TaskGraph(), self.df, top_numeric_cols=top_numeric_cols,
+                                          top_categorical_cols=top_categorical_cols, stats_cache=self.stats)
+                graph.add("summary_text", format_insights_natural_language, deps=["insights"])
+                graph.add("plots", lambda: generate_important_plots(self.df, output_dir=output_plot_dir, max_plots=max_plots,
+                                                                    stats_cache=self.stats),
+                          main_thread=True)
+                results = graph.run(INSIGHT_WORKERS)
+                summary_text = results["summary_text"]
+                counters = self.stats.counters
+                print(f"Column statistics cache: {counters['hits']} hits, {counters['misses']} misses "
+                      f"({self.stats.hit_rate():.0%} hit rate).")
             
             plot_paths = [os.path.join(output_plot_dir, f) for f in os.listdir(output_plot_dir) if f.endswith(".png")]
             plot_paths.sort() # Ensure consistent order
+
+            if fingerprint and cached is None:
+                self.insight_cache.put(fingerprint, params, summary_text, plot_paths, results["insights"],
+                                       f"{len(self.df)} rows x {self.df.shape[1]} columns")
             
             return summary_text, plot_paths
         except Exception as e:
             traceback.print_exc()
-            return f"Error generating summary: {e}", []
\ No newline at end of file
+            return f"Error generating summary: {e}", []
+
+
+# --- Out-of-Core Summarizer ---
+def _add_grouped(total: Optional[pd.DataFrame], part: pd.DataFrame) -> pd.DataFrame:
+    # Running per-group sums: groups missing from either side count as zero
+    return part if total is None else total.add(part, fill_value=0)
+
+class OutOfCoreSummarizer:
+    """
+    Builds the insights dict of generate_insights from data too large to load, streaming
+    it twice from chunk_source - a callable returning a fresh iterator of raw DataFrame
+    chunks on every call (e.g. lambda: csv_chunks(path), Parquet row groups or a SQL cursor).
+    Pass 1 types the chunks like clean_chunks and sketches every column (ProfileSketch) to
+    pick the date column and top columns; pass 2 accumulates exact group sums, trend
+    regressions and the moments behind the t-tests and ANOVAs. Memory is bounded by the
+    sketches and the group tables, not the row count.
+    Differences from the in-memory summary: missing values are skipped instead of filled,
+    medians, distinct counts and the 80th-percentile split come from sketches, and
+    HH:MM(:SS) text columns are not converted to durations.
+    """
+    def __init__(self, chunk_source, **sketch_options):
+        self.chunk_source = chunk_source
+        self.sketch_options = sketch_options
+        self.schema = {}
+
+    def _chunks(self):
+        return iter_typed_chunks(self.chunk_source(), self.schema)
+
+    def _scan(self) -> dict:
+        """Pass 1: column sketches plus the range counts the percentage/duration/date checks need."""
+        profile = ProfileSketch(**self.sketch_options)
+        text_cols = {}   # column -> is_text_column (a column widened to text mid-stream counts as text)
+        ranges = {}      # numeric column -> [in 0.001..1.5, in 0.1..24, in {0, 1}]
+        dates = {}       # datetime column -> {"days": first distinct days (up to 5), "midnight": bool}
+        for chunk in self._chunks():
+            profile.update(chunk)
+            for col in chunk.columns:
+                series = chunk[col]
+                values = series.dropna()
+                if values.empty:
+                    continue
+                text_cols[col] = text_cols.get(col, False) or is_text_column(series)
+                kind = column_kind(series)
+                if kind == 'numeric':
+                    counts = ranges.setdefault(col, [0, 0, 0])
+                    counts[0] += int(values.between(0.001, 1.5).sum())
+                    counts[1] += int(values.between(0.1, 24).sum())
+                    counts[2] += int(values.isin([0, 1]).sum())
+                elif kind == 'datetime':
+                    info = dates.setdefault(col, {"days": set(), "midnight": False})
+                    days = values.dt.normalize()
+                    if len(info["days"]) < 5:
+                        info["days"].update(days.unique()[:5])
+                    info["midnight"] = info["midnight"] or bool((days == values).any())
+        return {"profile": profile, "text_cols": text_cols, "ranges": ranges, "dates": dates}
+
+    def generate_insights(self) -> dict:
+        scan = self._scan()
+        profile = scan["profile"]
+        stats = profile.column_stats()["columns"]
+        n_rows = profile.rows
+        columns = list(stats)
+        numeric = [col for col in columns if stats[col]["kind"] == 'numeric' and stats[col]["count"]]
+        text_cols = [col for col in columns if scan["text_cols"].get(col)]
+        sketches = profile.columns
+
+        date_col = next(
+            (col for col in columns if col in scan["dates"] and stats[col]["kind"] == 'datetime'
+             and len(scan["dates"][col]["days"]) >= 5 and scan["dates"][col]["midnight"]),
+            None
+        )
+        insights, top_numeric_cols = _base_insights(
+            n_rows, columns,
+            missing_columns=[col for col in columns if stats[col]["count"] < n_rows],
+            date_range=(stats[date_col]["min"], stats[date_col]["max"]) if date_col else None,
+            numeric_spreads=pd.Series({col: stats[col]["std"] for col in numeric}, dtype='float64'),
+            # Only columns whose value counts are exact
+            category_counts={
+                col: pd.Series(stats[col]["top_values"], dtype='float64') for col in text_cols if sketches[col].frequent.exact
+            },
+            column_summary=lambda col: {
+                "total": float(stats[col]["sum"]),
+                "mean": float(stats[col]["mean"]),
+                "median": float(stats[col]["median"])
+            }
+        )
+
+        def exact_distinct(col):
+            # Distinct count if it is known exactly, else infinity (too many values to track)
+            return stats[col]["distinct"] if sketches[col] is not None and sketches[col].frequent.exact else np.inf
+
+        # Columns whose per-group statistics pass 2 collects
+        name_id_cols = [col for col in text_cols if is_id_like(col)]
+        group_col = name_id_cols[0] if name_id_cols else None
+        performer_cats = [] if group_col else [
+            col for col in text_cols if 2 < exact_distinct(col) < min(n_rows // 4, 30)
+        ]
+        anova_cats = [col for col in text_cols if not is_id_like(col) and 2 < exact_distinct(col) < 25]
+        conditions = {
+            col: sketches[col].quantiles.quantile(0.8) for col in numeric
+            if stats[col]["distinct"] > 5 and scan["ranges"][col][2] < n_rows
+        }
+        # A name column has one distinct value per row; beyond the top-k table that is judged from the
+        # HyperLogLog estimate, allowing for about three standard errors
+        hll_tolerance = 1 - 3 * 1.04 / np.sqrt(2 ** self.sketch_options.get("hll_precision", 14))
+        name_col = next(
+            (col for col in text_cols if stats[col]["count"] == n_rows and (
+                stats[col]["distinct"] == n_rows if sketches[col].frequent.exact
+                else stats[col]["distinct"] >= hll_tolerance * n_rows
+            )),
+            None
+        )
+        totals = self._accumulate(top_numeric_cols, date_col, stats, group_col, performer_cats,
+                                  anova_cats, conditions, name_col)
+
+        top_performers = self._top_performers(totals, top_numeric_cols, group_col, performer_cats)
+        if top_performers:
+            insights["top_performers"] = top_performers
+        insights["trends"] = self._trends(totals, top_numeric_cols, date_col, anova_cats, conditions, stats)
+
+        high_level = {}
+        metric_insights = {}
+        observations = []
+        distribution_summary = {}
+        for col in top_numeric_cols:
+            col_stats = {k: stats[col][k] for k in ("mean", "median", "min", "max", "std")}
+            in_pct, in_hours, _ = scan["ranges"][col]
+            percentage_like = in_pct / stats[col]["count"] > 0.8 or '%' in col.lower()
+            duration_like = in_hours / stats[col]["count"] > 0.7 and col_stats["std"] < 5
+            high_level[f"Average {col}"], distribution_summary[col] = _describe_metric(
+                col_stats, percentage_like, duration_like
+            )
+            if name_col:
+                high, best = totals["extremes"][col]["max"]
+                low, worst = totals["extremes"][col]["min"]
+                metric_insights[col] = {
+                    "Best Performer": {"name": best, "value": round(high, 2)},
+                    "Worst Performer": {"name": worst, "value": round(low, 2)}
+                }
+                if percentage_like:
+                    observations.append(f"{best} had the highest {col} at {round(high*100, 1)}%.")
+                    observations.append(f"{worst} had the lowest {col} at {round(low*100, 1)}%.")
+                elif duration_like:
+                    observations.append(f"{best} had the longest {col}: {format_time_from_hours(high)}.")
+                    observations.append(f"{worst} had the shortest {col}: {format_time_from_hours(low)}.")
+                else:
+                    observations.append(f"{best} scored highest in {col} ({round(high, 2)}).")
+                    observations.append(f"{worst} scored lowest in {col} ({round(low, 2)}).")
+
+        insights["high_level_summary"] = high_level
+        if name_col:
+            insights["per_metric_performance"] = metric_insights
+        insights["observations"] = observations
+        insights["distribution_highlights"] = distribution_summary
+        return insights
+
+    def _accumulate(self, top_numeric_cols, date_col, stats, group_col, performer_cats,
+                    anova_cats, conditions, name_col) -> dict:
+        """Pass 2: exact sums behind top performers, trends and conditional effects."""
+        totals = {
+            "groups": {},      # categorical column -> per-category sums and counts of the top numeric columns
+            "regression": {},  # numeric column -> [n, sum x, sum y, sum xx, sum xy] against days since the first date
+            "quarters": None,  # per-quarter sums and counts of the top numeric columns
+            "anova": {},       # categorical column -> per-category count, shifted sum and sum of squares
+            "splits": {},      # (condition, target) -> (MomentSketch above, MomentSketch at or below the 80th percentile)
+            "extremes": {col: {"max": (-np.inf, None), "min": (np.inf, None)} for col in top_numeric_cols}
+        }
+        if not top_numeric_cols:
+            return totals
+        first_date = stats[date_col]["min"] if date_col else None
+        shifts = pd.Series({col: stats[col]["mean"] for col in top_numeric_cols})
+
+        for chunk in self._chunks():
+            targets = chunk[top_numeric_cols].astype('float64')
+
+            for cat in ([group_col] if group_col else []) + performer_cats:
+                grouped = targets.groupby(chunk[cat], observed=True)
+                part = pd.concat({"sum": grouped.sum(), "count": grouped.count()}, axis=1)
+                totals["groups"][cat] = _add_grouped(totals["groups"].get(cat), part)
+
+            if date_col:
+                days = (chunk[date_col] - first_date).dt.days.astype('float64')
+                for col in top_numeric_cols:
+                    valid = days.notna() & targets[col].notna()
+                    x, y = days[valid].to_numpy(), targets[col][valid].to_numpy()
+                    sums = totals["regression"].setdefault(col, np.zeros(5))
+                    sums += [len(x), x.sum(), y.sum(), (x * x).sum(), (x * y).sum()]
+                grouped = targets.groupby(chunk[date_col].dt.to_period("Q"))
+                part = pd.concat({"sum": grouped.sum(), "count": grouped.count()}, axis=1)
+                totals["quarters"] = _add_grouped(totals["quarters"], part)
+
+            # Sums of values shifted by the column mean keep the sums of squares well conditioned
+            shifted = targets - shifts
+            squared = shifted ** 2
+            for cat in anova_cats:
+                grouped = shifted.groupby(chunk[cat], observed=True)
+                part = pd.concat({
+                    "count": grouped.count(),
+                    "sum": grouped.sum(),
+                    "sumsq": squared.groupby(chunk[cat], observed=True).sum()
+                }, axis=1)
+                totals["anova"][cat] = _add_grouped(totals["anova"].get(cat), part)
+
+            for cond, threshold in conditions.items():
+                above = chunk[cond] > threshold
+                at_or_below = chunk[cond] <= threshold
+                for target in top_numeric_cols:
+                    if target == cond:
+                        continue
+                    high, low = totals["splits"].setdefault((cond, target), (MomentSketch(), MomentSketch()))
+                    high.update(targets[target][above].dropna().to_numpy())
+                    low.update(targets[target][at_or_below].dropna().to_numpy())
+
+            if name_col:
+                for col in top_numeric_cols:
+                    values = chunk[col]  # Original dtype, so integers print as integers
+                    if values.notna().any():
+                        extremes = totals["extremes"][col]
+                        # Strict comparisons keep the first occurrence, like idxmax/idxmin
+                        high, low = _python_number(values.max()), _python_number(values.min())
+                        if high > extremes["max"][0]:
+                            extremes["max"] = (high, chunk[name_col].loc[values.idxmax()])
+                        if low < extremes["min"][0]:
+                            extremes["min"] = (low, chunk[name_col].loc[values.idxmin()])
+        return totals
+
+    def _top_performers(self, totals, top_numeric_cols, group_col, performer_cats) -> dict:
+        top_performers = {}
+        if group_col:
+            best_cat_cols = [group_col]
+        else:
+            separation_scores = {}
+            for cat in performer_cats:
+                grouped = totals["groups"].get(cat)
+                if grouped is None:
+                    continue
+                score = sum((grouped["sum"][num] / grouped["count"][num]).std() for num in top_numeric_cols)
+                if score > 0:
+                    separation_scores[cat] = score
+            best_cat_cols = sorted(separation_scores, key=separation_scores.get, reverse=True)[:3]
+
+        for cat in best_cat_cols:
+            grouped = totals["groups"].get(cat)
+            for num in top_numeric_cols:
+                if grouped is None or grouped["sum"][num].empty:
+                    continue
+                top = grouped["sum"][num].idxmax()
+                top_performers[f"top_{cat}_by_{num}"] = {
+                    "name": top,
+                    "total": float(grouped["sum"][num][top])
+                }
+        return top_performers
+
+    def _trends(self, totals, top_numeric_cols, date_col, anova_cats, conditions, stats) -> dict:
+        trend_insights = {}
+
+        # 1. Temporal trend & seasonality: least-squares slope sign from the accumulated sums
+        for col, (n, sx, sy, sxx, sxy) in totals["regression"].items():
+            if n < 5:
+                continue
+            slope = (n * sxy - sx * sy) / (n * sxx - sx * sx) if n * sxx != sx * sx else 0.0
+            direction = "increasing" if slope > 0 else "decreasing" if slope < 0 else "stable"
+            trend_insights[col] = {"overall_trend": direction}
+            seasonal = (totals["quarters"]["sum"][col] / totals["quarters"]["count"][col]).dropna()
+            if len(seasonal) >= 1:
+                trend_insights[col]["seasonal_pattern"] = {
+                    "peak": seasonal.idxmax().strftime("Q%q %Y"),
+                    "low": seasonal.idxmin().strftime("Q%q %Y")
+                }
+
+        # 2A. Numeric -> Numeric: Welch t-test from the moments on either side of the 80th percentile
+        conditional_effects = []
+        for (cond, target), (high, low) in totals["splits"].items():
+            if high.count < 5 or low.count < 5:
+                continue
+            _, pval = ttest_ind_from_stats(high.mean, high.std, high.count, low.mean, low.std, low.count, equal_var=False)
+            pct_change = (high.mean - low.mean) / abs(low.mean + 1e-6) * 100
+            if pval < 0.05 and abs(pct_change) > 20:
+                conditional_effects.append({
+                    "condition": f"{cond} > 80th percentile",
+                    "target": target,
+                    "effect": f"{pct_change:.1f}% {'increase' if pct_change > 0 else 'decrease'}",
+                    "p_value": f"{pval:.4f}"
+                })
+
+        # 2B. Categorical -> Numeric: one-way ANOVA from per-category counts and shifted sums
+        for cat in anova_cats:
+            grouped = totals["anova"].get(cat)
+            if grouped is None:
+                continue
+            for target in top_numeric_cols:
+                counts, sums, sumsq = grouped["count"][target], grouped["sum"][target], grouped["sumsq"][target]
+                k, n = len(counts), counts.sum()
+                if k < 2 or (counts < 3).any():
+                    continue
+                means = sums / counts
+                grand_mean = sums.sum() / n
+                between = float((counts * (means - grand_mean) ** 2).sum())
+                within = float((sumsq - counts * means ** 2).sum())
+                if within <= 0:
+                    continue
+                pval = f_distribution.sf((between / (k - 1)) / (within / (n - k)), k - 1, n - k)
+                if pval < 0.05:
+                    means = means + stats[target]["mean"]
+                    diff_pct = (means.max() - means.min()) / abs(means.min() + 1e-6) * 100
+                    if abs(diff_pct) > 20:
+                        conditional_effects.append({
+                            "condition": f"{cat} category affects {target}",
+                            "target": target,
+                            "effect": f"{diff_pct:.1f}% range across categories",
+                            "best": means.idxmax(),
+                            "worst": means.idxmin(),
+                            "p_value": f"{pval:.4f}"
+                        })
+
+        # Ranked and reported only when categorical columns were tested, as detect_trends does
+        if anova_cats and conditional_effects:
+            def effect_score(e):
+                magnitude = abs(float(re.findall(r"[-+]?\d*\.\d+|\d+", e["effect"])[0]))
+                return magnitude * -np.log10(float(e.get("p_value", 1)) + 1e-10)
+
+            conditional_effects.sort(key=effect_score, reverse=True)
+            trend_insights["conditional_effects"] = conditional_effects[:5]
+        return trend_insights
+
+    def get_summary(self) -> tuple[str, list]:
+        """Summary text in the same format as Summarizer.get_summary; no plots are drawn out of core."""
+        try:
+            insights = self.generate_insights()
+            return format_insights_natural_language(insights), []
+        except Exception as e:
+            traceback.print_exc()
+            return f"Error generating summary: {e}", []
@@ -491,7 +491,7 @@ class DataAnalyzerApp:
 
     def browse_file(self):
         """Opens a file dialog for CSV/Excel file selection."""
-        filetypes = [("Excel files", "*.xlsx *.xls"), ("CSV files", "*.csv"), ("All files", "*.*")]
+        filetypes = [("Excel files", "*.xlsx *.xls"), ("CSV files", "*.csv"), ("Arrow/Parquet files", "*.arrow *.feather *.parquet"), ("All files", "*.*")]
         path = filedialog.askopenfilename(filetypes=filetypes)
         if path:
             self.file_path.set(path)
@@ -0,0 +1,8 @@
+import os
+import sys
+
+import matplotlib
+
+# The modules live at the repository root; plots are rendered without a display
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+matplotlib.use("Agg")
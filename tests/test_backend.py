@@ -0,0 +1,211 @@
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from summarizer import clean_dataframe
+
+# backend imports summarizer1, googletrans and requests at module level
+backend = pytest.importorskip("backend")
+
+
+def test_sharepoint_pages_follow_the_item_count_not_the_id_span():
+    source = backend.SimulatedSharePointList("Orders", n_items=12_000)
+    for item_id in range(200, 11_000):  # Sparse IDs: 1,200 items spread over 12,000
+        source.delete_item(item_id)
+
+    df = backend.load_sharepoint_list("site", "Orders", "id", "secret", page_size=500, source=source)
+    assert len(df) == 1200 and df["ID"].is_monotonic_increasing
+    assert source.requests == 1 + 3  # One ID listing page, three pages of items
+
+
+def test_sharepoint_delta_reload_fetches_modified_items_only():
+    source = backend.SimulatedSharePointList("Tickets", n_items=2000)
+    load = dict(site_url="site", list_name="Tickets", client_id="id", client_secret="secret", page_size=500,
+                delta=True, source=source)
+    first = backend.load_sharepoint_list(**load)
+    assert len(first) == 2000
+
+    source.update_item(105, Status="Closed")
+    source.update_item(5000, Title="New item", Status="Active")
+    source.delete_item(110)
+    source.requests = 0
+    df = backend.load_sharepoint_list(**load).set_index("ID")
+
+    assert source.requests == 2  # One page of modified items, one ID listing page
+    assert len(df) == 2000 and 110 not in df.index
+    assert df.at[105, "Status"] == "Closed" and df.at[5000, "Title"] == "New item"
+    assert df.at[106, "Status"] == first.set_index("ID").at[106, "Status"]
+
+
+def test_mapped_arrow_columns_are_read_only_until_copied(tmp_path):
+    path = str(tmp_path / "orders.feather")
+    pd.DataFrame({"amount": np.arange(1000.0), "region": ["North", "South"] * 500}).to_feather(path, compression="uncompressed")
+
+    df = backend.DataAnalyzer(cache_dir=str(tmp_path / "cache")).load_data("file", file_path=path)
+    with pytest.raises(ValueError, match="read-only"):
+        df.loc[0, "amount"] = 1.0
+    df["total"] = df["amount"] * 2  # New columns are fine
+
+    editable = df.copy()
+    editable.loc[0, "amount"] = 1.0
+    assert editable.at[0, "amount"] == 1.0 and df.at[0, "amount"] == 0.0
+
+
+def test_cached_summaries_are_dropped_when_the_summarizer_changes(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)  # Plots are written to the working directory
+    path = str(tmp_path / "sales.csv")
+    rng = np.random.default_rng(0)
+    pd.DataFrame({"region": rng.choice(["North", "South", "East"], 300), "sales": rng.gamma(2, 100, 300)}).to_csv(path, index=False)
+    analyzer = backend.DataAnalyzer(cache_dir=str(tmp_path / "cache"))
+    analyzer.load_data("file", file_path=path)
+
+    summary, _ = analyzer.get_data_summary()
+    assert analyzer.get_data_summary()[0] == summary
+    assert "Loaded summary from cache." in capsys.readouterr().out
+
+    monkeypatch.setattr(sys.modules[backend.DataSummarizer.__module__], "__version__", "2.0", raising=False)
+    analyzer.get_data_summary()
+    assert "Loaded summary from cache." not in capsys.readouterr().out
+
+
+def test_sql_pushdown_statistics_match_the_loaded_rows(tmp_path):
+    import sqlite3
+    from summarizer import column_stats_from_dataframe
+
+    rng = np.random.default_rng(6)
+    df = pd.DataFrame({"region": rng.choice(["North", "South", "East"], 500), "sales": rng.gamma(2, 100, 500).round(2)})
+    df.loc[::7, "sales"] = np.nan
+    path = tmp_path / "sales.db"
+    with sqlite3.connect(path) as connection:
+        df.to_sql("sales", connection, index=False)
+
+    stats = backend.compute_sql_column_stats(f"sqlite:///{path}", "SELECT * FROM sales")
+    expected = column_stats_from_dataframe(df)
+    assert stats["rows"] == expected["rows"]
+    for col in df.columns:
+        for key in ["count", "distinct", "sum", "mean", "std", "min", "max"]:
+            if key in expected["columns"][col] and key in stats["columns"][col]:
+                assert np.isclose(stats["columns"][col][key], expected["columns"][col][key]), (col, key)
+    assert stats["columns"]["region"]["top_values"] == expected["columns"]["region"]["top_values"]
+
+
+def test_reloading_an_unchanged_file_reads_the_cleaned_cache(tmp_path, capsys):
+    path = str(tmp_path / "sales.csv")
+    pd.DataFrame({"region": ["North", "South", None] * 100, "sales": ["1,5", "2", "3"] * 100}).to_csv(path, index=False)
+    analyzer = backend.DataAnalyzer(cache_dir=str(tmp_path / "cache"))
+
+    first = analyzer.load_data("file", file_path=path)
+    assert "from cache" not in capsys.readouterr().out
+    second = analyzer.load_data("file", file_path=path)
+    assert "Loaded cleaned data" in capsys.readouterr().out
+    pd.testing.assert_frame_equal(second, first)
+
+    analyzer.load_data("file", file_path=path, use_cache=False)
+    assert "from cache" not in capsys.readouterr().out
+    assert len(analyzer.get_cache_info()) == 1
+
+
+def test_sql_loads_stream_in_chunks_through_one_pooled_engine(tmp_path, monkeypatch):
+    import sqlite3
+
+    rng = np.random.default_rng(8)
+    n = 2500
+    df = pd.DataFrame({"region": rng.choice(["North", "South", None], n), "sales": rng.gamma(2, 100, n),
+                       "day": pd.date_range("2024-01-01", periods=n, freq="h").strftime("%Y-%m-%d %H:%M")})
+    path = tmp_path / "sales.db"
+    with sqlite3.connect(path) as connection:
+        df.to_sql("sales", connection, index=False)
+    load = dict(dialect="sqlite", username=None, password=None, host=None, port=None, database=str(path),
+                sql_query="SELECT * FROM sales")
+
+    chunk_sizes = []
+    read_sql = pd.read_sql
+
+    def counted(chunks):
+        for chunk in chunks:
+            chunk_sizes.append(len(chunk))
+            yield chunk
+
+    def counting_read_sql(*args, **kwargs):
+        result = read_sql(*args, **kwargs)
+        return counted(result) if kwargs.get("chunksize") else result
+
+    monkeypatch.setattr(pd, "read_sql", counting_read_sql)
+    streamed = backend.load_sql_table(**load, chunksize=1000, fetch_size=100)
+    assert chunk_sizes == [1000, 1000, 500]
+    pd.testing.assert_frame_equal(streamed, backend.load_sql_table(**load, chunksize=None))
+
+    engine = backend._get_sql_engine(f"sqlite:///{path}")
+    backend.load_sql_table(**load)
+    assert backend._get_sql_engine(f"sqlite:///{path}") is engine
+    backend.dispose_sql_engines()
+    assert backend._get_sql_engine(f"sqlite:///{path}") is not engine
+
+
+def test_reader_engines_are_picked_by_file_type_and_size_and_read_alike(tmp_path, monkeypatch):
+    monkeypatch.setattr(backend, "_reader_engines", dict(backend._reader_engines))
+    rng = np.random.default_rng(10)
+    n = 3000
+    df = pd.DataFrame({"region": rng.choice(["North", "South", ""], n), "sales": rng.gamma(2, 100, n).round(2),
+                       "code": np.arange(n).astype(str)})
+    df.loc[n - 5, "code"] = "REF-1"  # Text after a numeric start
+    csv_path, xlsx_path = str(tmp_path / "sales.csv"), str(tmp_path / "sales.xlsx")
+    df.to_csv(csv_path, index=False)
+    df.to_excel(xlsx_path, index=False)
+
+    assert backend.select_reader_engine(csv_path) == "pandas-c"  # pyarrow-csv only pays off on large files
+    assert backend.select_reader_engine(csv_path, "pyarrow-csv") == "pyarrow-csv"
+    with pytest.raises(ValueError):
+        backend.select_reader_engine(csv_path, "calamine")
+
+    analyzer = backend.DataAnalyzer(cache_dir=str(tmp_path / "cache"))
+    for path, engines in [(csv_path, ["pandas-c", "pyarrow-csv"]), (xlsx_path, ["openpyxl", "calamine"])]:
+        first, *others = [analyzer.load_data("file", file_path=path, engine=engine, use_cache=False) for engine in engines]
+        for other in others:
+            pd.testing.assert_frame_equal(other, first)
+
+    read_custom = lambda path, chunksize=100_000, **_: pd.read_csv(path).head(10)
+    backend.register_reader_engine("custom", [".csv"], read_custom, priority=20)
+    assert backend.select_reader_engine(csv_path) == "custom"
+    assert len(analyzer.load_data("file", file_path=csv_path, use_cache=False)) == 10
+    assert "custom" in set(backend.reader_engines()["engine"])
+
+
+def test_excel_cleaning_stages_parse_the_file_once(tmp_path, monkeypatch):
+    rng = np.random.default_rng(12)
+    df = pd.DataFrame({"Region ": rng.choice(["North", "South"], 200), "Sales": rng.gamma(2, 100, 200).round(2),
+                       "Empty": np.nan, "Day": pd.date_range("2024-01-01", periods=200).strftime("%Y-%m-%d")})
+    xlsx_path, csv_path = str(tmp_path / "sales.xlsx"), str(tmp_path / "sales.csv")
+    df.to_excel(xlsx_path, index=False)
+    df.to_csv(csv_path, index=False)
+
+    parsed = []
+    read_raw_file = backend.read_raw_file
+
+    def counting_read_raw_file(path, *args, **kwargs):
+        parsed.append(path)
+        return read_raw_file(path, *args, **kwargs)
+
+    monkeypatch.setattr(backend, "read_raw_file", counting_read_raw_file)
+    analyzer = backend.DataAnalyzer(cache_dir=str(tmp_path / "cache"))
+    loaded = analyzer.load_data("file", file_path=xlsx_path)
+    raw, partial = analyzer.get_stage("raw"), analyzer.get_stage("partial")
+    assert parsed == [xlsx_path]  # Loading and both stages share one parse
+    pd.testing.assert_frame_equal(raw, pd.read_excel(xlsx_path))
+    pd.testing.assert_frame_equal(partial, backend.partial_clean_dataframe(raw))
+    pd.testing.assert_frame_equal(loaded, clean_dataframe(raw))
+
+    # A cache hit skips parsing until a stage is asked for
+    parsed.clear()
+    analyzer.load_data("file", file_path=xlsx_path)
+    assert parsed == []
+    pd.testing.assert_frame_equal(analyzer.get_stage("partial"), partial)
+    assert parsed == [xlsx_path]
+
+    with pytest.raises(ValueError):
+        analyzer.get_stage("typed")
+    analyzer.load_data("file", file_path=csv_path)
+    with pytest.raises(ValueError):
+        analyzer.get_stage("raw")
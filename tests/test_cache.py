@@ -0,0 +1,86 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from cache import DatasetCache, InsightCache, file_fingerprint
+
+
+def test_analyzers_sharing_a_cache_directory_keep_each_others_entries(tmp_path):
+    sources = []
+    for name in ["a", "b"]:
+        path = tmp_path / f"{name}.csv"
+        path.write_text("x\n1\n")
+        sources.append(str(path))
+    first, second = DatasetCache(str(tmp_path)), DatasetCache(str(tmp_path))  # Both read the index while it is empty
+
+    first.put(sources[0], {}, pd.DataFrame({"x": [1]}))
+    second.put(sources[1], {}, pd.DataFrame({"x": [2]}))
+    assert first.get(sources[1], {})["x"].tolist() == [2]
+    assert sorted(DatasetCache(str(tmp_path)).info()["source"]) == sources
+
+
+def test_concurrent_writers_all_land_in_the_index(tmp_path):
+    def write(worker):
+        cache = InsightCache(str(tmp_path))
+        for i in range(5):
+            cache.put(f"data{worker}-{i}", {}, "summary", [], source=f"{worker}-{i}")
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(write, range(8)))
+    assert len(InsightCache(str(tmp_path)).info()) == 40
+
+
+def test_eviction_removes_untracked_files_and_least_recently_used_entries(tmp_path):
+    cache = InsightCache(str(tmp_path), max_bytes=2500)
+    stray, stale_tmp, fresh_tmp = (os.path.join(cache.cache_dir, name) for name in ["lost-entry", "old.tmp", "new.tmp"])
+    for path in [stray, stale_tmp, fresh_tmp]:
+        os.makedirs(path)
+    os.utime(stale_tmp, (time.time() - 2 * 3600,) * 2)
+
+    for i in range(3):
+        cache.put(f"data{i}", {"version": 1}, "x" * 1000, [], source=f"data{i}")
+        time.sleep(0.01)
+    assert cache.get("data1", {"version": 1})["summary_text"] == "x" * 1000
+    cache.put("data3", {"version": 1}, "x" * 1000, [], source="data3")
+
+    # data0 and then data2 are the least recently used; the write in progress is kept
+    assert sorted(cache.info()["source"]) == ["data1", "data3"]
+    assert sorted(os.listdir(cache.cache_dir)) == sorted(
+        [cache.make_key(f"data{i}", {"version": 1}) for i in (1, 3)] + ["index.json", "index.json.lock", "new.tmp"]
+    )
+
+
+def test_cached_summaries_round_trip_with_their_plots(tmp_path):
+    plot = tmp_path / "scatter.png"
+    plot.write_bytes(b"png")
+    cache = InsightCache(str(tmp_path / "cache"))
+    insights = {"rows": np.int64(5), "when": pd.Timestamp("2024-01-01")}
+    cache.put("fp", {"version": 1}, "Summary", [str(plot)], insights, source="data")
+
+    assert cache.get("fp", {"version": 2}) is None
+    cached = cache.get("fp", {"version": 1})
+    assert cached["summary_text"] == "Summary"
+    assert cached["insights"] == {"rows": 5, "when": "2024-01-01 00:00:00"}
+    assert [os.path.basename(path) for path in cached["plots"]] == ["scatter.png"]
+    cache.clear()
+    assert cache.get("fp", {"version": 1}) is None
+    assert sorted(os.listdir(cache.cache_dir)) == ["index.json", "index.json.lock"]
+
+
+def test_cleaned_datasets_are_keyed_by_file_content_and_options(tmp_path):
+    path = tmp_path / "sales.csv"
+    path.write_text("region,sales\nNorth,1\nSouth,2\n")
+    cache = DatasetCache(str(tmp_path / "cache"))
+    df = pd.DataFrame({"region": pd.Categorical(["North", "South"]), "sales": [1, 2]})
+    cache.put(str(path), {"cleaning_version": 1}, df)
+
+    pd.testing.assert_frame_equal(cache.get(str(path), {"cleaning_version": 1}), df)
+    assert cache.get(str(path), {"cleaning_version": 2}) is None
+
+    fingerprint = file_fingerprint(str(path))
+    path.write_text("region,sales\nNorth,1\nSouth,3\n")  # Same size, new content
+    assert file_fingerprint(str(path)) != fingerprint
+    assert cache.get(str(path), {"cleaning_version": 1}) is None
@@ -0,0 +1,45 @@
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from summarizer import Summarizer
+
+
+def _sales_frame(n_rows: int) -> pd.DataFrame:
+    # Typed like a cleaned load: dates, low-cardinality text as categories, compacted numbers
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "order_date": pd.date_range("2023-01-01", periods=n_rows, freq="min"),
+        "region": pd.Categorical(rng.choice(["North", "South", "East", "West"], n_rows)),
+        "product": pd.Categorical(rng.choice(list("ABCDEFG"), n_rows)),
+        "units": rng.integers(1, 50, n_rows).astype(np.int8),
+        "revenue": rng.gamma(2, 100, n_rows).round(2),
+        "cost": rng.gamma(2, 50, n_rows).round(2),
+        "score": rng.normal(50, 10, n_rows),
+        "discount": rng.random(n_rows),
+    })
+    for i in range(16):
+        if i % 2:
+            df[f"metric_{i}"] = rng.gamma(2, 50, n_rows).round(1)
+        else:
+            df[f"segment_{i}"] = pd.Categorical(rng.choice(list("pqrstuvw"), n_rows))
+    return df
+
+
+def test_summary_peak_memory_stays_close_to_the_data_size(tmp_path):
+    # Everything a summary allocates (cleaning, insights and plots) must stay under 1.5x the
+    # data; copying the frame per stage used to take it to about 3x
+    df = _sales_frame(100_000)
+    data_size = df.memory_usage(deep=True).sum()
+
+    tracemalloc.start()
+    try:
+        summary_text, plot_paths = Summarizer(df).get_summary(str(tmp_path))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert not summary_text.startswith("Error generating summary")
+    assert plot_paths
+    assert peak < 1.5 * data_size, f"peak {peak / data_size:.2f}x of the data size"
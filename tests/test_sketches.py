@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from sketches import FrequentItems, HyperLogLog, KLLSketch, MomentSketch, ProfileSketch
+
+
+def _chunks(values, size):
+    return [values[start:start + size] for start in range(0, len(values), size)]
+
+
+def test_moments_merge_to_the_single_pass_values():
+    values = np.random.default_rng(0).normal(1e6, 5.0, 30_000)  # Large offset: naive sums of squares lose precision
+    merged = MomentSketch()
+    for chunk in _chunks(values, 7_000):
+        part = MomentSketch()
+        part.update(chunk)
+        merged.merge(part)
+
+    assert merged.count == len(values)
+    assert merged.mean == pytest.approx(values.mean(), rel=1e-12)
+    assert merged.std == pytest.approx(values.std(ddof=1), rel=1e-9)
+    assert (merged.min, merged.max) == (values.min(), values.max())
+
+
+@pytest.mark.parametrize("distinct", [500, 50_000])
+def test_distinct_count_estimate_is_within_the_expected_error(distinct):
+    values = pd.Series(np.random.default_rng(1).integers(0, distinct, 200_000)).astype(str)
+    single, merged = HyperLogLog(), HyperLogLog()
+    single.update(values)
+    for chunk in _chunks(values, 30_000):
+        part = HyperLogLog()
+        part.update(chunk)
+        merged.merge(part)
+
+    exact = values.nunique()
+    assert abs(single.estimate() - exact) <= 3 * 0.0081 * exact  # Three standard errors at precision 14
+    assert merged.estimate() == single.estimate()  # Register-wise maximum does not depend on the split
+    with pytest.raises(ValueError):
+        merged.merge(HyperLogLog(precision=10))
+
+
+def test_quantiles_are_exact_before_and_within_the_rank_error_after_compaction():
+    small = np.random.default_rng(2).exponential(3.0, 150)
+    sketch = KLLSketch(k=200)
+    sketch.update(small)
+    assert sketch.quantile(0.5) == np.quantile(small, 0.5)
+
+    values = np.random.default_rng(3).exponential(3.0, 100_000)
+    merged = KLLSketch(k=200)
+    for seed, chunk in enumerate(_chunks(values, 9_000)):
+        part = KLLSketch(k=200, seed=seed)
+        part.update(chunk)
+        merged.merge(part)
+
+    assert merged.count == len(values)
+    ordered = np.sort(values)
+    for q in [0.1, 0.25, 0.5, 0.75, 0.9]:
+        rank = np.searchsorted(ordered, merged.quantile(q)) / len(values)
+        assert abs(rank - q) <= 3 * 1.7 / 200
+
+
+def test_frequent_items_keep_exact_counts_until_a_value_is_dropped():
+    heavy = ["a"] * 5_000 + ["b"] * 3_000 + ["c"] * 2_000
+    tail = [f"rare{i}" for i in range(2_000)]
+    values = pd.Series(heavy + tail).sample(frac=1, random_state=0)
+
+    few = FrequentItems(capacity=8)
+    for chunk in _chunks(values, 1_000):
+        part = FrequentItems(capacity=8)
+        part.update(chunk)
+        few.merge(part)
+    assert not few.exact
+    assert list(few.top(3)) == ["a", "b", "c"]
+    bound = len(values) / (few.capacity + 1)
+    for value, exact in [("a", 5_000), ("b", 3_000), ("c", 2_000)]:
+        assert exact - bound <= few.counts[value] <= exact
+
+    many = FrequentItems(capacity=len(tail) + 3)
+    many.update(values)
+    assert many.exact
+    assert many.top(3) == {"a": 5_000, "b": 3_000, "c": 2_000}
+
+
+def test_profile_sketch_merged_over_partitions_matches_pandas():
+    rng = np.random.default_rng(4)
+    frame = pd.DataFrame({
+        "amount": rng.normal(100, 20, 20_000),
+        "region": rng.choice(["north", "south", "east"], 20_000),
+        "when": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 365, 20_000), unit="D"),
+        "empty": np.nan,
+    })
+    merged = ProfileSketch()
+    for chunk in _chunks(frame, 6_000):
+        merged.merge(ProfileSketch().update(chunk))
+    stats = merged.column_stats()
+
+    assert stats["rows"] == len(frame)
+    amount = stats["columns"]["amount"]
+    assert amount["kind"] == "numeric"
+    assert amount["mean"] == pytest.approx(frame["amount"].mean())
+    assert amount["std"] == pytest.approx(frame["amount"].std())
+    assert amount["median"] == pytest.approx(frame["amount"].median(), abs=2.0)  # About 2.5% of the rows around the mode
+    region = stats["columns"]["region"]
+    assert region["distinct"] == 3
+    assert region["top_values"] == frame["region"].value_counts().to_dict()
+    when = stats["columns"]["when"]
+    assert (when["min"], when["max"]) == (frame["when"].min(), frame["when"].max())
+    assert stats["columns"]["empty"]["count"] == 0
@@ -0,0 +1,527 @@
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.stats import f_oneway, ttest_ind
+
+import summarizer
+
+from summarizer import (IncrementalFrame, Summarizer, _grouped_anova, _infer_column_type, _moment_sums, _percentile_split_ttests, _trend_slopes,
+                        clean_chunks, column_stats_from_dataframe, format_insights_natural_language, generate_insights,
+                        get_top_performers, insights_from_column_stats, read_excel_clean, read_excel_sheets,
+                        convert_hhmmss_to_timedelta, profile_chunks, read_csv_clean, csv_chunks, OutOfCoreSummarizer,
+                        clean_columns, ColumnStatsCache, detect_trends, TaskGraph)
+
+
+def test_summary_with_small_integer_columns(tmp_path):
+    # int8 ratings and quantities (as read from Arrow files) look duration-like; hour formatting must not overflow
+    rng = np.random.default_rng(0)
+    n = 500
+    df = pd.DataFrame({
+        "region": rng.choice(["North", "South", "East"], n),
+        "sales": rng.gamma(2, 100, n),
+        "rating": rng.integers(1, 6, n).astype(np.int8),
+        "quantity": rng.integers(1, 9, n).astype(np.int8),
+        "name": [f"rep{i}" for i in range(n)],
+    })
+    summarizer = Summarizer(df)
+    assert summarizer.df["rating"].dtype == np.int8
+
+    summary_text, _ = summarizer.get_summary(str(tmp_path))
+    assert not summary_text.startswith("Error generating summary")
+    assert "had the longest rating: 5:00:00." in summary_text
+
+
+def test_cleaned_integer_columns_keep_their_width(tmp_path):
+    # Narrowing small integers to int8 made arithmetic in user and generated code wrap around
+    path = tmp_path / "orders.csv"
+    pd.DataFrame({"qty": np.arange(1, 101), "price": np.arange(100, 0, -1),
+                  "rating": [1.0, np.nan] * 50, "region": ["North", "South"] * 50}).to_csv(path, index=False)
+    df = read_csv_clean(str(path))
+
+    assert df["qty"].dtype == np.int64
+    assert (df["qty"] * df["price"]).max() == 50 * 51
+    assert df["rating"].dtype == np.int64  # Whole numbers once the gaps are filled
+    assert isinstance(df["region"].dtype, pd.CategoricalDtype)
+
+
+def test_duration_conversion_skips_non_text_values(tmp_path):
+    # Categories decoded from Arrow/Parquet dictionary columns may be integers
+    codes = pd.Series(pd.Categorical([1, 2, 3] * 400))
+    assert convert_hhmmss_to_timedelta(codes) is codes
+
+    mixed = pd.Series([pd.Timedelta(hours=1)] * 10 + ["0:30", "1:15:30"] * 5 + [None] * 2, dtype=object)
+    converted = convert_hhmmss_to_timedelta(mixed)
+    assert converted.iloc[0] == pd.Timedelta(hours=1)
+    assert converted.iloc[11] == pd.Timedelta(hours=1, minutes=15, seconds=30)
+    assert converted.isna().sum() == 2
+
+    df = pd.DataFrame({"store": codes, "sales": np.arange(len(codes), dtype=float)})
+    summary_text, _ = Summarizer(df).get_summary(str(tmp_path))
+    assert not summary_text.startswith("Error generating summary")
+
+
+def test_text_parse_plan_does_not_stop_date_detection():
+    # A plan saved while the column only held placeholders must not keep real dates as text
+    chunk = pd.DataFrame({"When": pd.date_range("2024-01-01", periods=300).strftime("%Y-%m-%d"),
+                          "Amount": np.arange(300.0)})
+    schema = {}
+    df = clean_chunks([chunk], schema=schema, plan={"when": ("object", None)})
+    assert pd.api.types.is_datetime64_any_dtype(df["when"])
+    assert schema["when"][0] == "datetime"
+
+
+def test_incremental_appends_match_a_full_clean():
+    rng = np.random.default_rng(1)
+
+    def rows(start, n):
+        amount = rng.normal(10, 3, n).round(1)
+        amount[rng.random(n) < 0.1] = np.nan
+        amount[-2:] = np.nan  # Trailing gap, interpolated again once later rows arrive
+        region = rng.choice(["North", "South", "East"] if start == 0 else ["Centre", "East"], n).astype(object)
+        region[rng.random(n) < 0.1] = None
+        return pd.DataFrame({"Amount": amount, "Units": rng.integers(0, 500 if start else 50, n),
+                             "Region": region, "Note": [f"note {start + i}" for i in range(n)]})
+
+    first, tails = rows(0, 300), [rows(300, 40), rows(340, 80)]
+    frame = IncrementalFrame([first])
+    earlier, snapshot = frame.df, frame.df.copy()
+    for tail in tails:
+        frame.append([tail])
+
+    expected = clean_chunks([first, pd.concat(tails, ignore_index=True)])
+    pd.testing.assert_frame_equal(frame.df, expected)
+    pd.testing.assert_frame_equal(earlier, snapshot)  # Frames handed out before an append keep their values
+    stats, full_stats = frame.column_stats()["columns"], column_stats_from_dataframe(expected)["columns"]
+    for col in expected.columns:
+        assert stats[col]["distinct"] == full_stats[col]["distinct"]
+        assert stats[col].get("top_values") == full_stats[col].get("top_values")
+
+
+def test_later_chunks_that_do_not_fit_the_column_type_widen_it_to_text():
+    # The first chunk types 'Ref' as numeric; the codes in the second chunk must not become interpolated numbers
+    first = pd.DataFrame({"Ref": np.arange(1000), "Amount": np.arange(1000.0)})
+    later = pd.DataFrame({"Ref": [f"REF-{i}" for i in range(3000)], "Amount": np.arange(3000.0)})
+
+    schema = {}
+    df = clean_chunks([first, later], schema=schema)
+    assert schema["ref"] == ("object", None)
+    assert df["ref"].tolist() == [str(i) for i in range(1000)] + [f"REF-{i}" for i in range(3000)]
+
+    profile = profile_chunks([first, later]).set_index("column")
+    assert profile.at["ref", "dtype"] == "object"
+    assert abs(profile.at["ref", "unique_values"] - 4000) < 0.02 * 4000  # HyperLogLog estimate
+
+    frame = IncrementalFrame([first])
+    with pytest.raises(ValueError):
+        frame.append([later])
+    assert len(frame.df) == 1000
+
+
+def test_incremental_fingerprint_follows_the_appended_rows():
+    first = pd.DataFrame({"Amount": np.arange(100.0), "Region": ["North", "South"] * 50})
+    tail = pd.DataFrame({"Amount": [np.nan, 7.0], "Region": ["East", None]})
+    frame, same = IncrementalFrame([first]), IncrementalFrame([first.copy()])
+    assert frame.fingerprint == same.fingerprint
+
+    loaded = frame.fingerprint
+    assert frame.append([tail.iloc[:0]]) == 0
+    assert frame.fingerprint == loaded
+    frame.append([tail])
+    assert frame.fingerprint != loaded
+    same.append([tail.copy()])
+    assert frame.fingerprint == same.fingerprint
+
+    with pytest.raises(ValueError):
+        frame.append([pd.DataFrame({"Amount": ["n/a"], "Region": ["East"]})])
+    assert frame.fingerprint == same.fingerprint
+
+
+
+def test_trend_slopes_match_per_column_fits():
+    # Spans several row blocks; every column is fitted on its own rows with values
+    rng = np.random.default_rng(3)
+    n = 40_000
+    x = rng.integers(0, 1500, n).astype(np.float64)
+    x[rng.random(n) < 0.05] = np.nan
+    df = pd.DataFrame({
+        "revenue": 1e6 + 3.5 * np.nan_to_num(x) + rng.normal(0, 50, n),
+        "units": (rng.integers(1, 40, n) - np.nan_to_num(x) // 100).astype(np.int64),
+        "flat": np.full(n, 0.1),
+        "sparse": np.where(rng.random(n) < 0.99, np.nan, rng.normal(0, 1, n)),
+        "empty": np.full(n, np.nan),
+    })
+    df.loc[rng.random(n) < 0.2, "revenue"] = np.nan
+
+    slopes, counts = _trend_slopes(x, df, list(df.columns))
+    for col in ["revenue", "units", "sparse"]:
+        mask = ~np.isnan(x) & df[col].notna().to_numpy()
+        assert counts[col] == mask.sum()
+        expected = np.polyfit(x[mask], df[col].to_numpy(dtype=np.float64)[mask], 1)[0]
+        assert np.isclose(slopes[col], expected, rtol=1e-9, atol=1e-12)
+    assert slopes["flat"] == 0.0  # Constant columns are exactly "stable"
+    assert (slopes["empty"], counts["empty"]) == (0.0, 0)
+
+
+def _grouped_frame(seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    n = 2000
+    region = rng.choice(["North", "South", "East", "West"], n, p=[.4, .3, .2, .1]).astype(object)
+    region[rng.random(n) < 0.05] = None
+    shop = rng.choice(["A", "B", "C"], n).astype(object)
+    shop[7] = "D"  # A single-member group
+    df = pd.DataFrame({
+        "region": region,
+        "shop": shop,
+        "revenue": rng.gamma(2, 100, n) + (region == "North") * 30,
+        "units": rng.integers(0, 60, n).astype(np.float64),
+        "discount": rng.random(n),
+        "skewed": np.where(rng.random(n) < 0.97, 5.0, rng.normal(0, 1, n)),  # Few rows above its 80th percentile
+    })
+    df.loc[rng.random(n) < 0.1, "revenue"] = np.nan
+    df.loc[rng.random(n) < 0.1, "discount"] = np.nan
+    df.loc[df["region"] == "West", "units"] = np.nan  # A group with no values for one target
+    return df
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_moment_tests_match_scipy(seed, monkeypatch):
+    # Small blocks, so the moments are added up over many of them
+    monkeypatch.setattr(summarizer, "MOMENT_MIN_BLOCK_ROWS", 128)
+    monkeypatch.setattr(summarizer, "MOMENT_BLOCKS", 64)
+    df = _grouped_frame(seed)
+    targets, conditions, cats = ["revenue", "units", "discount"], ["discount", "units", "skewed"], ["region", "shop"]
+    sides, groups, shift = _moment_sums(df, targets, conditions, cats)
+
+    expected = {}
+    for cond in conditions:
+        threshold = df[cond].quantile(0.8)
+        high, low = df[df[cond] > threshold], df[df[cond] <= threshold]
+        for target in targets:
+            a, b = high[target].dropna(), low[target].dropna()
+            if target != cond and len(a) >= 5 and len(b) >= 5:
+                expected[cond, target] = (a.mean(), b.mean(), ttest_ind(a, b, equal_var=False).pvalue)
+    results = {(cond, target): rest for cond, target, *rest in _percentile_split_ttests(sides, targets, shift)}
+    assert results.keys() == expected.keys()
+    assert len(results) == 4 and not any(cond == "skewed" for cond, _ in results)
+    for key, values in results.items():
+        assert np.allclose(values, expected[key], rtol=1e-7)
+
+    for cat in cats:
+        expected = {}
+        for target in targets:
+            values = [group.dropna().to_numpy() for _, group in df.groupby(cat)[target]]
+            if len(values) >= 2 and all(len(v) >= 3 for v in values):
+                expected[target] = f_oneway(*values).pvalue, df.groupby(cat)[target].mean()
+        results = {target: (pval, means) for target, pval, means in _grouped_anova(groups.get(cat), targets, shift)}
+        assert results.keys() == expected.keys()
+        for target, (pval, means) in results.items():
+            assert np.isclose(pval, expected[target][0], rtol=1e-7, atol=1e-300)
+            pd.testing.assert_series_equal(means.sort_index(), expected[target][1].sort_index(), check_names=False)
+        # 'units' has no values in the West region, and the single-member shop rules out every target
+        assert sorted(results) == (["discount", "revenue"] if cat == "region" else [])
+
+
+def test_top_performers_pick_the_best_separating_categories():
+    rng = np.random.default_rng(4)
+    n = 3000
+    df = pd.DataFrame({
+        "region": pd.Categorical(rng.choice(["North", "South", "East", "West"], n)),
+        "channel": rng.choice(["web", "shop", "phone"], n).astype(object),
+        "tier": pd.Categorical(rng.choice(list("abcdef"), n)),
+        "revenue": rng.gamma(2, 100, n),
+        "units": rng.integers(0, 50, n).astype(np.float64),
+    })
+    df["revenue"] += df["channel"].map({"web": 80, "shop": 0, "phone": -40})
+    df.loc[rng.random(n) < 0.1, ["revenue", "units"]] = np.nan
+    metrics = ["revenue", "units"]
+
+    # Reference: separation by the spread of the group means, winners by the largest group sums
+    scores = {cat: sum(df.groupby(cat, observed=True)[metrics].mean().std().tolist(), 0)
+              for cat in ["region", "channel", "tier"]}
+    expected = {}
+    for cat in sorted(scores, key=scores.get, reverse=True):
+        totals = df.groupby(cat, observed=True)[metrics].sum()
+        for num in metrics:
+            expected[f"top_{cat}_by_{num}"] = {"name": totals[num].idxmax(), "total": totals[num].max()}
+
+    result = get_top_performers(df, metrics)
+    assert list(result) == list(expected)
+    for key, top in result.items():
+        assert top["name"] == expected[key]["name"]
+        assert np.isclose(top["total"], expected[key]["total"])
+
+
+def test_insights_from_column_stats_match_the_in_memory_insights():
+    rng = np.random.default_rng(5)
+    n = 2000
+    df = pd.DataFrame({
+        "order_date": pd.date_range("2023-01-01", periods=n, freq="D"),
+        "region": pd.Categorical(rng.choice(["North", "South", "East", "West"], n)),
+        "customer_id": rng.integers(0, 10**6, n),
+        "revenue": rng.gamma(2, 100, n),
+        "units": rng.integers(0, 40, n),
+        "discount": rng.random(n),
+    })
+    insights = generate_insights(df)
+    from_stats = insights_from_column_stats(column_stats_from_dataframe(df))
+
+    for section in ["overview", "top_columns", "high_level_summary", "distribution_highlights"]:
+        assert from_stats[section] == insights[section]
+    assert from_stats["summary_stats"].keys() == insights["summary_stats"].keys()
+    for col, stats in from_stats["summary_stats"].items():
+        assert np.allclose([stats["total"], stats["mean"]], [insights["summary_stats"][col][k] for k in ("total", "mean")])
+
+    # What the statistics cannot tell is named in the summary instead of being left out silently
+    assert "top_performers" not in from_stats and "trends" not in from_stats
+    text = format_insights_natural_language(from_stats)
+    assert "**Not Available**" in text and "Top Performers, Trends" in text
+    assert "Not Available" not in format_insights_natural_language(insights)
+
+
+def test_type_inference_converts_full_columns_only_when_the_sample_allows_it(monkeypatch):
+    rng = np.random.default_rng(7)
+    n = 50_000
+    converted_lengths = []
+
+    def counting(convert):
+        def wrapper(values, *args, **kwargs):
+            converted_lengths.append(len(values))
+            return convert(values, *args, **kwargs)
+        return wrapper
+
+    monkeypatch.setattr(summarizer, "_to_datetime", counting(summarizer._to_datetime))
+    monkeypatch.setattr(pd, "to_numeric", counting(pd.to_numeric))
+
+    notes = pd.Series([f"call back about order {i}" for i in rng.integers(0, 10**6, n)], dtype=object)
+    assert _infer_column_type(notes)[0] == "object"
+    assert max(converted_lengths) <= summarizer.INFERENCE_SAMPLE_SIZE  # Ruled out on the sample alone
+
+    days = pd.Series(pd.Timestamp("2023-01-01") + pd.to_timedelta(rng.integers(0, 700, n), unit="D"))
+    kind, fmt, parsed = _infer_column_type(days.dt.strftime("%d/%m/%Y").astype(object))
+    assert (kind, fmt) == ("datetime", "%d/%m/%Y")
+    pd.testing.assert_series_equal(parsed, days, check_names=False)
+
+    # Around the 60% threshold the full column decides
+    for share, expected in [(0.7, "numeric"), (0.5, "object")]:
+        values = np.where(rng.random(n) < share, rng.integers(0, 1000, n).astype(str), "n/a").astype(object)
+        assert _infer_column_type(pd.Series(values))[0] == expected
+
+
+def test_workbook_sheets_are_read_in_parallel_like_one_at_a_time(tmp_path):
+    path = str(tmp_path / "regions.xlsx")
+    rng = np.random.default_rng(9)
+    with pd.ExcelWriter(path) as writer:
+        for name, regions in [("North", ["Leeds", "York"]), ("South", ["Bath", "Kent", "Hove"]), ("East", ["Ely"])]:
+            amount = rng.gamma(2, 100, 60).round(2)
+            amount[::9] = np.nan
+            pd.DataFrame({"Town": rng.choice(regions, 60), "Amount": amount,
+                          "Day": pd.date_range("2024-01-01", periods=60).strftime("%Y-%m-%d")}).to_excel(writer, sheet_name=name, index=False)
+
+    sheets = read_excel_sheets(path, max_workers=2)
+    assert list(sheets) == ["North", "South", "East"]
+    for name, frame in sheets.items():
+        pd.testing.assert_frame_equal(frame, read_excel_clean(path, name))
+
+    combined = read_excel_sheets(path, ["South", "East"], max_workers=2, concat=True)
+    assert combined["sheet"].value_counts().to_dict() == {"South": 60, "East": 60}
+    assert set(combined["town"].astype(str)) == {"Bath", "Kent", "Hove", "Ely"}
+
+
+@pytest.mark.parametrize("extra", [None, "Customer", "Agent_ID"])
+def test_out_of_core_summary_matches_the_in_memory_summary(extra, tmp_path):
+    rng = np.random.default_rng(11)
+    n = 6000
+    df = pd.DataFrame({
+        "Date": (pd.Timestamp("2022-01-01") + pd.to_timedelta(rng.integers(0, 700, n), unit="D")).strftime("%Y-%m-%d"),
+        "Region": rng.choice(["North", "South", "East", "West"], n),
+        "Product": rng.choice(list("ABCDEFG"), n),
+        "Units": rng.integers(1, 100, n),
+        "Price": rng.normal(50, 10, n).round(2),
+        "Rate": rng.random(n).round(3),
+        "Hours": rng.uniform(1, 8, n).round(2),
+    })
+    df["Revenue"] = (df["Units"] * df["Price"] * np.where(df["Region"] == "North", 1.6, 1.0)).round(2)
+    if extra == "Customer":  # A name column: best and worst performers per metric
+        df[extra] = [f"C{i:06d}" for i in rng.permutation(n)]
+    elif extra == "Agent_ID":  # An ID column: top performers grouped by it
+        df[extra] = rng.choice([f"A{i}" for i in range(40)], n)
+    path = str(tmp_path / "sales.csv")
+    df.to_csv(path, index=False)
+
+    in_memory = generate_insights(Summarizer(read_csv_clean(path)).df)
+    # Sketches large enough to be exact, so only the streaming itself can make a difference
+    out_of_core = OutOfCoreSummarizer(lambda: csv_chunks(path, chunksize=1000), quantile_k=10**6, top_k=10**5)
+    assert format_insights_natural_language(out_of_core.generate_insights()) == format_insights_natural_language(in_memory)
+
+
+def test_parallel_column_cleaning_matches_sequential_cleaning(monkeypatch):
+    monkeypatch.setattr(summarizer, "PARALLEL_MIN_ROWS", 100)
+    monkeypatch.setattr(summarizer, "PROCESS_MIN_ROWS", 100)
+    rng = np.random.default_rng(13)
+    n = 3000
+    amount = rng.gamma(2, 100, n).round(2).astype(str).astype(object)
+    amount[::50] = None
+    df = pd.DataFrame({
+        "day": pd.Series(pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 400, n), unit="D")).dt.strftime("%d/%m/%Y"),
+        "amount": amount,
+        "region": rng.choice(["North", "South", None], n),
+        "note": [f"order {i}" for i in rng.integers(0, 10**6, n)],
+        "units": rng.integers(0, 40, n),
+        "rate": np.where(rng.random(n) < 0.1, np.nan, rng.random(n)),
+    })
+    original = df.copy()
+
+    expected_schema = {}
+    expected = clean_columns(df, workers=1, schema=expected_schema)
+    for processes in [False, True]:
+        schema = {}
+        pd.testing.assert_frame_equal(clean_columns(df, workers=4, schema=schema, processes=processes), expected)
+        assert schema == expected_schema
+    pd.testing.assert_frame_equal(df, original)
+    assert expected_schema["day"] == ("datetime", "%d/%m/%Y")
+
+
+def test_column_stats_cache_computes_each_statistic_once():
+    rng = np.random.default_rng(14)
+    n = 2000
+    df = pd.DataFrame({
+        "order_date": pd.date_range("2023-01-01", periods=n, freq="D"),
+        "region": pd.Categorical(rng.choice(["North", "South", "East"], n)),
+        "revenue": rng.gamma(2, 100, n),
+        "units": rng.integers(0, 40, n),
+        "wait": pd.to_timedelta(rng.integers(0, 600, n), unit="s"),
+    })
+    cache = ColumnStatsCache(df)
+
+    assert cache.nunique("region") == df["region"].nunique()
+    assert cache.var("revenue") == pytest.approx(df["revenue"].var())
+    assert cache.std("revenue") == pytest.approx(df["revenue"].std())
+    assert cache.std("wait") == df["wait"].std()
+    pd.testing.assert_series_equal(cache.value_counts("region"), df["region"].value_counts())
+    pd.testing.assert_series_equal(cache.value_counts("region", normalize=True), df["region"].value_counts(normalize=True))
+    pd.testing.assert_series_equal(cache.stds(["revenue", "units"]), df[["revenue", "units"]].std())
+    assert cache.counters == {"hits": 3, "misses": 5}  # std reuses var, value_counts is shared by both forms
+
+    # A derived frame keeps the statistics of its unchanged columns only
+    hours = df.assign(wait=df["wait"].dt.total_seconds() / 3600)
+    derived = cache.with_columns(hours, ["wait"])
+    assert derived.counters is cache.counters
+    assert derived.var("revenue") == cache.var("revenue")
+    assert derived.var("wait") == pytest.approx(hours["wait"].var())
+    assert cache.counters == {"hits": 5, "misses": 6}
+
+    # A second summary with the same cache computes nothing again
+    frame = df.drop(columns="wait")
+    shared = ColumnStatsCache(frame)
+    first = generate_insights(frame, stats_cache=shared)
+    misses = shared.counters["misses"]
+    second = generate_insights(frame, stats_cache=shared)
+    assert shared.counters["misses"] == misses and shared.hit_rate() > 0.5
+    assert format_insights_natural_language(second) == format_insights_natural_language(first)
+    assert format_insights_natural_language(first) == format_insights_natural_language(generate_insights(frame))
+
+
+def _per_pair_effects(df: pd.DataFrame, targets: list) -> list:
+    # The t-test and ANOVA loops detect_trends ran, one test at a time, before the moment sums
+    effects = []
+    for cond in df.select_dtypes(include="number").columns:
+        if df[cond].nunique() <= 5 or df[cond].isin([0, 1]).all():
+            continue
+        threshold = df[cond].quantile(0.8)
+        high, low = df[df[cond] > threshold], df[df[cond] <= threshold]
+        for target in targets:
+            a, b = high[target].dropna(), low[target].dropna()
+            if target == cond or len(a) < 5 or len(b) < 5:
+                continue
+            pval = ttest_ind(a, b, equal_var=False).pvalue
+            pct_change = (a.mean() - b.mean()) / abs(b.mean() + 1e-6) * 100
+            if pval < 0.05 and abs(pct_change) > 20:
+                effects.append({"condition": f"{cond} > 80th percentile", "target": target,
+                                "effect": f"{pct_change:.1f}% {'increase' if pct_change > 0 else 'decrease'}",
+                                "p_value": f"{pval:.4f}"})
+    for cat in df.select_dtypes(include="object").columns:
+        if not 2 < df[cat].nunique() < 25:
+            continue
+        for target in targets:
+            groups = [group.dropna().to_numpy() for _, group in df.groupby(cat)[target]]
+            if len(groups) < 2 or any(len(g) < 3 for g in groups):
+                continue
+            pval = f_oneway(*groups).pvalue
+            means = df.groupby(cat)[target].mean()
+            diff_pct = (means.max() - means.min()) / abs(means.min() + 1e-6) * 100
+            if pval < 0.05 and abs(diff_pct) > 20:
+                effects.append({"condition": f"{cat} category affects {target}", "target": target,
+                                "effect": f"{diff_pct:.1f}% range across categories",
+                                "best": means.idxmax(), "worst": means.idxmin(), "p_value": f"{pval:.4f}"})
+    return effects
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_conditional_effects_match_the_per_pair_tests(seed):
+    rng = np.random.default_rng(seed)
+    n = 5000
+    region = rng.choice(["North", "South", "East", "West"], n).astype(object)
+    channel = rng.choice(["web", "shop", "phone"], n).astype(object)
+    discount = rng.random(n)
+    df = pd.DataFrame({
+        "region": region,
+        "channel": channel,
+        "discount": discount,
+        "revenue": rng.gamma(2, 100, n) * np.where(region == "North", 1.8, 1.0) * (1 + discount),
+        "units": rng.integers(1, 60, n) + (discount > 0.8) * 30.0 + (region == "South") * 15.0,
+        "returns": rng.poisson(2, n) * np.where(channel == "web", 2.0, 1.0) * (1 + (discount > 0.8)),
+        "stock": rng.normal(50, 5, n),
+    })
+    df.loc[rng.random(n) < 0.05, "revenue"] = np.nan
+    targets = ["revenue", "units", "returns", "stock"]
+
+    expected = _per_pair_effects(df, targets)
+    assert len(expected) > 5  # Enough effects that only the top five are kept
+    expected.sort(key=lambda e: abs(float(e["effect"].split("%")[0])) * -np.log10(float(e["p_value"]) + 1e-10), reverse=True)
+    assert detect_trends(df, top_numeric_cols=targets)["conditional_effects"] == expected[:5]
+
+
+def test_task_graph_runs_independent_tasks_concurrently_after_their_dependencies():
+    both_started = threading.Barrier(2, timeout=5)  # Broken, failing both tasks, unless they overlap
+    main_threads = []
+
+    def side(value):
+        def task(base):
+            both_started.wait()
+            return base + value
+        return task
+
+    def draw(left, right):
+        main_threads.append(threading.current_thread() is threading.main_thread())
+        return [left, right]
+
+    graph = (TaskGraph()
+             .add("draw", draw, deps=["left", "right"], main_thread=True)
+             .add("base", lambda: 10)
+             .add("left", side(1), deps=["base"])
+             .add("right", side(2), deps=["base"]))
+    assert graph.run(max_workers=2) == {"base": 10, "left": 11, "right": 12, "draw": [11, 12]}
+    assert main_threads == [True]
+    assert TaskGraph().run() == {}
+
+
+def test_task_graph_reraises_the_first_failure_and_skips_its_dependents():
+    ran = []
+
+    def fail():
+        raise KeyError("revenue")
+
+    graph = (TaskGraph()
+             .add("fail", fail)
+             .add("after", lambda fail: ran.append("after"), deps=["fail"])
+             .add("other", lambda: ran.append("other")))
+    with pytest.raises(KeyError, match="revenue"):
+        graph.run(max_workers=2)
+    assert "after" not in ran
+
+    with pytest.raises(ValueError, match="circular"):
+        TaskGraph().add("a", lambda b: b, deps=["b"]).add("b", lambda a: a, deps=["a"]).run()
+    with pytest.raises(ValueError, match="missing"):
+        TaskGraph().add("a", lambda c: c, deps=["c"]).run()